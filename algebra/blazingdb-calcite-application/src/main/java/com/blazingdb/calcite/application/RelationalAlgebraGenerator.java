@@ -13,6 +13,7 @@ import org.apache.calcite.jdbc.CalciteSchema;
 import org.apache.calcite.jdbc.JavaTypeFactoryImpl;
 import org.apache.calcite.plan.RelOptRule;
 import org.apache.calcite.plan.RelOptUtil;
+import org.apache.calcite.plan.hep.HepMatchOrder;
 import org.apache.calcite.plan.hep.HepPlanner;
 import org.apache.calcite.plan.hep.HepProgram;
 import org.apache.calcite.plan.hep.HepProgramBuilder;
@@ -23,9 +24,13 @@ import org.apache.calcite.rel.rules.AggregateExpandDistinctAggregatesRule;
 import org.apache.calcite.rel.rules.FilterAggregateTransposeRule;
 import org.apache.calcite.rel.rules.FilterRemoveIsNotDistinctFromRule;
 import org.apache.calcite.rel.rules.FilterMergeRule;
+import org.apache.calcite.rel.rules.FilterMultiJoinMergeRule;
 import org.apache.calcite.rel.rules.FilterProjectTransposeRule;
+import org.apache.calcite.rel.rules.JoinToMultiJoinRule;
+import org.apache.calcite.rel.rules.LoptOptimizeJoinRule;
 import org.apache.calcite.rel.rules.ProjectJoinTransposeRule;
 import org.apache.calcite.rel.rules.ProjectMergeRule;
+import org.apache.calcite.rel.rules.ProjectMultiJoinMergeRule;
 import org.apache.calcite.rel.rules.ProjectRemoveRule;
 import org.apache.calcite.rel.rules.AggregateReduceFunctionsRule;
 import org.apache.calcite.rel.rules.ReduceExpressionsRule;
@@ -84,6 +89,12 @@ public class RelationalAlgebraGenerator {
 
 	private List<RelOptRule> rules;
 
+	/**
+	 * When enabled, a cost based join reordering phase runs after the rule
+	 * based program. It uses the table statistics to order the joins.
+	 */
+	private boolean joinReorderingEnabled = false;
+
 	/**
 	 * Constructor for the relational algebra generator class. It will take the
 	 * schema store it in the  {@link #config} and then set up the  {@link
@@ -106,6 +117,9 @@ public class RelationalAlgebraGenerator {
 			SchemaPlus schema = calciteConnection.getRootSchema();
 
 			schema.add(newSchema.getName(), newSchema);
+			// BlazingSchema tables are updated in place when tables are created or
+			// dropped, so calcite must not cache the table names of the schema
+			schema.getSubSchema(newSchema.getName()).setCacheEnabled(false);
 
 			// schema.add("EMP", table);
 			List<String> defaultSchema = new ArrayList<String>();
@@ -149,6 +163,16 @@ public class RelationalAlgebraGenerator {
 		this.rules = rules;
 	}
 
+	public void
+	setJoinReorderingEnabled(boolean joinReorderingEnabled) {
+		this.joinReorderingEnabled = joinReorderingEnabled;
+	}
+
+	public boolean
+	isJoinReorderingEnabled() {
+		return joinReorderingEnabled;
+	}
+
 	public SqlNode
 	validateQuery(String sql) throws SqlSyntaxException, SqlValidationException {
 		SqlNode tempNode;
@@ -213,7 +237,43 @@ public class RelationalAlgebraGenerator {
 
 		planner.close();
 
-		return hepPlanner.findBestExp();
+		RelNode optimizedPlan = hepPlanner.findBestExp();
+		if(joinReorderingEnabled) {
+			optimizedPlan = reorderJoins(optimizedPlan);
+		}
+		return optimizedPlan;
+	}
+
+	/**
+	 * Reorders the joins of a plan using the row count statistics of the
+	 * tables. Adjacent joins are collapsed into a MultiJoin that
+	 * LoptOptimizeJoinRule turns back into a tree of joins with the cheapest
+	 * order found, then the projects it adds are merged.
+	 *
+	 * @param optimizedPlan the plan produced by the rule based program
+	 * @return the plan with its joins reordered
+	 */
+	public RelNode
+	reorderJoins(RelNode optimizedPlan) {
+		long start = System.nanoTime();
+
+		HepProgram joinProgram = new HepProgramBuilder()
+									 .addMatchOrder(HepMatchOrder.BOTTOM_UP)
+									 .addRuleInstance(JoinToMultiJoinRule.INSTANCE)
+									 .addRuleInstance(ProjectMultiJoinMergeRule.INSTANCE)
+									 .addRuleInstance(FilterMultiJoinMergeRule.INSTANCE)
+									 .addMatchOrder(HepMatchOrder.ARBITRARY)
+									 .addRuleInstance(LoptOptimizeJoinRule.INSTANCE)
+									 .addRuleInstance(ProjectMergeRule.INSTANCE)
+									 .addRuleInstance(ProjectRemoveRule.INSTANCE)
+									 .build();
+
+		final HepPlanner joinPlanner = new HepPlanner(joinProgram, config.getContext());
+		joinPlanner.setRoot(optimizedPlan);
+		RelNode reorderedPlan = joinPlanner.findBestExp();
+
+		LOGGER.debug("join reordering took " + (System.nanoTime() - start) / 1000 + " us");
+		return reorderedPlan;
 	}
 
 	/**
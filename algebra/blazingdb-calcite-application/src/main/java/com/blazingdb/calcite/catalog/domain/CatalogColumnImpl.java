@@ -16,6 +16,7 @@ import javax.persistence.ManyToMany;
 import javax.persistence.ManyToOne;
 import javax.persistence.OneToOne;
 import javax.persistence.Table;
+import javax.persistence.Transient;
 
 /**
  * <h1>Representaion of a column in a table</h1> A {@link CatalogTableImpl} contains several columns. The point of this
@@ -72,6 +73,20 @@ public class CatalogColumnImpl implements CatalogColumn, Comparable {
 	 */
 	@ManyToOne(fetch = FetchType.EAGER) @JoinColumn(name = "table_id") private CatalogTableImpl table;
 
+	/**
+	 * Statistics of the column, computed from the table metadata when the table is created.
+	 * They are not persisted.
+	 */
+	@Transient private Double minValue;
+
+	@Transient private Double maxValue;
+
+	@Transient private Long nullCount;
+
+	@Transient private Double distinctCount;
+
+	@Transient private boolean distinctCountExact;
+
 	public Long
 	getId() {
 		return id;
@@ -120,6 +135,57 @@ public class CatalogColumnImpl implements CatalogColumn, Comparable {
 		this.dataType = CatalogColumnDataType.fromString(type);
 	}
 
+	@Override
+	public Double
+	getMinValue() {
+		return minValue;
+	}
+
+	@Override
+	public Double
+	getMaxValue() {
+		return maxValue;
+	}
+
+	@Override
+	public Long
+	getNullCount() {
+		return nullCount;
+	}
+
+	@Override
+	public Double
+	getDistinctCount() {
+		return distinctCount;
+	}
+
+	@Override
+	public boolean
+	isDistinctCountExact() {
+		return distinctCountExact;
+	}
+
+	/**
+	 * Sets the statistics of the column, any of them can be null when they are not known.
+	 */
+	public void
+	setStatistics(Double minValue, Double maxValue, Long nullCount, Double distinctCount) {
+		setStatistics(minValue, maxValue, nullCount, distinctCount, false);
+	}
+
+	/**
+	 * Sets the statistics of the column, distinctCountExact tells if distinctCount is exact or an estimate.
+	 */
+	public void
+	setStatistics(
+		Double minValue, Double maxValue, Long nullCount, Double distinctCount, boolean distinctCountExact) {
+		this.minValue = minValue;
+		this.maxValue = maxValue;
+		this.nullCount = nullCount;
+		this.distinctCount = distinctCount;
+		this.distinctCountExact = distinctCountExact;
+	}
+
 	public int
 	getOrderValue() {
 		return orderValue;
@@ -2,10 +2,11 @@ package com.blazingdb.calcite.catalog.domain;
 
 import org.hibernate.annotations.Cascade;
 
-import java.util.HashMap;
 import java.util.LinkedHashSet;
+import java.util.List;
 import java.util.Map;
 import java.util.Set;
+import java.util.concurrent.ConcurrentHashMap;
 
 import javax.persistence.Column;
 import javax.persistence.Entity;
@@ -62,16 +63,18 @@ public class CatalogDatabaseImpl implements CatalogDatabase {
 	*/
 
 	/**
-	 * Empty constructor just sets up an empty HashMap for the tables.
+	 * Empty constructor just sets up an empty map for the tables.
+	 * The map is concurrent because tables are added and removed in place while
+	 * the planner may be looking them up.
 	 */
-	public CatalogDatabaseImpl() { this.databaseTables = new HashMap<String, CatalogTableImpl>(); }
+	public CatalogDatabaseImpl() { this.databaseTables = new ConcurrentHashMap<String, CatalogTableImpl>(); }
 	/**
-	 * Constructor that sets up the HashMap for tables and sets the name.
+	 * Constructor that sets up the map for tables and sets the name.
 	 * @param name the name we are to give this database.
 	 */
 	public CatalogDatabaseImpl(String name) {
 		this.name = name;
-		this.databaseTables = new HashMap<String, CatalogTableImpl>();
+		this.databaseTables = new ConcurrentHashMap<String, CatalogTableImpl>();
 	}
 
 	public Long
@@ -162,4 +165,14 @@ public class CatalogDatabaseImpl implements CatalogDatabase {
 	removeTable(String tableName) {
 		this.databaseTables.remove(tableName);
 	}
+	/**
+	 * Adds several tables to this database, replacing any table with the same name.
+	 * @param tables the tables to be added to the database.
+	 */
+	public void
+	addTables(List<CatalogTableImpl> tables) {
+		for(CatalogTableImpl table : tables) {
+			this.databaseTables.put(table.getTableName(), table);
+		}
+	}
 }
@@ -22,6 +22,7 @@ import javax.persistence.ManyToOne;
 import javax.persistence.MapKey;
 import javax.persistence.OneToMany;
 import javax.persistence.Table;
+import javax.persistence.Transient;
 
 /**
  * <h1>Stores a table with its corresponding columns</h1>
@@ -100,6 +101,11 @@ public class CatalogTableImpl implements CatalogTable {
 	 */
 	@ManyToOne(fetch = FetchType.EAGER) @JoinColumn(name = "database_id") private CatalogDatabaseImpl database;
 
+	/**
+	 * The number of rows of the table, null when it is not known. It is not persisted.
+	 */
+	@Transient private Double rowCount;
+
 	@Override
 	public CatalogDatabaseImpl
 	getDatabase() {
@@ -155,6 +161,17 @@ public class CatalogTableImpl implements CatalogTable {
 		return tempColumns;
 	}
 
+	@Override
+	public Double
+	getRowCount() {
+		return rowCount;
+	}
+
+	public void
+	setRowCount(Double rowCount) {
+		this.rowCount = rowCount;
+	}
+
 	public Map<String, CatalogColumnImpl>
 	getTableColumns() {  // i think hibernate needs a getter of the private data
 						 // type not sure about this
@@ -10,7 +10,11 @@ import com.blazingdb.calcite.catalog.domain.CatalogTableImpl;
 import com.blazingdb.calcite.catalog.repository.DatabaseRepository;
 import com.blazingdb.calcite.schema.BlazingSchema;
 
+import org.apache.calcite.plan.RelOptCost;
+import org.apache.calcite.plan.RelOptTable;
+import org.apache.calcite.plan.RelOptUtil;
 import org.apache.calcite.rel.RelNode;
+import org.apache.calcite.rel.core.Join;
 import org.apache.calcite.schema.Table;
 import org.apache.calcite.sql.parser.SqlParseException;
 import org.apache.calcite.tools.RelConversionException;
@@ -19,6 +23,7 @@ import org.apache.commons.dbcp2.BasicDataSource;
 
 import org.hibernate.SessionFactory;
 import org.hibernate.cfg.Configuration;
+import org.testng.Assert;
 import org.testng.annotations.AfterMethod;
 import org.testng.annotations.BeforeMethod;
 import org.testng.annotations.Test;
@@ -27,6 +32,8 @@ import java.sql.Connection;
 import java.sql.SQLException;
 
 import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.HashSet;
 import java.util.List;
 import java.util.Set;
 
@@ -263,6 +270,109 @@ public class BlazingCatalogTest {
 		// TODO: some kind of assertion that we got the reight relational algebra
 	}
 
+	@Test()
+	public void
+	incrementalCatalogUpdateTest() throws Exception {
+		System.out.println(
+			"=============================== INCREMENTAL CATALOG UPDATE TEST ====================================");
+
+		CatalogDatabaseImpl db = new CatalogDatabaseImpl("main");
+		BlazingSchema schema = new BlazingSchema(db);
+		RelationalAlgebraGenerator algebraGen = new RelationalAlgebraGenerator(schema);
+
+		List<CatalogColumnImpl> columns = new ArrayList<CatalogColumnImpl>();
+		columns.add(new CatalogColumnImpl("col1", CatalogColumnDataType.INT64, 1));
+		columns.add(new CatalogColumnImpl("col2", CatalogColumnDataType.INT32, 2));
+		db.addTable(new CatalogTableImpl("table1", db, columns));
+
+		// the generator was created before the table existed
+		String algebra = algebraGen.getRelationalAlgebraString("select col1 from `table1` where col2 > 4");
+		Assert.assertFalse(algebra.startsWith("fail:"), algebra);
+
+		List<CatalogColumnImpl> newColumns = new ArrayList<CatalogColumnImpl>();
+		newColumns.add(new CatalogColumnImpl("col3", CatalogColumnDataType.FLOAT64, 1));
+		List<CatalogTableImpl> newTables = new ArrayList<CatalogTableImpl>();
+		newTables.add(new CatalogTableImpl("table1", db, newColumns));
+		db.addTables(newTables);
+
+		// the replaced table must be seen by the same generator
+		algebra = algebraGen.getRelationalAlgebraString("select col1 from `table1`");
+		Assert.assertTrue(algebra.startsWith("fail:"), algebra);
+		algebra = algebraGen.getRelationalAlgebraString("select col3 from `table1`");
+		Assert.assertFalse(algebra.startsWith("fail:"), algebra);
+
+		db.removeTable("table1");
+		algebra = algebraGen.getRelationalAlgebraString("select col3 from `table1`");
+		Assert.assertTrue(algebra.startsWith("fail:"), algebra);
+	}
+
+	@Test()
+	public void
+	joinReorderingTest() throws Exception {
+		System.out.println(
+			"=============================== JOIN REORDERING TEST ====================================");
+
+		CatalogDatabaseImpl db = new CatalogDatabaseImpl("main");
+		BlazingSchema schema = new BlazingSchema(db);
+		RelationalAlgebraGenerator algebraGen = new RelationalAlgebraGenerator(schema);
+
+		String[] tableNames = {"fact", "dim1", "dim2"};
+		double[] rowCounts = {1000000000.0, 1000.0, 10.0};
+		for(int i = 0; i < tableNames.length; i++) {
+			CatalogColumnImpl key = new CatalogColumnImpl(tableNames[i] + "_key", CatalogColumnDataType.INT64, 1);
+			key.setStatistics(0.0, rowCounts[i] - 1, 0L, rowCounts[i], true);
+			List<CatalogColumnImpl> columns = new ArrayList<CatalogColumnImpl>();
+			columns.add(key);
+			CatalogTableImpl table = new CatalogTableImpl(tableNames[i], db, columns);
+			table.setRowCount(rowCounts[i]);
+			db.addTable(table);
+		}
+
+		String sql = "select fact_key from `fact` inner join `dim1` on fact_key = dim1_key "
+				   + "inner join `dim2` on dim1_key = dim2_key";
+
+		RelNode plan = algebraGen.getRelationalAlgebra(sql);
+		Assert.assertTrue(innermostJoinTables(plan).contains("fact"), RelOptUtil.toString(plan));
+
+		algebraGen.setJoinReorderingEnabled(true);
+		RelNode reorderedPlan = algebraGen.getRelationalAlgebra(sql);
+		String reorderedAlgebra = RelOptUtil.toString(reorderedPlan);
+		for(String tableName : tableNames) {
+			Assert.assertTrue(reorderedAlgebra.contains("[main, " + tableName + "]"), reorderedAlgebra);
+		}
+
+		// the two small dimensions are joined before the fact table, which makes the plan cheaper
+		Set<String> joinedFirst = innermostJoinTables(reorderedPlan);
+		Assert.assertEquals(joinedFirst, new HashSet<String>(Arrays.asList("dim1", "dim2")), reorderedAlgebra);
+		RelOptCost cost = plan.getCluster().getMetadataQuery().getCumulativeCost(plan);
+		RelOptCost reorderedCost = reorderedPlan.getCluster().getMetadataQuery().getCumulativeCost(reorderedPlan);
+		Assert.assertTrue(reorderedCost.isLt(cost), reorderedCost + " is not lower than " + cost);
+	}
+
+	// the names of the tables read by the first join executed in the plan
+	private Set<String>
+	innermostJoinTables(RelNode node) {
+		Join join = innermostJoin(node);
+		Assert.assertNotNull(join, RelOptUtil.toString(node));
+		Set<String> tableNames = new HashSet<String>();
+		for(RelOptTable table : RelOptUtil.findAllTables(join)) {
+			List<String> qualifiedName = table.getQualifiedName();
+			tableNames.add(qualifiedName.get(qualifiedName.size() - 1));
+		}
+		return tableNames;
+	}
+
+	private Join
+	innermostJoin(RelNode node) {
+		for(RelNode input : node.getInputs()) {
+			Join join = innermostJoin(input);
+			if(join != null) {
+				return join;
+			}
+		}
+		return node instanceof Join ? (Join) node : null;
+	}
+
 	@Test()
 	public void
 	testLoadDataInFile()
@@ -75,6 +75,26 @@ public class BlazingRulesTest {
 		repo.createDatabase(db);
 		dbId = db.getId();
 
+		for(Map.Entry<String, List<Entry<String, CatalogColumnDataType>>> entry : tpchTableColumns().entrySet()) {
+			List<CatalogColumnImpl> columns = new ArrayList<CatalogColumnImpl>();
+
+			int order_value = 0;
+			for(Entry<String, CatalogColumnDataType> field : entry.getValue()) {
+				columns.add(new CatalogColumnImpl(field.getKey(), field.getValue(), order_value++));
+			}
+
+			CatalogTableImpl table = new CatalogTableImpl(entry.getKey(), db, columns);
+
+			db.addTable(table);
+			repo.updateDatabase(db);
+		}
+
+		final long endTime = System.currentTimeMillis();
+		System.out.println("Total execution time: " + (endTime - startTime));
+	}
+
+	public Map<String, List<Entry<String, CatalogColumnDataType>>>
+	tpchTableColumns() {
 		Map<String, List<Entry<String, CatalogColumnDataType>>> map = new HashMap<>();
 		map.put("customer",
 			Arrays.asList(new SimpleEntry<>("c_custkey", CatalogColumnDataType.INT32),
@@ -145,23 +165,25 @@ public class BlazingRulesTest {
 				new SimpleEntry<>("ps_availqty", CatalogColumnDataType.INT64),
 				new SimpleEntry<>("ps_supplycost", CatalogColumnDataType.FLOAT32),
 				new SimpleEntry<>("ps_comment", CatalogColumnDataType.STRING)));
+		return map;
+	}
 
-		for(Map.Entry<String, List<Entry<String, CatalogColumnDataType>>> entry : map.entrySet()) {
-			List<CatalogColumnImpl> columns = new ArrayList<CatalogColumnImpl>();
-
-			int order_value = 0;
-			for(Entry<String, CatalogColumnDataType> field : entry.getValue()) {
-				columns.add(new CatalogColumnImpl(field.getKey(), field.getValue(), order_value++));
-			}
-
-			CatalogTableImpl table = new CatalogTableImpl(entry.getKey(), db, columns);
-
-			db.addTable(table);
-			repo.updateDatabase(db);
+	// the row counts of the TPCH tables at scale factor 1, nation and region don't grow with the scale factor
+	public double
+	tpchRowCount(String tableName, double scaleFactor) {
+		Map<String, Double> rowCounts = new HashMap<>();
+		rowCounts.put("customer", 150000.0);
+		rowCounts.put("orders", 1500000.0);
+		rowCounts.put("lineitem", 6001215.0);
+		rowCounts.put("supplier", 10000.0);
+		rowCounts.put("part", 200000.0);
+		rowCounts.put("partsupp", 800000.0);
+		if(tableName.equals("nation")) {
+			return 25.0;
+		} else if(tableName.equals("region")) {
+			return 5.0;
 		}
-
-		final long endTime = System.currentTimeMillis();
-		System.out.println("Total execution time: " + (endTime - startTime));
+		return rowCounts.get(tableName) * scaleFactor;
 	}
 
 	public void
@@ -319,4 +341,63 @@ public class BlazingRulesTest {
 
 		softAssert.assertAll();
 	}
+
+	// Enable this unit test to compare for all TPCH queries the planning time and the estimated cost of the optimized
+	// logical plans with and without join reordering
+	@Test(enabled = false)
+	public void
+	joinReorderingBenchmarkTest() throws Exception {
+		final double scaleFactor = 100.0;
+		final int repetitions = 20;
+
+		// the tables only live in memory, with the row counts of the scale factor and the exact distinct counts of
+		// the single column primary keys
+		CatalogDatabaseImpl statisticsDb = new CatalogDatabaseImpl("main");
+		for(Map.Entry<String, List<Entry<String, CatalogColumnDataType>>> entry : tpchTableColumns().entrySet()) {
+			double rowCount = tpchRowCount(entry.getKey(), scaleFactor);
+			boolean singleColumnKey = !entry.getKey().equals("lineitem") && !entry.getKey().equals("partsupp");
+			List<CatalogColumnImpl> columns = new ArrayList<CatalogColumnImpl>();
+
+			int order_value = 0;
+			for(Entry<String, CatalogColumnDataType> field : entry.getValue()) {
+				CatalogColumnImpl column = new CatalogColumnImpl(field.getKey(), field.getValue(), order_value);
+				if(order_value == 0 && singleColumnKey) {
+					column.setStatistics(1.0, rowCount, 0L, rowCount, true);
+				}
+				columns.add(column);
+				order_value++;
+			}
+
+			CatalogTableImpl table = new CatalogTableImpl(entry.getKey(), statisticsDb, columns);
+			table.setRowCount(rowCount);
+			statisticsDb.addTable(table);
+		}
+
+		RelationalAlgebraGenerator algebraGen = new RelationalAlgebraGenerator(new BlazingSchema(statisticsDb));
+
+		System.out.println(String.format(
+			"%-8s %12s %12s %16s %16s", "query", "plan ms", "reorder ms", "cost rows", "reorder rows"));
+		for(Entry<String, String> entry : tpch_queries) {
+			double[] planningMillis = new double[2];
+			double[] costRows = new double[2];
+			for(int reorder = 0; reorder < 2; reorder++) {
+				algebraGen.setJoinReorderingEnabled(reorder == 1);
+
+				// warm up
+				RelNode plan = algebraGen.getRelationalAlgebra(entry.getValue());
+				final long startTime = System.nanoTime();
+				for(int i = 0; i < repetitions; i++) {
+					plan = algebraGen.getRelationalAlgebra(entry.getValue());
+				}
+				planningMillis[reorder] = (System.nanoTime() - startTime) / 1e6 / repetitions;
+				costRows[reorder] = plan.getCluster().getMetadataQuery().getCumulativeCost(plan).getRows();
+			}
+			System.out.println(String.format("%-8s %12.3f %12.3f %16.4g %16.4g",
+				entry.getKey(),
+				planningMillis[0],
+				planningMillis[1],
+				costRows[0],
+				costRows[1]));
+		}
+	}
 }
@@ -9,4 +9,28 @@ public interface CatalogColumn {
 
 	public CatalogTable
 	getTable();
+
+	/**
+	 * Column statistics, any of them can be null when they are not known.
+	 * Min and max values are numeric representations of the column values
+	 * (timestamps as the number of units since epoch).
+	 */
+	public Double
+	getMinValue();
+
+	public Double
+	getMaxValue();
+
+	public Long
+	getNullCount();
+
+	public Double
+	getDistinctCount();
+
+	/**
+	 * True when the distinct count is the exact number of distinct values of the column, otherwise it is an upper
+	 * bound (e.g. derived from the range of the values) that can't be used to infer unique keys.
+	 */
+	public boolean
+	isDistinctCountExact();
 }
@@ -11,4 +11,10 @@ public interface CatalogTable {
 
 	public CatalogDatabase
 	getDatabase();
+
+	/**
+	 * @return the number of rows of the table, or null when it is not known
+	 */
+	public Double
+	getRowCount();
 }
@@ -44,7 +44,12 @@ public class BlazingSchema implements Schema {
 	public Table
 	getTable(String name) {
 		if(isDatabase()) {
+			// the lookup goes to the catalog every time, so tables added or removed
+			// after the schema was created are seen by the planner
 			final CatalogTable catalogTable = this.catalogDatabase.getTable(name);
+			if(catalogTable == null) {
+				return null;
+			}
 			return new BlazingTable(catalogTable);
 		}
 
@@ -29,10 +29,12 @@ import org.apache.calcite.sql.SqlCall;
 import org.apache.calcite.sql.SqlNode;
 import org.apache.calcite.sql.type.SqlTypeName;
 import org.apache.calcite.util.ConversionUtil;
+import org.apache.calcite.util.ImmutableBitSet;
 
 import org.slf4j.Logger;
 import org.slf4j.LoggerFactory;
 
+import java.util.ArrayList;
 import java.util.Collection;
 import java.util.HashSet;
 import java.util.List;
@@ -73,7 +75,25 @@ public class BlazingTable implements ProjectableFilterableTable {
 	@Override
 	public Statistic
 	getStatistic() {
-		return Statistics.UNKNOWN;
+		final Double rowCount = catalogTable.getRowCount();
+		if(rowCount == null) {
+			return Statistics.UNKNOWN;
+		}
+
+		// a column with as many distinct values as rows is a unique key, the planner relies on unique keys to remove
+		// joins, so they are never inferred from estimated distinct counts
+		List<ImmutableBitSet> keys = new ArrayList<ImmutableBitSet>();
+		int ordinal = 0;
+		for(CatalogColumn column : catalogTable.getColumns()) {
+			final Double distinctCount = column.getDistinctCount();
+			final Long nullCount = column.getNullCount();
+			if(column.isDistinctCountExact() && distinctCount != null && nullCount != null && nullCount == 0 &&
+				rowCount > 0 && distinctCount >= rowCount) {
+				keys.add(ImmutableBitSet.of(ordinal));
+			}
+			ordinal++;
+		}
+		return Statistics.of(rowCount, keys);
 	}
 
 	@Override
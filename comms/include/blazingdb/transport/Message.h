@@ -19,6 +19,7 @@ public:
     int64_t total_row_size{};  // used by SampleToNodeMasterMessage
     int32_t n_batches{1};
     int32_t partition_id{};    // used by SampleToNodeMasterMessage
+    int64_t scan_work{};       // used by the dynamic scan assignment messages
     //    int32_t num_columns{}; // used by: writeBuffersFromGPUTCP,
     //    readBuffersIntoGPUTCP, update everywhere! int32_t num_buffers{};
   };
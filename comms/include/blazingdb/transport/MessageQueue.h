@@ -1,11 +1,14 @@
 #pragma once
 
 #include <condition_variable>
+#include <deque>
+#include <map>
+#include <memory>
 #include <mutex>
+#include <set>
 #include <string>
+#include <unordered_map>
 #include <vector>
-#include <set>
-#include <map>
 
 #include "blazingdb/transport/Message.h"
 
@@ -33,14 +36,24 @@ public:
 
   
 private:
+  // the messages of one messageToken, in arrival order, and the threads
+  // waiting for them
+  struct TokenQueue {
+    std::deque<std::shared_ptr<ReceivedMessage>> messages;
+    std::condition_variable condition_variable;
+    size_t waiters = 0;
+  };
+
+  std::shared_ptr<TokenQueue> getTokenQueue(const std::string& messageToken);
+
   std::shared_ptr<ReceivedMessage> getMessageQueue(const std::string& messageToken);
 
   void putMessageQueue(std::shared_ptr<ReceivedMessage>& message);
 
 private:
   std::mutex mutex_;
-  std::vector<std::shared_ptr<ReceivedMessage>> message_queue_;
-  std::condition_variable condition_variable_;
+  // a token is removed once it has no messages nor waiters
+  std::unordered_map<std::string, std::shared_ptr<TokenQueue>> message_queue_;
 };
 
 }  // namespace transport
@@ -18,13 +18,12 @@ MessageQueue::MessageQueue()
 std::shared_ptr<ReceivedMessage> MessageQueue::getMessage(
     const std::string &messageToken) {
   std::unique_lock<std::mutex> lock(mutex_);
+  std::shared_ptr<TokenQueue> token_queue = getTokenQueue(messageToken);
+  token_queue->waiters++;
 
   CodeTimer blazing_timer;
-  while(!condition_variable_.wait_for(lock, 60000ms, [&, this] {
-      bool got_the_message = std::any_of(this->message_queue_.cbegin(),
-                        this->message_queue_.cend(), [&](const auto &e) {
-                          return e->getMessageTokenValue() == messageToken;
-                        });
+  while(!token_queue->condition_variable.wait_for(lock, 60000ms, [&, this] {
+      bool got_the_message = !token_queue->messages.empty();
       if (!got_the_message && blazing_timer.elapsed_time() > 59000){
         auto logger = spdlog::get("batch_logger");
         logger->warn("|||{info}|{duration}|messageToken|{messageToken}||",
@@ -34,26 +33,39 @@ std::shared_ptr<ReceivedMessage> MessageQueue::getMessage(
       }
       return got_the_message;
     })){}
+  token_queue->waiters--;
   return getMessageQueue(messageToken);
 }
 
 void MessageQueue::putMessage(std::shared_ptr<ReceivedMessage> &message) {
   std::unique_lock<std::mutex> lock(mutex_);
+  std::shared_ptr<TokenQueue> token_queue = getTokenQueue(message->getMessageTokenValue());
   putMessageQueue(message);
   lock.unlock();
-  condition_variable_.notify_all(); // Note: Very important to notify all threads
+  // each message is taken by one thread, only the threads waiting for this
+  // messageToken can take it
+  token_queue->condition_variable.notify_one();
+}
+
+std::shared_ptr<MessageQueue::TokenQueue> MessageQueue::getTokenQueue(
+    const std::string &messageToken) {
+  auto it = message_queue_.find(messageToken);
+  if (it == message_queue_.end()) {
+    it = message_queue_.emplace(messageToken, std::make_shared<TokenQueue>()).first;
+  }
+  return it->second;
 }
 
 std::shared_ptr<ReceivedMessage> MessageQueue::getMessageQueue(
     const std::string &messageToken) {
-  auto it = std::find_if(message_queue_.begin(), message_queue_.end(),
-                           [&messageToken](const auto &e) {
-                             return e->getMessageTokenValue() == messageToken;
-                           });
-  assert(it != message_queue_.end());
+  auto it = message_queue_.find(messageToken);
+  assert(it != message_queue_.end() && !it->second->messages.empty());
 
-  std::shared_ptr<ReceivedMessage> message = *it;
-  message_queue_.erase(it, it + 1);
+  std::shared_ptr<ReceivedMessage> message = it->second->messages.front();
+  it->second->messages.pop_front();
+  if (it->second->messages.empty() && it->second->waiters == 0) {
+    message_queue_.erase(it);
+  }
 
   if (message->is_sentinel()) {
     return nullptr;
@@ -63,7 +75,7 @@ std::shared_ptr<ReceivedMessage> MessageQueue::getMessageQueue(
 }
 
 void MessageQueue::putMessageQueue(std::shared_ptr<ReceivedMessage> &message) {
-  message_queue_.push_back(message);
+  getTokenQueue(message->getMessageTokenValue())->messages.push_back(message);
 }
 
 }  // namespace transport
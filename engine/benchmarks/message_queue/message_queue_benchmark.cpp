@@ -0,0 +1,59 @@
+#include <benchmark/benchmark.h>
+#include <blazingdb/transport/MessageQueue.h>
+#include <memory>
+#include <string>
+#include <thread>
+#include <vector>
+
+using blazingdb::transport::MessageQueue;
+using blazingdb::transport::Node;
+using blazingdb::transport::ReceivedMessage;
+
+// Host only: each iteration starts M waiter threads, each one taking its
+// messages from its own messageToken, and N producer threads that put the
+// messages of all the tokens interleaved, like the receive path of a shuffle
+static void CustomArguments(benchmark::internal::Benchmark * b) {
+	for(int64_t producers = 1; producers <= 8; producers *= 2)
+		for(int64_t waiters = 1; waiters <= 256; waiters *= 4)
+			b->Args({producers, waiters});
+}
+
+static void BM_MessageQueue(benchmark::State & state) {
+	const int num_producers = state.range(0);
+	const int num_waiters = state.range(1);
+	const int messages_per_waiter = 64;
+	const int num_messages = num_waiters * messages_per_waiter;
+
+	std::vector<std::string> tokens;
+	for(int i = 0; i < num_waiters; i++) {
+		tokens.push_back("partition_" + std::to_string(i));
+	}
+	Node node;
+
+	for(auto _ : state) {
+		MessageQueue message_queue;
+		std::vector<std::thread> threads;
+		for(int i = 0; i < num_waiters; i++) {
+			threads.emplace_back([&, i]() {
+				for(int j = 0; j < messages_per_waiter; j++) {
+					benchmark::DoNotOptimize(message_queue.getMessage(tokens[i]));
+				}
+			});
+		}
+		for(int p = 0; p < num_producers; p++) {
+			threads.emplace_back([&, p]() {
+				for(int m = p; m < num_messages; m += num_producers) {
+					std::shared_ptr<ReceivedMessage> message =
+						std::make_shared<ReceivedMessage>(tokens[m % num_waiters], 0, node);
+					message_queue.putMessage(message);
+				}
+			});
+		}
+		for(auto & thread : threads) {
+			thread.join();
+		}
+	}
+	state.SetItemsProcessed(state.iterations() * num_messages);
+}
+
+BENCHMARK(BM_MessageQueue)->Apply(CustomArguments)->UseRealTime()->Unit(benchmark::kMillisecond);
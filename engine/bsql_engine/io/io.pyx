@@ -14,7 +14,7 @@ from libcpp.pair cimport pair
 from libcpp.string cimport string
 from libcpp.map cimport map
 from libcpp.memory cimport unique_ptr
-from libc.stdint cimport uintptr_t
+from libc.stdint cimport uintptr_t, int32_t, int64_t
 from libc.stdlib cimport malloc, free
 from libc.string cimport strcpy, strlen
 from pyarrow.lib cimport *
@@ -95,9 +95,13 @@ cdef cio.TableSchema parseSchemaPython(vector[string] files, string file_format_
         temp = cio.parseSchema(files,file_format_hint,arg_keys,arg_values,extra_columns, ignore_missing_paths)
     return temp
 
-cdef unique_ptr[cio.ResultSet] parseMetadataPython(vector[string] files, pair[int,int] offset, cio.TableSchema schema, string file_format_hint, vector[string] arg_keys, vector[string] arg_values) nogil:
+cdef unique_ptr[cio.ResultSet] parseMetadataPython(vector[string] files, pair[int,int] offset, cio.TableSchema schema, string file_format_hint, vector[string] arg_keys, vector[string] arg_values, size_t footer_reader_threads, int footer_reader_retries) nogil:
     with nogil:
-        return blaz_move( cio.parseMetadata(files, offset, schema, file_format_hint,arg_keys,arg_values) )
+        return blaz_move( cio.parseMetadata(files, offset, schema, file_format_hint,arg_keys,arg_values, footer_reader_threads, footer_reader_retries) )
+
+cdef vector[pair[unsigned long long, unsigned long long]] getFileStatusesPython(vector[string] files, size_t num_threads) nogil:
+    with nogil:
+        return cio.getFileStatuses(files, num_threads)
 
 cdef unique_ptr[cio.PartitionedResultSet] runQueryPython(int masterIndex, vector[NodeMetaDataTCP] tcpMetadata, vector[string] tableNames, vector[string] tableScans, vector[TableSchema] tableSchemas, vector[vector[string]] tableSchemaCppArgKeys, vector[vector[string]] tableSchemaCppArgValues, vector[vector[string]] filesAll, vector[int] fileTypes, int ctxToken, string query, unsigned long accessToken,vector[vector[map[string,string]]] uri_values_cpp, map[string,string] config_options) nogil except *:
     with nogil:
@@ -132,6 +136,26 @@ cdef map[string, string] getProductDetailsPython() nogil except *:
     with nogil:
         return cio.getProductDetails()
 
+cdef vector[vector[int]] rowGroupsFromOffsets(row_group_offsets, row_group_ids):
+    # builds one vector of row groups per file from the CSR form used by
+    # BlazingTable: the row groups of the i-th file are
+    # row_group_ids[row_group_offsets[i] : row_group_offsets[i + 1]]
+    cdef const int64_t[:] offsets = np.ascontiguousarray(row_group_offsets, dtype=np.int64)
+    cdef const int32_t[:] ids = np.ascontiguousarray(row_group_ids, dtype=np.int32)
+    cdef vector[vector[int]] row_groups_ids
+    cdef Py_ssize_t num_files = offsets.shape[0] - 1
+    cdef Py_ssize_t i
+    cdef int64_t j
+    if num_files <= 0:
+        return row_groups_ids
+    row_groups_ids.resize(num_files)
+    with nogil:
+        for i in range(num_files):
+            row_groups_ids[i].reserve(offsets[i + 1] - offsets[i])
+            for j in range(offsets[i], offsets[i + 1]):
+                row_groups_ids[i].push_back(ids[j])
+    return row_groups_ids
+
 cpdef pair[bool, string] registerFileSystemCaller(fs, root, authority):
     cdef HDFS hdfs
     cdef S3 s3
@@ -166,7 +190,7 @@ cpdef pair[bool, string] registerFileSystemCaller(fs, root, authority):
         gcs.adcJsonFile = str.encode(fs['adc_json_file'])
         return cio.registerFileSystemGCS( gcs,  str.encode(root), str.encode(authority))
     if fs['type'] == 'local':
-        return cio.registerFileSystemLocal( str.encode( root), str.encode(authority))
+        return cio.registerFileSystemLocal( str.encode( root), str.encode(authority), fs['use_memory_map'])
 
 cpdef initializeCaller(int ralId, int gpuId, string network_iface_name, string ralHost, int ralCommunicationPort, bool singleNode, map[string,string] config_options):
     initializePython( ralId,  gpuId, network_iface_name,  ralHost,  ralCommunicationPort, singleNode, config_options)
@@ -232,7 +256,7 @@ cpdef parseSchemaCaller(fileList, file_format_hint, args, extra_columns, ignore_
     return return_object
 
 
-cpdef parseMetadataCaller(fileList, offset, schema, file_format_hint, args):
+cpdef parseMetadataCaller(fileList, offset, schema, file_format_hint, args, size_t footer_reader_threads=16, int footer_reader_retries=2):
     cdef vector[string] files
     for file in fileList:
       files.push_back(str.encode(file))
@@ -253,7 +277,7 @@ cpdef parseMetadataCaller(fileList, offset, schema, file_format_hint, args):
       arg_keys.push_back(str.encode(key))
       arg_values.push_back(str.encode(str(value)))
 
-    resultSet = blaz_move(parseMetadataPython(files, offset, cpp_schema, str.encode(file_format_hint), arg_keys,arg_values))
+    resultSet = blaz_move(parseMetadataPython(files, offset, cpp_schema, str.encode(file_format_hint), arg_keys,arg_values, footer_reader_threads, footer_reader_retries))
 
     names = dereference(resultSet).names
     decoded_names = []
@@ -264,6 +288,17 @@ cpdef parseMetadataCaller(fileList, offset, schema, file_format_hint, args):
     df._rename_columns(decoded_names)
     return df
 
+cpdef getFileStatusesCaller(fileList, size_t num_threads=16):
+    cdef vector[string] files
+    for file in fileList:
+      files.push_back(str.encode(file))
+
+    cdef vector[pair[unsigned long long, unsigned long long]] statuses = getFileStatusesPython(files, num_threads)
+    return [(statuses[i].first, statuses[i].second) for i in range(statuses.size())]
+
+cpdef invalidateListingCacheCaller(uri_prefix):
+    cio.invalidateListingCache(str.encode(uri_prefix))
+
 cpdef performPartitionCaller(int masterIndex, tcpMetadata, int ctxToken, input, by):
     cdef vector[NodeMetaDataTCP] tcpMetadataCpp
     cdef NodeMetaDataTCP currentMetadataCpp
@@ -391,7 +426,9 @@ cpdef runQueryCaller(int masterIndex,  tcpMetadata,  tables,  table_scans, vecto
           tableSchemaCppArgKeys[tableIndex].push_back(str.encode(key))
           tableSchemaCppArgValues[tableIndex].push_back(str.encode(str(value)))
 
-      if table.row_groups_ids is not None:
+      if getattr(table, "row_group_offsets", None) is not None:
+        currentTableSchemaCpp.row_groups_ids = rowGroupsFromOffsets(table.row_group_offsets, table.row_group_ids)
+      elif table.row_groups_ids is not None:
         currentTableSchemaCpp.row_groups_ids = table.row_groups_ids
       else:
         currentTableSchemaCpp.row_groups_ids = []
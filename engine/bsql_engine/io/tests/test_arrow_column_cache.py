@@ -0,0 +1,72 @@
+import pyarrow
+
+from pyblazing.apiv2.context import ArrowColumnCache
+
+
+def make_table(num_rows=100):
+    return pyarrow.table(
+        {
+            "a": pyarrow.array(range(num_rows), pyarrow.int64()),
+            "b": pyarrow.array([float(i) for i in range(num_rows)]),
+            "c": pyarrow.array(range(num_rows), pyarrow.int32()),
+        }
+    )
+
+
+def test_columns_are_converted_once():
+    table = make_table()
+    cache = ArrowColumnCache(10000)
+    column = cache.get_column("t", table, 0)
+    assert column.to_array().tolist() == list(range(100))
+    assert cache.get_column("t", table, 0) is column
+    assert cache.bytes == 800
+
+
+def test_columns_are_cached_separately():
+    table = make_table()
+    cache = ArrowColumnCache(10000)
+    first = cache.get_column("t", table, 0)
+    second = cache.get_column("t", table, 1)
+    assert first.to_array().tolist() == list(range(100))
+    assert second.to_array().tolist() == [float(i) for i in range(100)]
+    assert len(cache.entries) == 2
+
+
+def test_least_recently_used_columns_are_evicted():
+    table = make_table()
+    cache = ArrowColumnCache(1600)
+    first = cache.get_column("t", table, 0)
+    cache.get_column("t", table, 1)
+    cache.get_column("t", table, 0)
+    cache.get_column("t", table, 2)
+    assert cache.bytes == 1200
+    assert cache.get_column("t", table, 0) is first
+    assert ("t", id(table), 1) not in cache.entries
+
+
+def test_columns_over_the_budget_are_not_cached():
+    table = make_table()
+    cache = ArrowColumnCache(0)
+    column = cache.get_column("t", table, 0)
+    assert column.to_array().tolist() == list(range(100))
+    assert len(cache.entries) == 0
+    assert cache.bytes == 0
+
+
+def test_invalidate_drops_the_columns_of_a_table():
+    table = make_table()
+    other = make_table()
+    cache = ArrowColumnCache(10000)
+    cache.get_column("t", table, 0)
+    cache.get_column("other", other, 0)
+    cache.invalidate("t")
+    assert [key[0] for key in cache.entries] == ["other"]
+    assert cache.bytes == 800
+
+
+def test_tables_created_again_are_not_mixed_up():
+    cache = ArrowColumnCache(10000)
+    old_table = make_table(10)
+    new_table = make_table(20)
+    assert len(cache.get_column("t", old_table, 0)) == 10
+    assert len(cache.get_column("t", new_table, 0)) == 20
@@ -0,0 +1,33 @@
+import numpy as np
+
+from pyblazing.apiv2.context import assign_slices_lpt
+
+
+def slice_loads(weights, assignment, num_slices):
+    return np.bincount(assignment, weights=weights, minlength=num_slices).tolist()
+
+
+def test_heaviest_items_go_to_the_least_loaded_slice():
+    weights = [10, 7, 6, 5, 4, 2]
+    assignment = assign_slices_lpt(weights, 2)
+    assert assignment.tolist() == [0, 1, 1, 0, 1, 0]
+    assert slice_loads(weights, assignment, 2) == [17, 17]
+
+
+def test_ties_go_to_the_lowest_slice():
+    assert assign_slices_lpt([1, 1, 1, 1], 3).tolist() == [0, 1, 2, 0]
+
+
+def test_assignment_is_deterministic():
+    weights = np.random.RandomState(0).randint(1, 1000, 200)
+    first = assign_slices_lpt(weights, 7)
+    assert first.tolist() == assign_slices_lpt(weights, 7).tolist()
+    loads = slice_loads(weights, first, 7)
+    # the greedy assignment is within the largest item of a perfect balance
+    assert max(loads) - min(loads) <= weights.max()
+
+
+def test_more_slices_than_items():
+    assignment = assign_slices_lpt([3, 5], 4)
+    assert sorted(assignment.tolist()) == [0, 1]
+    assert assign_slices_lpt([], 4).tolist() == []
@@ -0,0 +1,159 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+import cudf
+import numpy as np
+
+from pyblazing.apiv2 import DataType
+from pyblazing.apiv2.context import (
+    ArrowColumnCache,
+    BlazingContext,
+    BlazingTable,
+    ResultCache,
+)
+
+
+class Database(object):
+    def __init__(self):
+        self.added = []
+
+    def addTables(self, tables):
+        self.added.append(tables)
+
+
+def make_context(statuses):
+    context = BlazingContext.__new__(BlazingContext)
+    context.lock = Lock()
+    context.planner_lock = Lock()
+    context.catalog_version = 0
+    context.result_cache = ResultCache()
+    context.arrow_column_cache = ArrowColumnCache()
+    context.tables = {}
+    context.nodes = [{}]
+    context.db = Database()
+    context.async_executor = ThreadPoolExecutor(1)
+    context.finalizeCaller = lambda: None
+    context._getFileStatuses = lambda files: [statuses[file] for file in files]
+    return context
+
+
+def make_csv_table():
+    files = [b"/data/csv/0.csv", b"/data/csv/1.csv"]
+    table = BlazingTable(
+        "csv_table",
+        files,
+        DataType.CSV,
+        files=files,
+        datasource=[b"/data/csv"],
+        calcite_to_file_indices=[0, 1, 2],
+        args={
+            "names": ["a", "b", "p"],
+            "dtype": ["int64", "float64", "str"],
+            "file_format": "csv",
+            "delimiter": "|",
+            "skiprows": np.int64(1),
+            "usecols": None,
+        },
+        uri_values=[[("p", "1")], [("p", "2")]],
+        in_file=[True, True, False],
+    )
+    table.column_names = ["a", "b", "p"]
+    table.file_column_names = ["a", "b"]
+    table.column_types = [4, 10, 23]
+    return table
+
+
+def make_parquet_table():
+    files = [b"/data/parquet/0.parquet", b"/data/parquet/1.parquet"]
+    table = BlazingTable(
+        "parquet_table",
+        files,
+        DataType.PARQUET,
+        files=files,
+        datasource=[b"/data/parquet"],
+        metadata=cudf.DataFrame(
+            {"num_rows": [10, 20, 30], "file_handle_index": [0, 1, 1]}
+        ),
+        row_groups_ids=[[0], [0, 1]],
+    )
+    table.column_names = [b"x"]
+    table.file_column_names = [b"x"]
+    table.column_types = [4]
+    table.row_count = 60.0
+    table.column_statistics = [(1, 99, 0, 60, False)]
+    return table
+
+
+STATUSES = {
+    "/data/csv/0.csv": (100, 1000),
+    "/data/csv/1.csv": (200, 2000),
+    "/data/parquet/0.parquet": (300, 3000),
+    "/data/parquet/1.parquet": (400, 4000),
+}
+
+
+def save(path):
+    context = make_context(STATUSES)
+    context.tables = {
+        "csv_table": make_csv_table(),
+        "parquet_table": make_parquet_table(),
+    }
+    context.save_catalog(path)
+
+
+def test_saved_tables_are_loaded_back(tmp_path):
+    save(str(tmp_path))
+    context = make_context(STATUSES)
+    assert context.load_catalog(str(tmp_path)) == ["csv_table", "parquet_table"]
+    assert context.catalog_version == 1
+
+    csv_table = context.tables["csv_table"]
+    assert csv_table.fileType == DataType.CSV
+    assert csv_table.files == [b"/data/csv/0.csv", b"/data/csv/1.csv"]
+    assert csv_table.datasource == [b"/data/csv"]
+    assert csv_table.calcite_to_file_indices == [0, 1, 2]
+    assert csv_table.args == {
+        "names": ["a", "b", "p"],
+        "dtype": ["int64", "float64", "str"],
+        "file_format": "csv",
+        "delimiter": "|",
+        "skiprows": 1,
+        "usecols": None,
+    }
+    assert csv_table.uri_values == [[("p", "1")], [("p", "2")]]
+    assert csv_table.in_file == [True, True, False]
+    assert csv_table.column_names == ["a", "b", "p"]
+    assert csv_table.file_column_names == ["a", "b"]
+    assert csv_table.column_types == [4, 10, 23]
+    assert csv_table.metadata is None
+    assert csv_table.row_groups_ids == make_csv_table().row_groups_ids == []
+    assert len(csv_table.slices) == 1
+
+    parquet_table = context.tables["parquet_table"]
+    assert parquet_table.column_names == [b"x"]
+    assert parquet_table.row_group_offsets.tolist() == [0, 1, 3]
+    assert parquet_table.row_group_ids.tolist() == [0, 0, 1]
+    assert parquet_table.metadata["num_rows"].tolist() == [10, 20, 30]
+    assert parquet_table.metadata["file_handle_index"].tolist() == [0, 1, 1]
+    assert parquet_table.row_count == 60.0
+    assert parquet_table.column_statistics == [(1, 99, 0, 60, False)]
+
+
+def test_tables_whose_files_changed_are_not_loaded(tmp_path):
+    save(str(tmp_path))
+    statuses = dict(STATUSES)
+    statuses["/data/csv/1.csv"] = (200, 2500)
+    context = make_context(statuses)
+    assert context.load_catalog(str(tmp_path), validate=True) == ["parquet_table"]
+    assert list(context.tables) == ["parquet_table"]
+
+    # without validation the saved files are trusted
+    context = make_context(statuses)
+    assert context.load_catalog(str(tmp_path)) == ["csv_table", "parquet_table"]
+
+
+def test_unchanged_tables_are_loaded_with_validation(tmp_path):
+    save(str(tmp_path))
+    context = make_context(STATUSES)
+    loaded = context.load_catalog(str(tmp_path), validate=True)
+    assert loaded == ["csv_table", "parquet_table"]
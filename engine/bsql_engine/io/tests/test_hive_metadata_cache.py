@@ -0,0 +1,170 @@
+import json
+import os
+import time
+
+from pyblazing.apiv2 import hive
+from pyblazing.apiv2.hive import HiveMetadataCache, parsePartitions
+
+
+DESCRIPTION = [
+    ("# col_name", "data_type", "comment"),
+    ("", None, None),
+    ("a", "int", ""),
+    ("", None, None),
+    ("# Partition Information", None, None),
+    ("# col_name", "data_type", "comment"),
+    ("", None, None),
+    ("p", "int", ""),
+    ("", None, None),
+    ("# Detailed Table Information", None, None),
+    ("Location:", "file:/data/t", None),
+    ("InputFormat:", "org.apache.hadoop.ParquetInputFormat", None),
+]
+
+
+class Transport(object):
+    host = "metastore"
+    port = 10000
+
+
+class Connection(object):
+    def __init__(self, partitions):
+        self._transport = Transport()
+        self.partitions = partitions
+        self.queries = []
+
+    def cursor(self):
+        return Cursor(self)
+
+
+class Cursor(object):
+    def __init__(self, connection, partitions=None):
+        # a cursor without a connection can not tell its host
+        if connection is not None:
+            self._connection = connection
+            partitions = connection.partitions
+        self.connection = connection
+        self.partitions = partitions
+        self.queries = []
+        self.rows = None
+        self.description = None
+
+    def execute(self, query, async_=False):
+        self.queries.append(query)
+        if self.connection is not None:
+            self.connection.queries.append(query)
+        if query.startswith("describe formatted"):
+            self.rows = DESCRIPTION
+        else:
+            self.rows = [(partition,) for partition in self.partitions]
+
+    def poll(self):
+        class Status(object):
+            operationState = "FINISHED"
+
+        return Status()
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+def test_known_partitions_are_not_parsed_again():
+    schema = {"columns": [("a", 3, False), ("p", 3, True)]}
+    known = {"p=1": [("p", "1")]}
+    partitions = parsePartitions([("p=1",), ("p=2",)], schema, known)
+    assert partitions == {"p=1": [("p", "1")], "p=2": [("p", "2")]}
+    assert partitions["p=1"] is known["p=1"]
+    assert parsePartitions([("p=3",)], schema) == {"p=3": [("p", "3")]}
+
+
+def test_entries_are_used_until_the_ttl_expires(tmp_path, monkeypatch):
+    connection = Connection(["p=1"])
+    cache = HiveMetadataCache(str(tmp_path), ttl=60)
+    schema = cache.get_schema(Cursor(connection), "t", "db")
+    assert schema["location"] == "/data/t"
+    assert schema["partitions"] == {"p=1": [("p", "1")]}
+    assert len(connection.queries) == 2
+
+    assert cache.get_schema(Cursor(connection), "t", "db") == schema
+    assert len(connection.queries) == 2
+
+    now = time.time()
+    monkeypatch.setattr(hive.time, "time", lambda: now + 61)
+    cache.get_schema(Cursor(connection), "t", "db")
+    assert len(connection.queries) == 4
+
+
+def test_expired_entries_parse_only_the_new_partitions(tmp_path, monkeypatch):
+    connection = Connection(["p=1", "p=2"])
+    cache = HiveMetadataCache(str(tmp_path), ttl=60)
+    cache.get_schema(Cursor(connection), "t", "db")
+
+    parsed = []
+
+    def parse(rows, schema, known_partitions=None):
+        partitions = parsePartitions(rows, schema, known_partitions)
+        parsed.extend(name for name in partitions if name not in known_partitions)
+        return partitions
+
+    monkeypatch.setattr(hive, "parsePartitions", parse)
+    now = time.time()
+    monkeypatch.setattr(hive.time, "time", lambda: now + 61)
+    connection.partitions = ["p=1", "p=2", "p=3"]
+    schema = cache.get_schema(Cursor(connection), "t", "db")
+    assert parsed == ["p=3"]
+    assert sorted(schema["partitions"]) == ["p=1", "p=2", "p=3"]
+    assert schema["partitions"]["p=3"] == [("p", "3")]
+
+
+def test_cursors_without_a_host_are_not_cached(tmp_path):
+    cache = HiveMetadataCache(str(tmp_path), ttl=60)
+    cursor = Cursor(None, ["p=1"])
+    schema = cache.get_schema(cursor, "t", "db")
+    assert schema["partitions"] == {"p=1": [("p", "1")]}
+    assert cache.get_schema(cursor, "t", "db") == schema
+    # described and listed twice, nothing written
+    assert len(cursor.queries) == 4
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_store_replaces_the_entry_atomically(tmp_path, monkeypatch):
+    cache = HiveMetadataCache(str(tmp_path), ttl=60)
+    key = ["metastore:10000", "db", "t"]
+    old_schema = {"columns": [("a", 3, False)], "partitions": {}}
+    cache.store(key, old_schema)
+
+    replaced = []
+
+    def replace(source, destination):
+        # the whole entry is written before it takes the place of the old one
+        assert cache.load(key)[1] == old_schema
+        with open(source) as tmp_file:
+            assert json.load(tmp_file)["schema"]["columns"] == [["b", 4, False]]
+        replaced.append((source, destination))
+        real_replace(source, destination)
+
+    real_replace = os.replace
+    monkeypatch.setattr(hive.os, "replace", replace)
+    new_schema = {"columns": [("b", 4, False)], "partitions": {}}
+    cache.store(key, new_schema)
+    assert replaced[0][1] == cache._path(key)
+    assert cache.load(key)[1] == new_schema
+    assert os.listdir(str(tmp_path)) == [os.path.basename(cache._path(key))]
+
+
+def test_failed_store_keeps_the_previous_entry(tmp_path, monkeypatch):
+    cache = HiveMetadataCache(str(tmp_path), ttl=60)
+    key = ["metastore:10000", "db", "t"]
+    schema = {"columns": [("a", 3, False)], "partitions": {}}
+    cache.store(key, schema)
+
+    def failing_replace(source, destination):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(hive.os, "replace", failing_replace)
+    cache.store(key, {"columns": [("b", 4, False)], "partitions": {}})
+    assert cache.load(key)[1] == schema
+    assert os.listdir(str(tmp_path)) == [os.path.basename(cache._path(key))]
@@ -0,0 +1,128 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+import pytest
+
+from pyblazing.apiv2 import DataType
+from pyblazing.apiv2.context import BlazingContext, BlazingTable, PlanCache, ResultCache
+
+
+FILES = ["/data/t/0.parquet", "/data/t/1.parquet"]
+
+
+class Database(object):
+    def __init__(self):
+        self.added = []
+
+    def addTable(self, table):
+        self.added.append(table)
+
+
+def make_context():
+    context = BlazingContext.__new__(BlazingContext)
+    context.lock = Lock()
+    context.planner_lock = Lock()
+    context.catalog_version = 0
+    context.plan_cache = PlanCache()
+    context.result_cache = ResultCache()
+    context.tables = {}
+    context.db = Database()
+    context.async_executor = ThreadPoolExecutor(1)
+    context.finalizeCaller = lambda: None
+    context._get_table_scan_info = lambda algebra, single_gpu=False: (
+        ["t"],
+        ["LogicalTableScan(table=[[main, t]])"],
+    )
+    return context
+
+
+def make_loader(column_names, column_types, loads):
+    def load_table(input):
+        loads.append(input)
+        table = BlazingTable("t", input, DataType.PARQUET, files=input)
+        table.column_names = column_names
+        table.column_types = column_types
+        return table
+
+    return load_table
+
+
+class Generator(object):
+    # plans a scan of table t with the columns it has in the catalog
+    def __init__(self, context):
+        self.context = context
+        self.planned = []
+
+    def getRelationalAlgebraString(self, sql):
+        column_names = self.context.tables["t"].column_names
+        self.planned.append(column_names)
+        return "LogicalTableScan(table=[[main, t]], columns=%s)" % column_names
+
+
+def test_lazy_tables_are_loaded_once():
+    context = make_context()
+    loads = []
+    load_table = make_loader(["a"], [4], loads)
+    table = context._make_lazy_table("t", FILES, [("a", "int64")], load_table)
+    assert table.column_names == ["a"] and table.column_types == [4]
+    context.tables["t"] = table
+
+    barrier = threading.Barrier(4)
+    results = []
+
+    def load():
+        barrier.wait()
+        results.append(context._load_lazy_tables(["t"]))
+
+    threads = [threading.Thread(target=load) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert loads == [FILES]
+    assert results == [False] * 4
+    assert context.tables["t"] is not table
+    assert context.tables["t"].files == FILES
+    assert context.catalog_version == 1
+    assert table.lazy_loader is None
+    assert context._load_lazy_tables(["t"]) is False
+    assert len(loads) == 1
+
+
+def test_queries_on_lazy_tables_are_planned_again_with_the_loaded_schema():
+    context = make_context()
+    loads = []
+    # the files have one more column than the schema the table was created with
+    load_table = make_loader(["a", "b"], [4, 4], loads)
+    context.tables["t"] = context._make_lazy_table(
+        "t", FILES, [("a", "int64")], load_table
+    )
+    context.generator = Generator(context)
+
+    algebra, plan, catalog_version, table_names, _ = context._get_query_plan(
+        "select * from t", None, True, need_plan=False
+    )
+    assert context.generator.planned == [["a"], ["a", "b"]]
+    assert algebra == "LogicalTableScan(table=[[main, t]], columns=['a', 'b'])"
+    assert catalog_version == 1
+    assert table_names == ["t"]
+    assert len(loads) == 1
+
+    # the next queries use the plan of the loaded table
+    second = context._get_query_plan("select * from t", None, True, need_plan=False)
+    assert second[0] == algebra
+    assert len(context.generator.planned) == 2
+
+
+def test_given_algebra_fails_when_the_loaded_schema_changed():
+    context = make_context()
+    load_table = make_loader(["a", "b"], [4, 4], [])
+    context.tables["t"] = context._make_lazy_table(
+        "t", FILES, [("a", "int64")], load_table
+    )
+    with pytest.raises(ValueError):
+        context._get_query_plan(
+            None, "LogicalTableScan(table=[[main, t]])", True, need_plan=False
+        )
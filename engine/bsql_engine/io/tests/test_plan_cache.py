@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from pyblazing.apiv2.context import BlazingContext, PlanCache, normalize_sql
+
+
+def test_plan_cache_hits_and_misses():
+    cache = PlanCache(2)
+    assert cache.get(("select 1", 0)) is None
+    cache.put(("select 1", 0), "algebra", "plan")
+    assert cache.get(("select 1", 0)) == {"algebra": "algebra", "plan": "plan"}
+    assert cache.info() == {"hits": 1, "misses": 1, "size": 1, "max_size": 2}
+
+
+def test_plan_cache_evicts_least_recently_used():
+    cache = PlanCache(2)
+    cache.put("a", "algebra a")
+    cache.put("b", "algebra b")
+    cache.get("a")
+    cache.put("c", "algebra c")
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a")["algebra"] == "algebra a"
+    assert cache.get("c")["algebra"] == "algebra c"
+
+
+def test_plan_cache_keys_include_catalog_version():
+    cache = PlanCache()
+    cache.put(("select * from t", 1), "old algebra")
+    assert cache.get(("select * from t", 2)) is None
+
+
+def test_disabled_plan_cache_stores_nothing():
+    cache = PlanCache(0)
+    assert not cache.enabled()
+    cache.put("a", "algebra")
+    assert len(cache) == 0
+
+
+def test_plan_cache_clear():
+    cache = PlanCache()
+    cache.put("a", "algebra")
+    cache.get("a")
+    cache.clear()
+    assert cache.info() == {"hits": 0, "misses": 0, "size": 0, "max_size": 256}
+
+
+def test_normalize_sql_collapses_whitespace():
+    assert normalize_sql("select  a,\n\tb from t ") == "select a, b from t"
+
+
+def test_normalize_sql_keeps_quoted_text():
+    assert normalize_sql("select 'a  b' from t") == "select 'a  b' from t"
+    assert normalize_sql("select 'a' from t") != normalize_sql("select 'a ' from t")
+    assert normalize_sql("select x 'ab' from t") != normalize_sql("select x'ab' from t")
+
+
+def test_normalize_sql_removes_comments_before_collapsing_newlines():
+    # the newline ends the comment, the filter is still part of the query
+    commented = normalize_sql("select * from t -- all rows\nwhere a = 1")
+    assert commented == "select * from t where a = 1"
+    assert normalize_sql("select * from t -- where a = 1") == "select * from t"
+    assert normalize_sql("select /* b, */ a from t") == "select a from t"
+
+
+def test_queries_are_planned_without_the_catalog_lock():
+    context = BlazingContext.__new__(BlazingContext)
+    context.lock = Lock()
+    context.planner_lock = Lock()
+    context.catalog_version = 3
+    context.plan_cache = PlanCache()
+    context.async_executor = ThreadPoolExecutor(1)
+    context.finalizeCaller = lambda: None
+
+    class Generator(object):
+        def getRelationalAlgebraString(self, sql):
+            assert not context.lock.locked()
+            assert context.planner_lock.locked()
+            # a table created while the query is planned
+            context.catalog_version += 1
+            return "LogicalTableScan(table=[[main, t]])"
+
+    context.generator = Generator()
+    algebra, plan, catalog_version = context._get_algebra_plan_and_version(
+        "select * from t", True, need_plan=False
+    )
+    assert algebra == "LogicalTableScan(table=[[main, t]])"
+    assert plan is None
+    # cached under the version read before planning
+    assert catalog_version == 3
+    assert context.plan_cache.get(("select * from t", 3)) is not None
+    assert context.plan_cache.get(("select * from t", 4)) is None
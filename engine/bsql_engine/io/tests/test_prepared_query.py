@@ -0,0 +1,76 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from pyblazing.apiv2.context import (
+    PreparedQuery,
+    bind_dynamic_params,
+    escape_json_string,
+    get_dynamic_param_indexes,
+    to_algebra_literal,
+)
+
+
+def test_dynamic_param_indexes_skip_quoted_text():
+    algebra = "LogicalFilter(condition=[AND(=($0, ?0), =($1, '?3'), >($2, ?1))])"
+    assert get_dynamic_param_indexes(algebra) == {0, 1}
+
+
+def test_literals_of_numbers_and_strings():
+    assert to_algebra_literal(None) == "null"
+    assert to_algebra_literal(True) == "true"
+    assert to_algebra_literal(np.bool_(False)) == "false"
+    assert to_algebra_literal(np.int32(7)) == "7"
+    assert to_algebra_literal(0.5) == "0.5"
+    assert to_algebra_literal("it's") == "'it''s'"
+
+
+def test_literals_of_dates_and_timestamps_are_typed():
+    timestamp = datetime.datetime(2020, 1, 2, 3, 4, 5)
+    assert to_algebra_literal(timestamp) == "CAST(2020-01-02 03:04:05):TIMESTAMP"
+    assert to_algebra_literal(np.datetime64("2020-01-02T03:04:05")) == (
+        "CAST(2020-01-02 03:04:05):TIMESTAMP"
+    )
+    assert to_algebra_literal(datetime.date(2020, 1, 2)) == "CAST(2020-01-02):DATE"
+
+
+def test_unsupported_literals_raise():
+    with pytest.raises(TypeError):
+        to_algebra_literal(b"bytes")
+
+
+def test_bind_replaces_params_outside_of_quotes():
+    text = "=($0, ?0), =($1, '?0'), =($2, ?1)"
+    bound = bind_dynamic_params(text, ["5", "'x'"])
+    assert bound == "=($0, 5), =($1, '?0'), =($2, 'x')"
+
+
+def test_bind_escapes_literals_of_json_plans():
+    text = '{"expr": "=($0, ?0)"}'
+    bound = bind_dynamic_params(text, ['"quoted"'], escape_json_string)
+    assert bound == '{"expr": "=($0, \\"quoted\\")"}'
+
+
+def prepared_query(plan, table_scans, num_params):
+    query = PreparedQuery(None, "select * from t where a = ?")
+    query.plan = plan
+    query.table_scans = table_scans
+    query.num_params = num_params
+    return query
+
+
+def test_prepared_query_binds_plan_and_table_scans():
+    query = prepared_query(
+        '{"expr": "=($0, ?0)"}', ["BindableTableScan(filters=[[=($0, ?0)]])"], 1
+    )
+    plan, table_scans = query.bind(["a"])
+    assert plan == '{"expr": "=($0, \'a\')"}'
+    assert table_scans == ["BindableTableScan(filters=[[=($0, 'a')]])"]
+
+
+def test_prepared_query_checks_the_number_of_params():
+    query = prepared_query('{"expr": "=($0, ?0)"}', [], 1)
+    with pytest.raises(ValueError):
+        query.bind()
+    assert prepared_query("{}", [], 0).bind() == ("{}", [])
@@ -0,0 +1,177 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pyblazing.apiv2.context import BlazingContext, QueryScheduler
+
+
+def test_disabled_scheduler_admits_everything():
+    scheduler = QueryScheduler(0)
+    tickets = [scheduler.admit(["w0"]) for _ in range(3)]
+    assert scheduler.info()["running"] == {}
+    for ticket in tickets:
+        scheduler.release(ticket)
+
+
+def test_queries_wait_for_a_free_worker():
+    scheduler = QueryScheduler(1)
+    first = scheduler.admit(["w0"])
+    admitted = []
+    thread = threading.Thread(target=lambda: admitted.append(scheduler.admit(["w0"])))
+    thread.start()
+    thread.join(0.1)
+    assert admitted == []
+    assert scheduler.info()["waiting"] == 1
+
+    scheduler.release(first)
+    thread.join(5)
+    assert len(admitted) == 1
+    assert scheduler.info() == {
+        "running": {"w0": 1},
+        "waiting": 0,
+        "max_queries_per_worker": 1,
+    }
+
+
+def test_release_is_idempotent():
+    scheduler = QueryScheduler(1)
+    ticket = scheduler.admit(["w0", "w1"])
+    scheduler.release(ticket)
+    scheduler.release(ticket)
+    assert scheduler.info()["running"] == {}
+
+
+def test_waiting_queries_are_admitted_by_priority_then_fair_share():
+    scheduler = QueryScheduler(1)
+    running = scheduler.admit(["w0"], owner="a")
+    # owner a keeps a query running on another worker
+    scheduler.admit(["w1"], owner="a")
+    with scheduler.condition:
+        low = scheduler._new_ticket(["w0"], 0, "b")
+        same_owner = scheduler._new_ticket(["w0"], 1, "a")
+        other_owner = scheduler._new_ticket(["w0"], 1, "c")
+        scheduler.waiting.extend([low, same_owner, other_owner])
+
+    scheduler.release(running)
+    # the highest priority first, and among those the owner with fewer
+    # running queries
+    assert other_owner["admitted"]
+    assert not same_owner["admitted"] and not low["admitted"]
+
+    scheduler.release(other_owner)
+    assert same_owner["admitted"]
+    scheduler.release(same_owner)
+    assert low["admitted"]
+
+
+def test_blocked_queries_hold_back_the_ones_behind_on_the_same_workers():
+    scheduler = QueryScheduler(1)
+    running = scheduler.admit(["w0"])
+    with scheduler.condition:
+        all_workers = scheduler._new_ticket(["w0", "w1"], 0, None)
+        single_worker = scheduler._new_ticket(["w1"], 0, None)
+        scheduler.waiting.extend([all_workers, single_worker])
+        scheduler._dispatch()
+    assert not all_workers["admitted"] and not single_worker["admitted"]
+
+    scheduler.release(running)
+    assert all_workers["admitted"] and not single_worker["admitted"]
+
+
+def test_release_when_done_waits_for_all_the_futures():
+    class Future(object):
+        def __init__(self):
+            self.callbacks = []
+
+        def add_done_callback(self, callback):
+            self.callbacks.append(callback)
+
+        def finish(self):
+            for callback in self.callbacks:
+                callback(self)
+
+    scheduler = QueryScheduler(1)
+    ticket = scheduler.admit(["w0"])
+    futures = [Future(), Future()]
+    scheduler.release_when_done(ticket, futures)
+    futures[0].finish()
+    assert ticket["admitted"]
+    futures[1].finish()
+    assert not ticket["admitted"]
+
+    ticket = scheduler.admit(["w0"])
+    scheduler.release_when_done(ticket, [])
+    assert not ticket["admitted"]
+
+
+def test_admit_async_waits_on_the_event_loop():
+    async def run():
+        scheduler = QueryScheduler(1)
+        first = await scheduler.admit_async(["w0"])
+        second = asyncio.ensure_future(scheduler.admit_async(["w0"]))
+        await asyncio.sleep(0.01)
+        assert not second.done()
+
+        # release can be called from any thread
+        threading.Thread(target=scheduler.release, args=(first,)).start()
+        ticket = await asyncio.wait_for(second, 5)
+        assert ticket["admitted"]
+
+    asyncio.run(run())
+
+
+def test_cancelled_admit_async_leaves_the_queue():
+    async def run():
+        scheduler = QueryScheduler(1)
+        first = await scheduler.admit_async(["w0"])
+        cancelled = asyncio.ensure_future(scheduler.admit_async(["w0"]))
+        waiting = asyncio.ensure_future(scheduler.admit_async(["w0"]))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        await asyncio.sleep(0.01)
+        assert scheduler.info()["waiting"] == 1
+
+        scheduler.release(first)
+        ticket = await asyncio.wait_for(waiting, 5)
+        assert ticket["admitted"]
+        assert scheduler.info()["running"] == {"w0": 1}
+
+    asyncio.run(run())
+
+
+def test_query_cancelled_while_queued_in_the_executor_releases_its_ticket():
+    context = BlazingContext.__new__(BlazingContext)
+    context.dask_client = None
+    context.query_scheduler = QueryScheduler(1)
+    context.async_executor = ThreadPoolExecutor(1)
+    context._get_query_plan = lambda *args: ("LogicalProject", "plan", 0, [], [])
+    runs = []
+    context._run_plan = lambda *args, **kwargs: runs.append(args)
+    context.finalizeCaller = lambda: None
+
+    async def run():
+        first = context.query_scheduler.admit(["local"])
+        handle = context.sql_async("select a from t")
+        while handle.status() != "waiting":
+            await asyncio.sleep(0.01)
+
+        # the only thread of the executor is busy when the query is admitted
+        unblock = threading.Event()
+        context.async_executor.submit(unblock.wait)
+        context.query_scheduler.release(first)
+        while handle.status() != "running":
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.01)
+        assert context.query_scheduler.info()["running"] == {"local": 1}
+
+        handle.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await handle
+        unblock.set()
+        assert context.query_scheduler.info()["running"] == {}
+
+    asyncio.run(run())
+    context.async_executor.shutdown(wait=True)
+    assert runs == []
@@ -0,0 +1,104 @@
+import os
+
+import cudf
+import pyarrow
+
+from pyblazing.apiv2 import DataType
+from pyblazing.apiv2.context import BlazingTable, ResultCache, get_table_version
+
+
+def make_result(num_rows=100, start=0):
+    # 8 bytes per row
+    return cudf.DataFrame({"a": list(range(start, start + num_rows))})
+
+
+def test_results_are_returned_from_host_memory(tmp_path):
+    cache = ResultCache(10000, 0, str(tmp_path))
+    assert cache.get("q") is None
+    cache.put("q", ["t"], make_result())
+    result = cache.get("q")
+    assert result["a"].tolist() == list(range(100))
+    assert cache.info()["hits"] == 1
+    assert cache.info()["misses"] == 1
+    assert cache.host_bytes == 800
+
+
+def test_disabled_cache_keeps_nothing(tmp_path):
+    cache = ResultCache(0, 0, str(tmp_path))
+    cache.put("q", ["t"], make_result())
+    assert cache.get("q") is None
+    assert cache.entry_tables == {}
+
+
+def test_least_recently_used_results_are_evicted(tmp_path):
+    cache = ResultCache(1600, 0, str(tmp_path))
+    cache.put("first", ["t"], make_result())
+    cache.put("second", ["t"], make_result(start=100))
+    cache.get("first")
+    cache.put("third", ["t"], make_result(start=200))
+    assert cache.get("second") is None
+    assert cache.get("first")["a"].tolist() == list(range(100))
+    assert cache.get("third")["a"].tolist() == list(range(200, 300))
+    assert cache.host_bytes == 1600
+    assert "second" not in cache.entry_tables
+
+
+def test_evicted_results_are_spilled_and_reloaded(tmp_path):
+    cache = ResultCache(800, 10000, str(tmp_path))
+    cache.put("first", ["t"], make_result())
+    cache.put("second", ["t"], make_result(start=100))
+    assert list(cache.host_entries) == ["second"]
+    path, nbytes = cache.disk_entries["first"]
+    assert nbytes == 800 and cache.disk_bytes == 800
+    assert os.path.dirname(path) == os.path.join(str(tmp_path), "result_cache")
+
+    # the spilled result is an arrow ipc file
+    with pyarrow.memory_map(path) as source:
+        spilled = pyarrow.ipc.open_file(source).read_all()
+    assert spilled.column("a").to_pylist() == list(range(100))
+    assert cache.get("first")["a"].tolist() == list(range(100))
+
+    cache.invalidate("t")
+    assert not os.path.exists(path)
+    assert cache.disk_bytes == 0 and cache.host_bytes == 0
+
+
+def test_results_over_the_host_budget_go_to_disk(tmp_path):
+    cache = ResultCache(100, 10000, str(tmp_path))
+    cache.put("q", ["t"], make_result())
+    assert list(cache.host_entries) == []
+    assert list(cache.disk_entries) == ["q"]
+    assert cache.get("q")["a"].tolist() == list(range(100))
+
+
+def test_unreadable_spilled_results_are_misses(tmp_path):
+    cache = ResultCache(0, 10000, str(tmp_path))
+    cache.put("q", ["t"], make_result())
+    os.remove(cache.disk_entries["q"][0])
+    assert cache.get("q") is None
+    assert cache.disk_bytes == 0 and "q" not in cache.entry_tables
+
+
+def test_results_miss_after_the_files_of_a_table_change(tmp_path):
+    files = [b"a.parquet", b"b.parquet"]
+    table = BlazingTable("t", files, DataType.PARQUET, files=files)
+    statuses = {"a.parquet": (10, 100), "b.parquet": (20, 200)}
+
+    def get_file_statuses(paths):
+        return [statuses[path] for path in paths]
+
+    cache = ResultCache(10000, 0, str(tmp_path))
+    key = ("plan", (("t", get_table_version(table, get_file_statuses)),))
+    cache.put(key, ["t"], make_result())
+    same_key = ("plan", (("t", get_table_version(table, get_file_statuses)),))
+    assert cache.get(same_key) is not None
+
+    statuses["b.parquet"] = (20, 300)
+    changed_key = ("plan", (("t", get_table_version(table, get_file_statuses)),))
+    assert changed_key != key
+    assert cache.get(changed_key) is None
+
+    # filesystems without modification times have no version
+    statuses["b.parquet"] = (20, 0)
+    assert get_table_version(table, get_file_statuses) is None
+
@@ -0,0 +1,76 @@
+import numpy as np
+
+from pyblazing.apiv2 import DataType
+from pyblazing.apiv2.context import (
+    BlazingTable,
+    group_row_groups_by_file,
+    row_groups_to_csr,
+    slice_row_groups,
+)
+
+
+def test_row_groups_to_csr():
+    offsets, ids = row_groups_to_csr([[0, 1, 2], [], [5, 3]])
+    assert offsets.tolist() == [0, 3, 3, 5]
+    assert ids.tolist() == [0, 1, 2, 5, 3]
+    assert ids.dtype == np.int32
+
+
+def test_row_groups_to_csr_without_files():
+    offsets, ids = row_groups_to_csr([])
+    assert offsets.tolist() == [0]
+    assert len(ids) == 0
+
+
+def test_group_row_groups_by_file_keeps_the_metadata_order():
+    file_handle_index = [2, 0, 2, 0, 5]
+    row_group_index = [1, 4, 0, 3, 7]
+    files, offsets, ids = group_row_groups_by_file(file_handle_index, row_group_index)
+    assert files.tolist() == [0, 2, 5]
+    assert offsets.tolist() == [0, 2, 4, 5]
+    assert ids.tolist() == [4, 3, 1, 0, 7]
+
+
+def test_slice_row_groups():
+    offsets, ids = row_groups_to_csr([[0, 1], [2], [3, 4, 5]])
+    sliced_offsets, sliced_ids = slice_row_groups(offsets, ids, 1, 3)
+    assert sliced_offsets.tolist() == [0, 1, 4]
+    assert sliced_ids.tolist() == [2, 3, 4, 5]
+
+
+def test_slice_row_groups_past_the_end_is_empty():
+    offsets, ids = row_groups_to_csr([[0, 1]])
+    sliced_offsets, sliced_ids = slice_row_groups(offsets, ids, 3, 4)
+    assert sliced_offsets.tolist() == [0]
+    assert len(sliced_ids) == 0
+
+
+def test_table_slices_keep_the_row_groups_of_their_files():
+    files = [b"a.parquet", b"b.parquet", b"c.parquet"]
+    offsets, ids = row_groups_to_csr([[0, 1], [2], [3, 4, 5]])
+    table = BlazingTable(
+        "t",
+        files,
+        DataType.PARQUET,
+        files=files,
+        row_group_offsets=offsets,
+        row_group_ids=ids,
+    )
+    first, second = table.getSlices(2)
+    assert first.files == [b"a.parquet"]
+    assert first.row_group_offsets.tolist() == [0, 2]
+    assert first.row_group_ids.tolist() == [0, 1]
+    assert second.files == [b"b.parquet", b"c.parquet"]
+    assert second.offset == (1, 2)
+    assert second.row_group_offsets.tolist() == [0, 1, 4]
+    assert second.row_group_ids.tolist() == [2, 3, 4, 5]
+
+
+def test_row_groups_ids_of_a_table_are_kept_as_csr():
+    files = [b"a.parquet", b"b.parquet"]
+    table = BlazingTable(
+        "t", files, DataType.PARQUET, files=files, row_groups_ids=[[1, 0], [2]]
+    )
+    assert table.row_group_offsets.tolist() == [0, 2, 3]
+    assert table.row_group_ids.tolist() == [1, 0, 2]
+    assert table.row_groups_ids == [[1, 0], [2]]
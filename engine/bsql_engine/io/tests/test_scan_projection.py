@@ -0,0 +1,32 @@
+from pyblazing.apiv2.context import getScanProjection
+
+
+def test_scan_reads_the_projected_columns():
+    scan = (
+        "BindableTableScan(table=[[main, t]], "
+        "projects=[[3, 0, 5]], aliases=[[d, a, f]])"
+    )
+    column_indices, new_scan = getScanProjection(scan, 6)
+    assert column_indices == [3, 0, 5]
+    assert new_scan == (
+        "BindableTableScan(table=[[main, t]], "
+        "projects=[[0, 1, 2]], aliases=[[d, a, f]])"
+    )
+
+
+def test_projected_filters_are_kept():
+    scan = (
+        "BindableTableScan(table=[[main, t]], filters=[[>($0, 1)]], "
+        "projects=[[2, 4]], aliases=[[c, e]])"
+    )
+    column_indices, new_scan = getScanProjection(scan, 5)
+    assert column_indices == [2, 4]
+    assert "filters=[[>($0, 1)]]" in new_scan
+    assert "projects=[[0, 1]]" in new_scan
+
+
+def test_scan_without_projection_reads_all_the_columns():
+    scan = "LogicalTableScan(table=[[main, t]])"
+    column_indices, new_scan = getScanProjection(scan, 3)
+    assert column_indices == [0, 1, 2]
+    assert new_scan == scan
@@ -89,9 +89,19 @@ std::unique_ptr<ResultSet> parseMetadata(std::vector<std::string> files,
 	TableSchema schema,
 	std::string file_format_hint,
 	std::vector<std::string> arg_keys,
-	std::vector<std::string> arg_values);
+	std::vector<std::string> arg_values,
+	size_t footer_reader_threads,
+	int footer_reader_retries);
+
+// returns the size and the modification time (in milliseconds since epoch) of each file
+// or zeros for the files whose status could not be read
+std::vector<std::pair<unsigned long long, unsigned long long>> getFileStatuses(std::vector<std::string> files,
+	size_t num_threads);
+
+// drops the cached exists, status and listing results of the uris that start with uri_prefix (all of them if empty)
+void invalidateListingCache(std::string uri_prefix);
 
 std::pair<bool, std::string> registerFileSystemHDFS(HDFS hdfs, std::string root, std::string authority);
 std::pair<bool, std::string> registerFileSystemGCS(GCS gcs, std::string root, std::string authority);
 std::pair<bool, std::string> registerFileSystemS3(S3 s3, std::string root, std::string authority);
-std::pair<bool, std::string> registerFileSystemLocal(std::string root, std::string authority);
+std::pair<bool, std::string> registerFileSystemLocal(std::string root, std::string authority, bool useMemoryMap);
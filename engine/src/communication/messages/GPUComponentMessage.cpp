@@ -190,11 +190,13 @@ std::shared_ptr<ReceivedMessage> deserialize_from_gpu(const MessageMetadata & me
 
 	auto received_table = deserialize_from_gpu_raw_buffers(columns_offsets, raw_buffers);
 
-    return std::make_shared<ReceivedDeviceMessage>(message_metadata.messageToken,
+    auto message = std::make_shared<ReceivedDeviceMessage>(message_metadata.messageToken,
         message_metadata.contextToken,
         node,
         std::move(received_table),
         message_metadata.total_row_size);
+    message->metadata().scan_work = message_metadata.scan_work;
+    return message;
 }
 
 //TODO: get column size_in_bytes
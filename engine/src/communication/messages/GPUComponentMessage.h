@@ -133,7 +133,9 @@ public:
 		std::vector<std::basic_string<char>> && raw_buffers) {  
 		auto host_table = std::make_unique<ral::frame::BlazingHostTable>(columns_offsets, std::move(raw_buffers));
 		auto node = Node(Address::TCP(address_metadata.ip, address_metadata.comunication_port, address_metadata.protocol_port));
-		return std::make_shared<ReceivedHostMessage>(message_metadata.messageToken, message_metadata.contextToken, node, std::move(host_table), message_metadata.total_row_size, message_metadata.partition_id);
+		auto message = std::make_shared<ReceivedHostMessage>(message_metadata.messageToken, message_metadata.contextToken, node, std::move(host_table), message_metadata.total_row_size, message_metadata.partition_id);
+		message->metadata().scan_work = message_metadata.scan_work;
+		return message;
 	}
 
 	ral::frame::BlazingTableView getTableView() { return table_view; }
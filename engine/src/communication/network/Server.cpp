@@ -53,12 +53,20 @@ std::shared_ptr<ReceivedMessage> Server::getMessage(
 		std::unique_ptr<ral::frame::BlazingTable> samples = host_msg_ptr->getBlazingTable();
 		int64_t total_row_size = message->metadata().total_row_size;
 		int32_t partition_id = message->metadata().partition_id;
-		return std::make_shared<messages::ReceivedDeviceMessage>(messageToken, contextToken, sender_node, std::move(samples), total_row_size, partition_id);
+		auto device_message = std::make_shared<messages::ReceivedDeviceMessage>(messageToken, contextToken, sender_node, std::move(samples), total_row_size, partition_id);
+		device_message->metadata().scan_work = message->metadata().scan_work;
+		return device_message;
 	}
 	
 	return message;
 }
 
+void Server::putSentinelMessage(const ContextToken & token_value, const MessageTokenType & messageToken) {
+	blazingdb::transport::Node tmp_node;
+	std::shared_ptr<ReceivedMessage> sentinel_message = std::make_shared<ReceivedMessage>(messageToken, token_value, tmp_node, true);
+	comm_server->putMessage(token_value, sentinel_message);
+}
+
 std::shared_ptr<ReceivedMessage> Server::getHostMessage(const ContextToken & token_value, const MessageTokenType & messageToken){
 	return comm_server->getMessage(token_value, messageToken);
 }
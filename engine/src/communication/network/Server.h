@@ -37,6 +37,9 @@ public:
 
 	std::shared_ptr<ReceivedMessage> getHostMessage(const ContextToken & token_value, const MessageTokenType & messageToken);
 
+	// the next getMessage of the message token returns a nullptr, it is used to stop a thread waiting for a message
+	void putSentinelMessage(const ContextToken & token_value, const MessageTokenType & messageToken);
+
 private:
 	Server(Server &&) = delete;
 
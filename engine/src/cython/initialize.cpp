@@ -129,6 +129,19 @@ void initialize(int ralId,
 	// Init AWS S3 ... TODO see if we need to call shutdown and avoid leaks from s3 percy
 	BlazingContext::getInstance()->initExternalSystems();
 
+	auto listing_cache_it = config_options.find("LISTING_CACHE_TTL");
+	if (listing_cache_it != config_options.end()){
+		BlazingContext::getInstance()->getFileSystemManager()->setListingCacheTtl(std::stoi(listing_cache_it->second));
+	}
+
+	// the default local file system (the local paths without a registered prefix) reads through a memory mapping
+	auto local_memory_map_it = config_options.find("LOCAL_FILES_MEMORY_MAP");
+	if (local_memory_map_it != config_options.end() && (local_memory_map_it->second == "True" || local_memory_map_it->second == "true")){
+		auto fileSystemManager = BlazingContext::getInstance()->getFileSystemManager();
+		fileSystemManager->deregisterFileSystem("local");
+		fileSystemManager->registerFileSystem(FileSystemEntity("local", FileSystemConnection(FileSystemType::LOCAL, true)));
+	}
+
 	// spdlog batch logger
 	spdlog::shutdown();
 
@@ -17,6 +17,8 @@ using namespace fmt::literals;
 // #include "blazingdb/io/Library/Network/NormalSyncSocket.h"
 
 #include <numeric>
+#include <atomic>
+#include "blazingdb/concurrency/BlazingThread.h"
 
 TableSchema parseSchema(std::vector<std::string> files,
 	std::string file_format_hint,
@@ -85,15 +87,18 @@ std::unique_ptr<ResultSet> parseMetadata(std::vector<std::string> files,
 	TableSchema schema,
 	std::string file_format_hint,
 	std::vector<std::string> arg_keys,
-	std::vector<std::string> arg_values) {
+	std::vector<std::string> arg_values,
+	size_t footer_reader_threads,
+	int footer_reader_retries) {
 	if (offset.second == 0) {
 		// cover case for empty files to parse
 		
-		std::vector<size_t> column_indices(2 * schema.types.size() + 2);
+		// min and max and null_count per column, num_rows, total_byte_size, file_handle_index and row_group_index
+		std::vector<size_t> column_indices(3 * schema.types.size() + 4);
 		std::iota(column_indices.begin(), column_indices.end(), 0);
 
-		std::vector<std::string> names(2 * schema.types.size() + 2);
-		std::vector<cudf::type_id> dtypes(2 * schema.types.size() + 2);
+		std::vector<std::string> names(3 * schema.types.size() + 4);
+		std::vector<cudf::type_id> dtypes(3 * schema.types.size() + 4);
 
 		size_t index = 0;
 		for(; index < schema.types.size(); index++) {
@@ -110,11 +115,23 @@ std::unique_ptr<ResultSet> parseMetadata(std::vector<std::string> files,
 			names[2*index] = col_name_min;
 			names[2*index + 1] = col_name_max;
 		}
-		dtypes[2*index] = cudf::type_id::INT32;
-		names[2*index] = "file_handle_index";
+		size_t num_cols = schema.types.size();
+		for(index = 0; index < num_cols; index++) {
+			dtypes[2*num_cols + index] = cudf::type_id::INT64;
+			names[2*num_cols + index] = "null_count_" + std::to_string(index) + "_" + schema.names[index];
+		}
+		index = 3*num_cols;
+		dtypes[index] = cudf::type_id::INT64;
+		names[index] = "num_rows";
+
+		dtypes[index + 1] = cudf::type_id::INT64;
+		names[index + 1] = "total_byte_size";
+
+		dtypes[index + 2] = cudf::type_id::INT32;
+		names[index + 2] = "file_handle_index";
 
-		dtypes[2*index + 1] = cudf::type_id::INT32;
-		names[2*index + 1] = "row_group_index";
+		dtypes[index + 3] = cudf::type_id::INT32;
+		names[index + 3] = "row_group_index";
 		std::unique_ptr<ResultSet> result = std::make_unique<ResultSet>();
 		result->names = names;
 		auto table = ral::utilities::create_empty_table(dtypes);
@@ -128,7 +145,7 @@ std::unique_ptr<ResultSet> parseMetadata(std::vector<std::string> files,
 
 	std::shared_ptr<ral::io::data_parser> parser;
 	if(fileType == ral::io::DataType::PARQUET) {
-		parser = std::make_shared<ral::io::parquet_parser>();
+		parser = std::make_shared<ral::io::parquet_parser>(footer_reader_threads, footer_reader_retries);
 	} else if(fileType == ral::io::DataType::ORC) {
 		parser = std::make_shared<ral::io::orc_parser>(args.orcReaderArg);
 	} else if(fileType == ral::io::DataType::JSON) {
@@ -156,6 +173,40 @@ std::unique_ptr<ResultSet> parseMetadata(std::vector<std::string> files,
 	}
 }
 
+std::vector<std::pair<unsigned long long, unsigned long long>> getFileStatuses(std::vector<std::string> files,
+	size_t num_threads) {
+	std::vector<std::pair<unsigned long long, unsigned long long>> statuses(files.size(), std::make_pair(0, 0));
+
+	std::atomic<size_t> next_file_index{0};
+	std::vector<BlazingThread> threads;
+	for(size_t thread_index = 0; thread_index < std::min(std::max(num_threads, size_t(1)), files.size()); thread_index++) {
+		threads.push_back(BlazingThread([&]() {
+			size_t file_index;
+			while((file_index = next_file_index++) < files.size()) {
+				try {
+					// the caller compares the status with a previous one, so it must not come from the listing cache
+					const Uri uri{files[file_index]};
+					FileStatus status = BlazingContext::getInstance()->getFileSystemManager()->getFileStatus(uri, false);
+					statuses[file_index] = std::make_pair(status.getFileSize(), status.getModificationTime());
+				} catch(...) {
+					// unknown status, the caller will not use it
+				}
+			}
+		}));
+	}
+	for(auto & thread : threads) {
+		thread.join();
+	}
+	return statuses;
+}
+
+
+void invalidateListingCache(std::string uri_prefix) {
+	if(!uri_prefix.empty()) {
+		uri_prefix = Uri(uri_prefix).toString(true);
+	}
+	BlazingContext::getInstance()->getFileSystemManager()->invalidateListingCache(uri_prefix);
+}
 
 
 std::pair<bool, std::string> registerFileSystem(
@@ -202,7 +253,7 @@ std::pair<bool, std::string> registerFileSystemS3(S3 s3, std::string root, std::
 		s3.region);
 	return registerFileSystem(fileSystemConnection, root, authority);
 }
-std::pair<bool, std::string> registerFileSystemLocal(std::string root, std::string authority) {
-	FileSystemConnection fileSystemConnection = FileSystemConnection(FileSystemType::LOCAL);
+std::pair<bool, std::string> registerFileSystemLocal(std::string root, std::string authority, bool useMemoryMap) {
+	FileSystemConnection fileSystemConnection = FileSystemConnection(FileSystemType::LOCAL, useMemoryMap);
 	return registerFileSystem(fileSystemConnection, root, authority);
 }
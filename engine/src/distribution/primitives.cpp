@@ -480,6 +480,67 @@ void collectLeftRightTableSizeBytes(Context * context,	std::vector<int64_t> & no
 	}
 }
 
+static std::string scanWorkMessageId(Context * context, int32_t scan_id, const std::string & kind) {
+	return SampleToNodeMasterMessage::MessageID() + "_scan_" + kind + "_" + std::to_string(scan_id) + "_" +
+		   context->getContextCommunicationToken();
+}
+
+void requestScanWork(Context * context, int32_t scan_id, int64_t request) {
+
+	const uint32_t context_token = context->getContextToken();
+	const std::string message_id = scanWorkMessageId(context, scan_id, "request");
+
+	auto self_node = CommunicationData::getInstance().getSelfNode();
+	auto message = Factory::createSampleToNodeMaster(message_id, context_token, self_node, 0, {});
+	message->metadata().scan_work = request;
+
+	Client::send(context->getMasterNode(), *message);
+}
+
+std::pair<Node, int64_t> collectScanWorkRequest(Context * context, int32_t scan_id) {
+
+	const uint32_t context_token = context->getContextToken();
+	const std::string message_id = scanWorkMessageId(context, scan_id, "request");
+
+	auto message = Server::getInstance().getMessage(context_token, message_id);
+	if(message == nullptr) {
+		// the sentinel of cancelScanWorkRequests
+		return std::make_pair(Node(), SCAN_WORK_REQUEST_CANCEL);
+	}
+	auto concrete_message = std::static_pointer_cast<ReceivedDeviceMessage>(message);
+	return std::make_pair(concrete_message->getSenderNode(), concrete_message->metadata().scan_work);
+}
+
+void cancelScanWorkRequests(Context * context, int32_t scan_id) {
+
+	const uint32_t context_token = context->getContextToken();
+	const std::string message_id = scanWorkMessageId(context, scan_id, "request");
+
+	Server::getInstance().putSentinelMessage(context_token, message_id);
+}
+
+void sendScanWorkAssignment(Context * context, int32_t scan_id, const Node & node, int64_t batch_index) {
+
+	const uint32_t context_token = context->getContextToken();
+	const std::string message_id = scanWorkMessageId(context, scan_id, "assignment");
+
+	auto self_node = CommunicationData::getInstance().getSelfNode();
+	auto message = Factory::createSampleToNodeMaster(message_id, context_token, self_node, 0, {});
+	message->metadata().scan_work = batch_index;
+
+	Client::send(node, *message);
+}
+
+int64_t collectScanWorkAssignment(Context * context, int32_t scan_id) {
+
+	const uint32_t context_token = context->getContextToken();
+	const std::string message_id = scanWorkMessageId(context, scan_id, "assignment");
+
+	auto message = Server::getInstance().getMessage(context_token, message_id);
+	auto concrete_message = std::static_pointer_cast<ReceivedDeviceMessage>(message);
+	return concrete_message->metadata().scan_work;
+}
+
 }  // namespace distribution
 }  // namespace ral
 
@@ -66,6 +66,24 @@ namespace distribution {
 
 	void collectLeftRightTableSizeBytes(Context * context,	std::vector<int64_t> & node_num_bytes_left,
 			std::vector<int64_t> & node_num_bytes_right);
+
+	// dynamic assignment of the batches of a table scan: the workers ask the
+	// master node for the index of the next batch they have to read. The
+	// messages of each table scan are told apart by its scan_id
+	const int64_t SCAN_WORK_REQUEST_NEXT = 0;
+	const int64_t SCAN_WORK_REQUEST_DONE = 1;
+	// returned by collectScanWorkRequest after cancelScanWorkRequests
+	const int64_t SCAN_WORK_REQUEST_CANCEL = 2;
+
+	void requestScanWork(Context * context, int32_t scan_id, int64_t request);
+
+	std::pair<Node, int64_t> collectScanWorkRequest(Context * context, int32_t scan_id);
+
+	void cancelScanWorkRequests(Context * context, int32_t scan_id);
+
+	void sendScanWorkAssignment(Context * context, int32_t scan_id, const Node & node, int64_t batch_index);
+
+	int64_t collectScanWorkAssignment(Context * context, int32_t scan_id);
 	
 }  // namespace distribution
 }  // namespace ral
@@ -25,6 +25,7 @@
 #include <src/utilities/DebuggingUtils.h>
 #include <stack>
 #include <mutex>
+#include <thread>
 #include "io/DataLoader.h"
 #include "io/Schema.h"
 #include <Util/StringUtil.h>
@@ -249,8 +250,8 @@ private:
 
 class DataSourceSequence {
 public:
-	DataSourceSequence(ral::io::data_loader &loader, ral::io::Schema & schema, std::shared_ptr<Context> context)
-		: context(context), loader(loader), schema(schema), batch_index{0}, cur_file_index{0}, cur_row_group_index{0}, n_batches{0}
+	DataSourceSequence(ral::io::data_loader &loader, ral::io::Schema & schema, std::shared_ptr<Context> context, int32_t scan_id = 0)
+		: context(context), loader(loader), schema(schema), batch_index{0}, cur_file_index{0}, cur_row_group_index{0}, n_batches{0}, scan_id{scan_id}
 	{
 		// n_partitions{n_partitions}: TODO Update n_batches using data_loader
 		this->provider = loader.get_provider();
@@ -268,9 +269,81 @@ public:
 		} else {
 			n_batches = n_files;
 		}
+
+		// with SCAN_ASSIGNMENT_MODE=dynamic every node has the same list of files (batches)
+		// and the master node hands out the index of the next batch to read to the node that asks for it.
+		// The scan_id (the id of the kernel, the same on every node) tells apart the table scans of a query
+		std::map<std::string, std::string> config_options = context->getConfigOptions();
+		auto it = config_options.find("SCAN_ASSIGNMENT_MODE");
+		is_dynamic_assignment = it != config_options.end() && it->second == "dynamic" &&
+			context->getTotalNodes() > 1 && !is_gdf_parser && !is_empty_data_source;
+		is_master_node = context->isMasterNode(ral::communication::CommunicationData::getInstance().getSelfNode());
+		next_batch_to_assign = std::make_shared<std::atomic<size_t>>(0);
+		assignment_finished = false;
+	}
+
+	~DataSourceSequence() {
+		if (assignment_thread.joinable()) {
+			// the query ended without finish_work_assignment (i.e. it failed), so the other nodes may never send
+			// their last request, the assignment thread stops waiting for them
+			ral::distribution::cancelScanWorkRequests(context.get(), scan_id);
+			assignment_thread.join();
+		}
+	}
+
+	// the master node answers the requests of the other nodes until all of them are done with this table scan
+	void start_work_assignment() {
+		if (!is_dynamic_assignment || !is_master_node) {
+			return;
+		}
+
+		assignment_thread = std::thread([context = this->context, next_batch_to_assign = this->next_batch_to_assign, n_batches = this->n_batches, scan_id = this->scan_id](){
+			int pending_nodes = context->getTotalNodes() - 1;
+			while (pending_nodes > 0) {
+				auto request = ral::distribution::collectScanWorkRequest(context.get(), scan_id);
+				if (request.second == ral::distribution::SCAN_WORK_REQUEST_CANCEL) {
+					break;
+				}
+				if (request.second == ral::distribution::SCAN_WORK_REQUEST_DONE) {
+					pending_nodes--;
+					continue;
+				}
+
+				size_t batch = (*next_batch_to_assign)++;
+				ral::distribution::sendScanWorkAssignment(context.get(), scan_id, request.first, std::min(batch, n_batches));
+				if (batch >= n_batches) {
+					pending_nodes--;
+				}
+			}
+		});
+	}
+
+	// tells the master node that we are not going to ask for more batches (i.e. because of a limit)
+	// and on the master node waits until every node is done
+	void finish_work_assignment() {
+		if (!is_dynamic_assignment) {
+			return;
+		}
+
+		if (is_master_node) {
+			if (assignment_thread.joinable()) {
+				assignment_thread.join();
+			}
+		} else {
+			std::unique_lock<std::mutex> request_lock(request_mutex_);
+			std::unique_lock<std::mutex> lock(mutex_);
+			if (!assignment_finished) {
+				assignment_finished = true;
+				ral::distribution::requestScanWork(context.get(), scan_id, ral::distribution::SCAN_WORK_REQUEST_DONE);
+			}
+		}
 	}
 
 	RecordBatch next() {
+		if (is_dynamic_assignment) {
+			return next_assigned();
+		}
+
 		std::unique_lock<std::mutex> lock(mutex_);
 
 		if (!has_next()) {
@@ -290,6 +363,43 @@ public:
 			return std::move(ret);
 		}
 
+		return load_next_file(lock);
+	}
+
+	// next() with SCAN_ASSIGNMENT_MODE=dynamic
+	RecordBatch next_assigned() {
+		// the requests of the threads of this node are sent one at a time, so the master assigns them increasing
+		// batches, but the round trip to the master is done without holding the mutex
+		std::unique_lock<std::mutex> request_lock(request_mutex_);
+		{
+			std::unique_lock<std::mutex> lock(mutex_);
+			if (!has_next()) {
+				return nullptr;
+			}
+		}
+
+		size_t assigned_file_index = next_assigned_batch();
+
+		// the mutex is taken before the next request can be sent, so the assigned batches are read in order
+		std::unique_lock<std::mutex> lock(mutex_);
+		request_lock.unlock();
+		if (assigned_file_index >= n_files) {
+			assignment_finished = true;
+			return nullptr;
+		}
+
+		// the batches assigned to a node are always increasing, so we skip the ones read
+		// by other nodes without opening them
+		while (cur_file_index < assigned_file_index) {
+			this->provider->get_next(false);
+			cur_file_index++;
+		}
+
+		return load_next_file(lock);
+	}
+
+	// loads the file at cur_file_index, it is called holding the mutex and it releases it
+	RecordBatch load_next_file(std::unique_lock<std::mutex> & lock) {
 		// a file handle that we can use in case errors occur to tell the user which file had parsing issues
 		assert(this->provider->has_next());
 
@@ -307,6 +417,9 @@ public:
 	}
 
 	bool has_next() {
+		if (is_dynamic_assignment) {
+			return !assignment_finished && cur_file_index < n_files;
+		}
 		return (is_empty_data_source && batch_index < 1) || (is_gdf_parser && batch_index.load() < n_batches) || (cur_file_index < n_files);
 	}
 
@@ -324,6 +437,15 @@ public:
 	}
 
 private:
+	// must be called holding request_mutex_, so every node has at most one request in flight
+	size_t next_assigned_batch() {
+		if (is_master_node) {
+			return (*next_batch_to_assign)++;
+		}
+		ral::distribution::requestScanWork(context.get(), scan_id, ral::distribution::SCAN_WORK_REQUEST_NEXT);
+		return ral::distribution::collectScanWorkAssignment(context.get(), scan_id);
+	}
+
 	std::shared_ptr<ral::io::data_provider> provider;
 	std::shared_ptr<ral::io::data_parser> parser;
 
@@ -340,13 +462,22 @@ private:
 	bool is_empty_data_source;
 	bool is_gdf_parser;
 
+	bool is_dynamic_assignment;
+	bool is_master_node;
+	bool assignment_finished;
+	std::shared_ptr<std::atomic<size_t>> next_batch_to_assign;
+	std::thread assignment_thread;
+	int32_t scan_id;
+
 	std::mutex mutex_;
+	// serializes the requests of the dynamic assignment, it is taken before mutex_
+	std::mutex request_mutex_;
 };
 
 class TableScan : public kernel {
 public:
 	TableScan(std::size_t kernel_id, const std::string & queryString, ral::io::data_loader &loader, ral::io::Schema & schema, std::shared_ptr<Context> context, std::shared_ptr<ral::cache::graph> query_graph)
-	: kernel(kernel_id, queryString, context, kernel_type::TableScanKernel), input(loader, schema, context)
+	: kernel(kernel_id, queryString, context, kernel_type::TableScanKernel), input(loader, schema, context, kernel_id)
 	{
 		this->query_graph = query_graph;
 	}
@@ -372,6 +503,8 @@ public:
 			table_scan_kernel_num_threads = 1;
 		}
 
+		input.start_work_assignment();
+
 		cudf::size_type current_rows = 0;
 		std::vector<BlazingThread> threads;
 		for (int i = 0; i < table_scan_kernel_num_threads; i++) {
@@ -410,6 +543,7 @@ public:
 		for (auto &&t : threads) {
 			t.join();
 		}
+		input.finish_work_assignment();
 
 		logger->debug("{query_id}|{step}|{substep}|{info}|{duration}|kernel_id|{kernel_id}||",
 									"query_id"_a=context->getContextToken(),
@@ -441,7 +575,7 @@ class BindableTableScan : public kernel {
 public:
 	BindableTableScan(std::size_t kernel_id, const std::string & queryString, ral::io::data_loader &loader, ral::io::Schema & schema, std::shared_ptr<Context> context,
 		std::shared_ptr<ral::cache::graph> query_graph)
-	: kernel(kernel_id, queryString, context, kernel_type::BindableTableScanKernel), input(loader, schema, context)
+	: kernel(kernel_id, queryString, context, kernel_type::BindableTableScanKernel), input(loader, schema, context, kernel_id)
 	{
 		this->query_graph = query_graph;
 	}
@@ -464,6 +598,9 @@ public:
 
 		bool has_limit = this->has_limit_;
 		size_t limit_ = this->limit_rows_;
+
+		input.start_work_assignment();
+
 		cudf::size_type current_rows = 0;
 		std::vector<BlazingThread> threads;
 		for (int i = 0; i < table_scan_kernel_num_threads; i++) {
@@ -551,6 +688,7 @@ public:
 		for (auto &&t : threads) {
 			t.join();
 		}
+		input.finish_work_assignment();
 
 		logger->debug("{query_id}|{step}|{substep}|{info}|{duration}|kernel_id|{kernel_id}||",
 									"query_id"_a=context->getContextToken(),
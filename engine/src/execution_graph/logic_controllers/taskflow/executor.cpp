@@ -0,0 +1,104 @@
+#include "executor.h"
+
+#include <chrono>
+#include <thread>
+
+namespace ral {
+namespace cache {
+
+using namespace std::chrono_literals;
+
+executor & executor::get_instance() {
+	// never destroyed, the idle worker threads are detached and keep waiting on its condition variables
+	static executor * instance = new executor();
+	return *instance;
+}
+
+size_t executor::run_all(std::vector<std::function<void()>> tasks, size_t max_threads, bool wait_for_admission) {
+	if(tasks.empty()) {
+		return 0;
+	}
+
+	std::unique_lock<std::mutex> lock(mutex_);
+	if(wait_for_admission) {
+		uint64_t ticket = next_ticket_++;
+		admission_queue_.push_back(ticket);
+		admission_cv_.wait(lock, [&, this] {
+			return admission_queue_.front() == ticket &&
+				(running_tasks_ == 0 || running_tasks_ + tasks.size() <= max_threads);
+		});
+		admission_queue_.pop_front();
+		// the next graph may fit too
+		admission_cv_.notify_all();
+	}
+
+	auto group = std::make_shared<task_group>();
+	group->pending = tasks.size();
+	running_tasks_ += tasks.size();
+	for(auto & run : tasks) {
+		tasks_.push_back(task{std::move(run), group});
+	}
+
+	size_t threads_created = 0;
+	while(idle_threads_ < tasks_.size()) {
+		idle_threads_++;
+		threads_created++;
+		std::thread([this] { worker_loop(); }).detach();
+	}
+	work_cv_.notify_all();
+
+	done_cv_.wait(lock, [&] { return group->pending == 0 || group->exception; });
+	if(group->exception) {
+		// the tasks hold pointers to the graph and its kernels, so the ones that did not start are dropped and the
+		// ones that are running have to finish before the graph can go away
+		size_t removed = 0;
+		for(auto it = tasks_.begin(); it != tasks_.end();) {
+			if(it->group == group) {
+				it = tasks_.erase(it);
+				removed++;
+			} else {
+				++it;
+			}
+		}
+		group->pending -= removed;
+		running_tasks_ -= removed;
+		admission_cv_.notify_all();
+		done_cv_.wait(lock, [&] { return group->pending == 0; });
+		std::rethrow_exception(group->exception);
+	}
+	return threads_created;
+}
+
+void executor::worker_loop() {
+	std::unique_lock<std::mutex> lock(mutex_);
+	while(true) {
+		if(!work_cv_.wait_for(lock, 60000ms, [this] { return !tasks_.empty(); })) {
+			idle_threads_--;
+			return;
+		}
+		idle_threads_--;
+		task current = std::move(tasks_.front());
+		tasks_.pop_front();
+		lock.unlock();
+
+		std::exception_ptr exception;
+		try {
+			current.run();
+		} catch(...) {
+			exception = std::current_exception();
+		}
+
+		lock.lock();
+		idle_threads_++;
+		current.group->pending--;
+		if(exception && !current.group->exception) {
+			current.group->exception = exception;
+		}
+		running_tasks_--;
+		admission_cv_.notify_all();
+		done_cv_.notify_all();
+	}
+}
+
+}  // namespace cache
+}  // namespace ral
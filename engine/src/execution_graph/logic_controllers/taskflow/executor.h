@@ -0,0 +1,65 @@
+#pragma once
+
+#include <condition_variable>
+#include <cstdint>
+#include <deque>
+#include <exception>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <vector>
+
+namespace ral {
+namespace cache {
+
+/**
+	@brief A pool of threads shared by the execution graphs of all the queries, that runs the kernels of each graph.
+	Kernels block waiting for their inputs, so all the kernels of a graph have to run at the same time. A graph is
+	admitted when there are enough free threads for all its kernels, or when nothing else is running, and graphs are
+	admitted in arrival order so that a query with many kernels is not starved by smaller ones.
+	The graphs of distributed queries are admitted right away, as each node would admit them in its own order and
+	a graph waiting on one node could block its peers that were admitted on the others.
+	The threads are reused across queries, and the ones that stay idle for a while exit.
+*/
+class executor {
+public:
+	static executor & get_instance();
+
+	/**
+	 * Runs each task on a pooled thread and returns once all of them finished. If a task throws, the tasks that did
+	 * not start yet are dropped, and its exception is rethrown once the ones that are running finished.
+	 * @param tasks the kernel run() bodies of one graph
+	 * @param max_threads the max number of tasks running at the same time across all the graphs
+	 * @param wait_for_admission when false the tasks start right away, they still count towards max_threads
+	 * @return the number of threads created to run these tasks
+	 */
+	size_t run_all(std::vector<std::function<void()>> tasks, size_t max_threads, bool wait_for_admission = true);
+
+private:
+	struct task_group {
+		size_t pending = 0;
+		std::exception_ptr exception;
+	};
+
+	struct task {
+		std::function<void()> run;
+		std::shared_ptr<task_group> group;
+	};
+
+	executor() = default;
+
+	void worker_loop();
+
+	std::mutex mutex_;
+	std::condition_variable admission_cv_;
+	std::condition_variable work_cv_;
+	std::condition_variable done_cv_;
+	std::deque<uint64_t> admission_queue_;
+	uint64_t next_ticket_ = 0;
+	std::deque<task> tasks_;
+	size_t running_tasks_ = 0;
+	size_t idle_threads_ = 0;
+};
+
+}  // namespace cache
+}  // namespace ral
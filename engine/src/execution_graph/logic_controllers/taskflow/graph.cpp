@@ -1,4 +1,5 @@
 #include "graph.h"
+#include "executor.h"
 #include "operators/OrderBy.h"
 
 namespace ral {
@@ -37,7 +38,7 @@ namespace cache {
 	void graph::execute() {
 		check_and_complete_work_flow();
 
-		std::vector<BlazingThread> threads;
+		std::vector<std::function<void()>> tasks;
 		std::set<std::pair<size_t, size_t>> visited;
 		std::deque<size_t> Q;
 		for(auto start_node : get_neighbours(head_id_)) {
@@ -61,7 +62,11 @@ namespace cache {
 						if(visited.find(edge_id) == visited.end()) {
 							visited.insert(edge_id);
 							Q.push_back(target_id);
-							BlazingThread t([this, source, source_id, edge] {
+							CodeTimer scheduleTimer;
+							tasks.push_back([this, source, source_id, edge, scheduleTimer]() mutable {
+								scheduleTimer.stop();
+								log_kernel_event(source, "kernelStart", 0, scheduleTimer.start_time(), scheduleTimer.end_time());
+
 								auto state = source->run();
 								if(state == kstatus::proceed) {
 									source->output_.finish();
@@ -69,7 +74,6 @@ namespace cache {
 									std::cout<<"ERROR kernel "<<source_id<<" did not finished successfully"<<'\n';
 								}
 							});
-							threads.push_back(std::move(t));
 						} else {
 							// TODO: and circular graph is defined here. Report and error
 						}
@@ -79,9 +83,44 @@ namespace cache {
 				Q.push_back(source_id);
 			}
 		}
-		for(auto & thread : threads) {
-			thread.join();
+		if(tasks.empty()) {
+			return;
+		}
+
+		kernel * first_kernel = get_node(get_neighbours(head_id_).begin()->target);
+		size_t max_threads = 256;
+		std::map<std::string, std::string> config_options = first_kernel->get_context()->getConfigOptions();
+		auto it = config_options.find("KERNEL_EXECUTOR_THREADS");
+		if (it != config_options.end()){
+			max_threads = std::stoull(config_options["KERNEL_EXECUTOR_THREADS"]);
+		}
+		// the kernels of a distributed query wait for the ones of the other nodes, so the query can't wait for its
+		// admission on each node in a different order
+		bool wait_for_admission = first_kernel->get_context()->getTotalNodes() <= 1;
+
+		CodeTimer executorTimer;
+		size_t threads_created = executor::get_instance().run_all(std::move(tasks), max_threads, wait_for_admission);
+		executorTimer.stop();
+		// output_num_rows holds the number of threads the executor had to create for this query
+		log_kernel_event(first_kernel, "executorThreadsCreated", threads_created, executorTimer.start_time(), executorTimer.end_time());
+	}
+
+	void graph::log_kernel_event(kernel * k, const std::string & event_type, size_t output_num_rows, int64_t timestamp_begin, int64_t timestamp_end) {
+		if(!events_logger) {
+			return;
 		}
+		Context * context = k->get_context();
+		events_logger->info("{ral_id}|{query_id}|{kernel_id}|{input_num_rows}|{input_num_bytes}|{output_num_rows}|{output_num_bytes}|{event_type}|{timestamp_begin}|{timestamp_end}",
+						"ral_id"_a=context->getNodeIndex(ral::communication::CommunicationData::getInstance().getSelfNode()),
+						"query_id"_a=context->getContextToken(),
+						"kernel_id"_a=k->get_id(),
+						"input_num_rows"_a=0,
+						"input_num_bytes"_a=0,
+						"output_num_rows"_a=output_num_rows,
+						"output_num_bytes"_a=0,
+						"event_type"_a=event_type,
+						"timestamp_begin"_a=timestamp_begin,
+						"timestamp_end"_a=timestamp_end);
 	}
 
 	void graph::show() {
@@ -50,6 +50,7 @@ public:
 	graph() {
 		container_[head_id_] = nullptr;	 // sentinel node
 		kernels_edges_logger = spdlog::get("kernels_edges_logger");
+		events_logger = spdlog::get("events_logger");
 	}
 	graph(const graph &) = default;
 	graph & operator=(const graph &) = default;
@@ -90,6 +91,8 @@ public:
 	void check_for_simple_scan_with_limit_query();
 
 private:
+	void log_kernel_event(kernel * k, const std::string & event_type, size_t output_num_rows, int64_t timestamp_begin, int64_t timestamp_end);
+
 	const std::int32_t head_id_{-1};
 	std::vector<kernel *> kernels_;
 	std::map<std::int32_t, kernel *> container_;
@@ -97,6 +100,7 @@ private:
 	std::map<std::int32_t, std::set<Edge>> reverse_edges_;
 
 	std::shared_ptr<spdlog::logger> kernels_edges_logger;
+	std::shared_ptr<spdlog::logger> events_logger;
 };
 
 
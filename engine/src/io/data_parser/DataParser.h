@@ -11,6 +11,7 @@
 #include "../Schema.h"
 #include "execution_graph/logic_controllers/LogicPrimitives.h"
 #include "arrow/io/interfaces.h"
+#include <blazingdb/io/FileSystem/Uri.h>
 #include <memory>
 #include <vector>
 
@@ -35,7 +36,8 @@ public:
 	virtual void parse_schema(
 		std::shared_ptr<arrow::io::RandomAccessFile> file, ral::io::Schema & schema) = 0;
 
-	virtual std::unique_ptr<ral::frame::BlazingTable> get_metadata(std::vector<std::shared_ptr<arrow::io::RandomAccessFile>> files, int offset) {
+	// uris are the paths of the files (when they were loaded from paths), used to open them again if they fail to be read
+	virtual std::unique_ptr<ral::frame::BlazingTable> get_metadata(std::vector<std::shared_ptr<arrow::io::RandomAccessFile>> files, int offset, std::vector<Uri> uris = {}) {
 		return nullptr;
 	}
 };
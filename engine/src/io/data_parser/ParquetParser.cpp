@@ -2,9 +2,13 @@
 #include "metadata/parquet_metadata.h"
 
 #include "ParquetParser.h"
+#include "Config/BlazingContext.h"
 #include "utilities/CommonOperations.h"
 
 #include <numeric>
+#include <atomic>
+#include <chrono>
+#include <thread>
 
 #include <arrow/io/file.h>
 #include "blazingdb/concurrency/BlazingThread.h"
@@ -17,8 +21,11 @@ namespace io {
 
 namespace cudf_io = cudf::io;
 
-parquet_parser::parquet_parser() {
-	// TODO Auto-generated constructor stub
+parquet_parser::parquet_parser() : footer_reader_threads{16}, footer_reader_retries{2} {
+}
+
+parquet_parser::parquet_parser(size_t footer_reader_threads, int footer_reader_retries)
+	: footer_reader_threads{std::max(footer_reader_threads, size_t(1))}, footer_reader_retries{std::max(footer_reader_retries, 0)} {
 }
 
 parquet_parser::~parquet_parser() {
@@ -88,22 +95,48 @@ void parquet_parser::parse_schema(
 }
 
 
-std::unique_ptr<ral::frame::BlazingTable> parquet_parser::get_metadata(std::vector<std::shared_ptr<arrow::io::RandomAccessFile>> files, int offset){
+std::unique_ptr<ral::frame::BlazingTable> parquet_parser::get_metadata(std::vector<std::shared_ptr<arrow::io::RandomAccessFile>> files, int offset, std::vector<Uri> uris){
 	std::vector<size_t> num_row_groups(files.size());
-	BlazingThread threads[files.size()];
 	std::vector<std::unique_ptr<parquet::ParquetFileReader>> parquet_readers(files.size());
-	for(int file_index = 0; file_index < files.size(); file_index++) {
-		threads[file_index] = BlazingThread([&, file_index]() {
-		  parquet_readers[file_index] =
-			  std::move(parquet::ParquetFileReader::Open(files[file_index]));
-		  std::shared_ptr<parquet::FileMetaData> file_metadata = parquet_readers[file_index]->metadata();
-		  const parquet::SchemaDescriptor * schema = file_metadata->schema();
-		  num_row_groups[file_index] = file_metadata->num_row_groups();
-		});
+
+	// a bounded number of threads read the footers, so that we don't open too many connections at the same time
+	// against remote filesystems
+	std::atomic<size_t> next_file_index{0};
+	std::vector<std::exception_ptr> errors(files.size());
+	std::vector<BlazingThread> threads;
+	for(size_t thread_index = 0; thread_index < std::min(footer_reader_threads, files.size()); thread_index++) {
+		threads.push_back(BlazingThread([&]() {
+			size_t file_index;
+			while((file_index = next_file_index++) < files.size()) {
+				for(int attempt = 0; ; attempt++) {
+					try {
+						if(attempt > 0 && file_index < uris.size() && !uris[file_index].isEmpty()) {
+							// the failed read can leave the file (or its connection) in a bad state, so it is opened again
+							files[file_index] = BlazingContext::getInstance()->getFileSystemManager()->openReadable(uris[file_index]);
+						}
+						parquet_readers[file_index] = std::move(parquet::ParquetFileReader::Open(files[file_index]));
+						num_row_groups[file_index] = parquet_readers[file_index]->metadata()->num_row_groups();
+						break;
+					} catch(...) {
+						if(attempt >= footer_reader_retries) {
+							errors[file_index] = std::current_exception();
+							break;
+						}
+						std::this_thread::sleep_for(std::chrono::milliseconds(100 << attempt));
+					}
+				}
+			}
+		}));
 	}
 
-	for(int file_index = 0; file_index < files.size(); file_index++) {
-		threads[file_index].join();
+	for(auto & thread : threads) {
+		thread.join();
+	}
+
+	for(auto & error : errors) {
+		if(error) {
+			std::rethrow_exception(error);
+		}
 	}
 
 	size_t total_num_row_groups =
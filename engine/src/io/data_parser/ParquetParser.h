@@ -19,6 +19,9 @@ namespace io {
 class parquet_parser : public data_parser {
 public:
 	parquet_parser();
+	// footer_reader_threads bounds how many footers are read at the same time by get_metadata
+	// and footer_reader_retries is how many times a footer that failed to be read is tried again
+	parquet_parser(size_t footer_reader_threads, int footer_reader_retries);
 	virtual ~parquet_parser();
 
 	std::unique_ptr<ral::frame::BlazingTable> parse_batch(
@@ -29,8 +32,11 @@ public:
 
 	void parse_schema(std::shared_ptr<arrow::io::RandomAccessFile> file, Schema & schema);
 
-	std::unique_ptr<ral::frame::BlazingTable> get_metadata(std::vector<std::shared_ptr<arrow::io::RandomAccessFile>> files, int offset);
+	std::unique_ptr<ral::frame::BlazingTable> get_metadata(std::vector<std::shared_ptr<arrow::io::RandomAccessFile>> files, int offset, std::vector<Uri> uris = {});
 
+private:
+	size_t footer_reader_threads;
+	int footer_reader_retries;
 };
 
 } /* namespace io */
@@ -11,9 +11,11 @@
 #include <cudf/column/column_factories.hpp>
 
 std::unique_ptr<ral::frame::BlazingTable> makeMetadataTable(std::vector<std::string> col_names) {
+	// same layout as get_minmax_metadata: min and max per column, null_count per column, num_rows,
+	// total_byte_size, file_handle_index and row_group_index
 	const int ncols = col_names.size();
 	std::vector<std::string> metadata_col_names;
-	metadata_col_names.resize(ncols*2 + 2);
+	metadata_col_names.resize(ncols*3 + 4);
 
 	int metadata_col_index = -1;
 	for (int colIndex = 0; colIndex < ncols; ++colIndex){
@@ -24,6 +26,13 @@ std::unique_ptr<ral::frame::BlazingTable> makeMetadataTable(std::vector<std::str
 		metadata_col_names[++metadata_col_index] = col_name_min;
 		metadata_col_names[++metadata_col_index] = col_name_max;
 	}
+	for (int colIndex = 0; colIndex < ncols; ++colIndex){
+		metadata_col_names[++metadata_col_index] = "null_count_" + std::to_string(colIndex) + "_" + col_names[colIndex];
+	}
+	const int num_rows_index = ++metadata_col_index;
+	metadata_col_names[num_rows_index] = "num_rows";
+	const int total_byte_size_index = ++metadata_col_index;
+	metadata_col_names[total_byte_size_index] = "total_byte_size";
 
 	metadata_col_names[++metadata_col_index] = "file_handle_index";
 	metadata_col_names[++metadata_col_index] = "row_group_index";
@@ -31,9 +40,14 @@ std::unique_ptr<ral::frame::BlazingTable> makeMetadataTable(std::vector<std::str
 	std::vector<std::unique_ptr<cudf::column>> minmax_metadata_gdf_table;
 	minmax_metadata_gdf_table.resize(metadata_col_names.size());
 	for (int i = 0; i < metadata_col_names.size(); ++i) {
-		std::vector<int32_t> temp{(int32_t)-1};
-		auto expected_col2 = ral::utilities::vector_to_column(temp, cudf::data_type(cudf::type_id::INT32));
-		minmax_metadata_gdf_table[i] = std::move(expected_col2);
+		if (i >= 2*ncols && i <= total_byte_size_index) {
+			// the null counts are unknown (-1), and the files don't have rows nor bytes
+			std::vector<int64_t> temp{i >= num_rows_index ? (int64_t)0 : (int64_t)-1};
+			minmax_metadata_gdf_table[i] = ral::utilities::vector_to_column(temp, cudf::data_type(cudf::type_id::INT64));
+		} else {
+			std::vector<int32_t> temp{(int32_t)-1};
+			minmax_metadata_gdf_table[i] = ral::utilities::vector_to_column(temp, cudf::data_type(cudf::type_id::INT32));
+		}
 	}
 
 	auto cudf_metadata_table = std::make_unique<cudf::table>(std::move(minmax_metadata_gdf_table));
@@ -361,6 +375,19 @@ std::unique_ptr<ral::frame::BlazingTable> get_minmax_metadata(
 			}
 		}
 
+		// the null counts and the number of rows are used to compute the table statistics for the planner
+		for (size_t col_count = 0; col_count < columns_with_metadata.size(); col_count++) {
+			const parquet::ColumnDescriptor *column = schema->Column(columns_with_metadata[col_count]);
+			metadata_dtypes.push_back(cudf::data_type{cudf::type_id::INT64});
+			metadata_names.push_back("null_count_" + std::to_string(columns_with_metadata[col_count]) + "_" + column->name());
+		}
+		metadata_dtypes.push_back(cudf::data_type{cudf::type_id::INT64});
+		metadata_names.push_back("num_rows");
+		// the uncompressed size of the row group is used to balance the files among the nodes
+		metadata_dtypes.push_back(cudf::data_type{cudf::type_id::INT64});
+		metadata_names.push_back("total_byte_size");
+
+		// NOTE: file_handle_index and row_group_index must always be the last two columns
 		metadata_dtypes.push_back(cudf::data_type{cudf::type_id::INT32});
 		metadata_names.push_back("file_handle_index");
 		metadata_dtypes.push_back(cudf::data_type{cudf::type_id::INT32});
@@ -390,10 +417,12 @@ std::unique_ptr<ral::frame::BlazingTable> get_minmax_metadata(
 			for (int row_group_index = 0; row_group_index < num_row_groups; row_group_index++) {
 				auto groupReader = parquet_readers[file_index]->RowGroup(row_group_index);
 				auto *rowGroupMetadata = groupReader->metadata();
+				size_t null_count_index = columns_with_metadata.size() * 2;
 				for (int col_count = 0; col_count < columns_with_metadata.size();
 					col_count++) {
 					const parquet::ColumnDescriptor *column = schema->Column(columns_with_metadata[col_count]);
 					auto columnMetaData = rowGroupMetadata->ColumnChunk(columns_with_metadata[col_count]);
+					int64_t null_count = -1; // -1 means unknown
 					if (columnMetaData->is_stats_set()) {
 						auto statistics = columnMetaData->statistics();
 						if (statistics->HasMinMax()) {
@@ -404,8 +433,14 @@ std::unique_ptr<ral::frame::BlazingTable> get_minmax_metadata(
 										statistics);
 
 						}
+						if (statistics->HasNullCount()) {
+							null_count = statistics->null_count();
+						}
 					}
+					this_minmax_metadata_table[null_count_index + col_count].push_back(null_count);
 				}
+				this_minmax_metadata_table[this_minmax_metadata_table.size() - 4].push_back(rowGroupMetadata->num_rows());
+				this_minmax_metadata_table[this_minmax_metadata_table.size() - 3].push_back(rowGroupMetadata->total_byte_size());
 				this_minmax_metadata_table[this_minmax_metadata_table.size() - 2].push_back(metadata_offset + file_index);
 				this_minmax_metadata_table[this_minmax_metadata_table.size() - 1].push_back(row_group_index);
 			}
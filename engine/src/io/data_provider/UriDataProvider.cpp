@@ -11,6 +11,12 @@
 #include "Config/BlazingContext.h"
 #include "arrow/status.h"
 #include <blazingdb/io/Util/StringUtil.h>
+#include "blazingdb/concurrency/BlazingThread.h"
+#include <algorithm>
+#include <atomic>
+#include <exception>
+#include <functional>
+#include <mutex>
 
 using namespace fmt::literals;
 
@@ -19,14 +25,15 @@ namespace io {
 
 uri_data_provider::uri_data_provider(std::vector<Uri> uris, bool ignore_missing_paths)
 	: data_provider(), file_uris(uris), uri_values({}), opened_files({}),
-	  current_file(0), errors({}), directory_uris({}), directory_current_file(0), ignore_missing_paths(ignore_missing_paths) {}
+	  current_file(0), errors({}), directory_uris({}), directory_current_file(0), ignore_missing_paths(ignore_missing_paths),
+	  listings_prefetched(false) {}
 
 uri_data_provider::uri_data_provider(std::vector<Uri> uris,
 	std::vector<std::map<std::string, std::string>> uri_values,
 	bool ignore_missing_paths)
 	: data_provider(), file_uris(uris), uri_values(uri_values), 
 	opened_files({}), current_file(0), errors({}), directory_uris({}),
-	  directory_current_file(0), ignore_missing_paths(ignore_missing_paths) {
+	  directory_current_file(0), ignore_missing_paths(ignore_missing_paths), listings_prefetched(false) {
 	// thanks to c++11 we no longer have anything interesting to do here :)
 }
 
@@ -98,72 +105,36 @@ data_handle uri_data_provider::get_next(bool open_file) {
 		handle.fileHandle = file;
 		return handle;
 	} else if (this->current_file < this->file_uris.size()) {
-		FileStatus fileStatus;
-		auto current_uri = this->file_uris[this->current_file];
-		const bool hasWildcard = current_uri.getPath().hasWildcard();
-		Uri target_uri = current_uri;
-
-		try {
-			auto fs_manager = BlazingContext::getInstance()->getFileSystemManager();
+		if(!this->listings_prefetched) {
+			this->prefetch_listings();
+		}
 
-			if(hasWildcard) {
-				const Path final_path = current_uri.getPath().getParentPath();
-				target_uri = Uri(current_uri.getScheme(), current_uri.getAuthority(), final_path);
+		if(!this->prefetched_uris[this->current_file].valid) {
+			// the prefetch failed, the requests are sent again to report the error
+			try {
+				this->prefetched_uris[this->current_file] = this->resolve_uri(this->current_file);
+			} catch(const std::exception & e) {
+				std::shared_ptr<spdlog::logger> logger = spdlog::get("batch_logger");
+				logger->error("|||{info}|||||",
+											"info"_a="In uri_data_provider::get_next. What: {}"_format(e.what()));
+				throw;
+			} catch(...) {
+				throw;
 			}
-
-			if(fs_manager && fs_manager->exists(target_uri)) {
-				fileStatus = BlazingContext::getInstance()->getFileSystemManager()->getFileStatus(target_uri);
-			} else if (!ignore_missing_paths){
-				throw std::runtime_error(
-					"Path '" + target_uri.toString() +
-					"' does not exist. File or directory paths are expected to be in one of the following formats: " +
-					"For local file paths: '/folder0/folder1/fileName.extension'    " +
-					"For local file paths with wildcard: '/folder0/folder1/*fileName*.*'    " +
-					"For local directory paths: '/folder0/folder1/'    " +
-					"For s3 file paths: 's3://registeredFileSystemName/folder0/folder1/fileName.extension'    " +
-					"For s3 file paths with wildcard: '/folder0/folder1/*fileName*.*'    " +
-					"For s3 directory paths: 's3://registeredFileSystemName/folder0/folder1/'    " +
-					"For gs file paths: 'gs://registeredFileSystemName/folder0/folder1/fileName.extension'    " +
-					"For gs file paths with wildcard: '/folder0/folder1/*fileName*.*'    " +
-					"For gs directory paths: 'gs://registeredFileSystemName/folder0/folder1/'    " +
-					"For HDFS file paths: 'hdfs://registeredFileSystemName/folder0/folder1/fileName.extension'    " +
-					"For HDFS file paths with wildcard: '/folder0/folder1/*fileName*.*'    " +
-					"For HDFS directory paths: 'hdfs://registeredFileSystemName/folder0/folder1/'");
-			} 
-		} catch(const std::exception & e) {
-			std::shared_ptr<spdlog::logger> logger = spdlog::get("batch_logger");
-			logger->error("|||{info}|||||",
-										"info"_a="In uri_data_provider::get_next. What: {}"_format(e.what()));
-			throw;
-		} catch(...) {
-			throw;
 		}
 
-		if(fileStatus.isDirectory()) {
-			if(hasWildcard) {
-				const std::string wildcard = current_uri.getPath().getResourceName();
-
-				this->directory_uris =
-					BlazingContext::getInstance()->getFileSystemManager()->list(target_uri, wildcard);
+		const resolved_uri & resolved = this->prefetched_uris[this->current_file];
+		const FileStatus & fileStatus = resolved.status;
+		auto current_uri = this->file_uris[this->current_file];
 
+		if(fileStatus.isDirectory()) {
+			if(resolved.files.empty()) {
+				this->current_file++;
 			} else {
-				this->directory_uris = BlazingContext::getInstance()->getFileSystemManager()->list(target_uri);
+				this->directory_uris = resolved.files;
+				this->directory_current_file = 0;
 			}
-
-			std::string ender = ".crc";
-			std::vector<Uri> new_uris;
-			for(int i = 0; i < this->directory_uris.size(); i++) {
-				std::string fileName = this->directory_uris[i].getPath().toString();
-
-				if(!StringUtil::endsWith(fileName, ender)) { 
-					new_uris.push_back(this->directory_uris[i]);
-				}
-			}
-			this->directory_uris = new_uris;
-
-			this->directory_current_file = 0;
 			return get_next(open_file);
-
 		} else if(fileStatus.isFile()) {
 			std::shared_ptr<arrow::io::RandomAccessFile> file = nullptr;
             
@@ -196,6 +167,150 @@ data_handle uri_data_provider::get_next(bool open_file) {
 	}
 }
 
+namespace {
+
+/**
+ * Runs fn(index) for each index in [0, count) on up to 16 threads, and rethrows the first exception once all of
+ * them finished
+ */
+void parallel_for(size_t count, const std::function<void(size_t)> & fn) {
+	if(count == 1) {
+		fn(0);
+		return;
+	}
+
+	const size_t num_threads = 16;
+	std::atomic<size_t> next_index{0};
+	std::mutex exception_mutex;
+	std::exception_ptr exception;
+	std::vector<BlazingThread> threads;
+	for(size_t thread_index = 0; thread_index < std::min(num_threads, count); thread_index++) {
+		threads.push_back(BlazingThread([&]() {
+			size_t index;
+			while((index = next_index++) < count) {
+				try {
+					fn(index);
+				} catch(...) {
+					std::lock_guard<std::mutex> lock(exception_mutex);
+					if(!exception) {
+						exception = std::current_exception();
+					}
+				}
+			}
+		}));
+	}
+	for(auto & thread : threads) {
+		thread.join();
+	}
+	if(exception) {
+		std::rethrow_exception(exception);
+	}
+}
+
+bool is_listed_file(const Uri & uri) {
+	std::string fileName = uri.getPath().toString();
+	std::string ender = ".crc";
+	return !StringUtil::endsWith(fileName, ender);
+}
+
+/**
+ * Folders like _temporary or .hive-staging hold the files that are being written
+ */
+bool is_hidden_folder(const Uri & uri) {
+	const std::string name = uri.getPath().getResourceName();
+	return name.empty() || name[0] == '_' || name[0] == '.';
+}
+
+}  // namespace
+
+uri_data_provider::resolved_uri uri_data_provider::resolve_uri(size_t uri_index) const {
+	auto fs_manager = BlazingContext::getInstance()->getFileSystemManager();
+	const Uri & current_uri = this->file_uris[uri_index];
+	const bool hasWildcard = current_uri.getPath().hasWildcard();
+	Uri target_uri = current_uri;
+	if(hasWildcard) {
+		const Path final_path = current_uri.getPath().getParentPath();
+		target_uri = Uri(current_uri.getScheme(), current_uri.getAuthority(), final_path);
+	}
+
+	resolved_uri resolved;
+	resolved.valid = true;
+	if(fs_manager && fs_manager->exists(target_uri)) {
+		resolved.status = fs_manager->getFileStatus(target_uri);
+	} else if (!ignore_missing_paths){
+		throw std::runtime_error(
+			"Path '" + target_uri.toString() +
+			"' does not exist. File or directory paths are expected to be in one of the following formats: " +
+			"For local file paths: '/folder0/folder1/fileName.extension'    " +
+			"For local file paths with wildcard: '/folder0/folder1/*fileName*.*'    " +
+			"For local directory paths: '/folder0/folder1/'    " +
+			"For s3 file paths: 's3://registeredFileSystemName/folder0/folder1/fileName.extension'    " +
+			"For s3 file paths with wildcard: '/folder0/folder1/*fileName*.*'    " +
+			"For s3 directory paths: 's3://registeredFileSystemName/folder0/folder1/'    " +
+			"For gs file paths: 'gs://registeredFileSystemName/folder0/folder1/fileName.extension'    " +
+			"For gs file paths with wildcard: '/folder0/folder1/*fileName*.*'    " +
+			"For gs directory paths: 'gs://registeredFileSystemName/folder0/folder1/'    " +
+			"For HDFS file paths: 'hdfs://registeredFileSystemName/folder0/folder1/fileName.extension'    " +
+			"For HDFS file paths with wildcard: '/folder0/folder1/*fileName*.*'    " +
+			"For HDFS directory paths: 'hdfs://registeredFileSystemName/folder0/folder1/'");
+	}
+
+	if(!resolved.status.isDirectory()) {
+		return resolved;
+	}
+
+	if(hasWildcard) {
+		const std::string wildcard = current_uri.getPath().getResourceName();
+		for(const Uri & uri : fs_manager->list(target_uri, wildcard)) {
+			if(is_listed_file(uri)) {
+				resolved.files.push_back(uri);
+			}
+		}
+		return resolved;
+	}
+
+	// the files of the first level folders are listed concurrently, so a large prefix split in folders is not
+	// listed one page at a time
+	std::vector<Uri> folders;
+	for(const FileStatus & status : fs_manager->listStatuses(target_uri)) {
+		if(status.isDirectory()) {
+			if(!is_hidden_folder(status.getUri())) {
+				folders.push_back(status.getUri());
+			}
+		} else if(is_listed_file(status.getUri())) {
+			resolved.files.push_back(status.getUri());
+		}
+	}
+	if(folders.empty()) {
+		return resolved;
+	}
+
+	std::vector<std::vector<Uri>> folder_files(folders.size());
+	parallel_for(folders.size(), [&](size_t folder_index) {
+		for(const FileStatus & status : fs_manager->listStatuses(folders[folder_index])) {
+			if(status.isFile() && is_listed_file(status.getUri())) {
+				folder_files[folder_index].push_back(status.getUri());
+			}
+		}
+	});
+	for(const auto & files : folder_files) {
+		resolved.files.insert(resolved.files.end(), files.begin(), files.end());
+	}
+	return resolved;
+}
+
+void uri_data_provider::prefetch_listings() {
+	this->listings_prefetched = true;
+	this->prefetched_uris.resize(this->file_uris.size());
+	parallel_for(this->file_uris.size(), [this](size_t uri_index) {
+		try {
+			this->prefetched_uris[uri_index] = this->resolve_uri(uri_index);
+		} catch(...) {
+			// get_next sends the requests again and reports the error
+		}
+	});
+}
+
 /**
  * Closes currently open set of file handles maintained by the provider
 */
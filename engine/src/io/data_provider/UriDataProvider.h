@@ -10,6 +10,7 @@
 
 #include "DataProvider.h"
 #include <arrow/io/interfaces.h>
+#include <blazingdb/io/FileSystem/FileStatus.h>
 #include <blazingdb/io/FileSystem/Uri.h>
 #include <vector>
 
@@ -67,6 +68,30 @@ public:
 
 
 private:
+	/**
+	 * The status of a uri and, for directories, the files to read from it
+	 */
+	struct resolved_uri {
+		bool valid = false;  // false when the requests failed, get_next sends them again to report the error
+		FileStatus status;
+		std::vector<Uri> files;
+	};
+
+	/**
+	 * Sends the exists, getFileStatus and list requests of file_uris[uri_index]. The files of a directory are the
+	 * ones in it and in its first level folders (except the hidden ones like _temporary), and the folders are
+	 * listed concurrently. A wildcard only matches the files in the directory.
+	 */
+	resolved_uri resolve_uri(size_t uri_index) const;
+
+	/**
+	 * Resolves all the uris in parallel (e.g. the partition folders of a hive table) before the first get_next,
+	 * instead of sending the requests one uri at a time.
+	 * NOTE the pages of the listing of a single folder are still requested in sequence, as each continuation token
+	 * comes from the previous page
+	 */
+	void prefetch_listings();
+
 	/**
 	 * stores the list of uris that will be used by the provider
 	 */
@@ -95,6 +120,8 @@ private:
 	std::vector<Uri> directory_uris;
 	size_t directory_current_file;
 	bool ignore_missing_paths;
+	bool listings_prefetched;
+	std::vector<resolved_uri> prefetched_uris;
 };
 
 } /* namespace io */
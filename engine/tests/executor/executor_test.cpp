@@ -0,0 +1,51 @@
+#include "tests/utilities/BlazingUnitTest.h"
+
+#include <src/execution_graph/logic_controllers/taskflow/executor.h>
+
+#include <atomic>
+#include <chrono>
+#include <stdexcept>
+#include <thread>
+
+using ral::cache::executor;
+
+struct ExecutorTest : public BlazingUnitTest {};
+
+TEST_F(ExecutorTest, RunsAllTheTasks) {
+	std::atomic<int> finished(0);
+	std::vector<std::function<void()>> tasks;
+	for(int i = 0; i < 4; i++) {
+		tasks.push_back([&finished] { finished++; });
+	}
+	executor::get_instance().run_all(std::move(tasks), 4);
+	EXPECT_EQ(finished, 4);
+}
+
+TEST_F(ExecutorTest, ThrowingTaskWaitsForTheRunningOnes) {
+	std::atomic<bool> started(false);
+	std::atomic<bool> finished(false);
+	std::vector<std::function<void()>> tasks;
+	tasks.push_back([&started] {
+		while(!started) {
+			std::this_thread::yield();
+		}
+		throw std::runtime_error("kernel failed");
+	});
+	tasks.push_back([&started, &finished] {
+		started = true;
+		std::this_thread::sleep_for(std::chrono::milliseconds(100));
+		finished = true;
+	});
+	EXPECT_THROW(executor::get_instance().run_all(std::move(tasks), 2), std::runtime_error);
+	// the graph and its kernels go away after run_all, so no task may still be running
+	EXPECT_TRUE(finished);
+
+	// the failed graph does not hold back the next ones
+	std::atomic<int> next_finished(0);
+	std::vector<std::function<void()>> next_tasks;
+	for(int i = 0; i < 2; i++) {
+		next_tasks.push_back([&next_finished] { next_finished++; });
+	}
+	executor::get_instance().run_all(std::move(next_tasks), 2);
+	EXPECT_EQ(next_finished, 2);
+}
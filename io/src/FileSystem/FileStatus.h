@@ -15,6 +15,8 @@ class FileStatus {
 public:
 	FileStatus();
 	FileStatus(const Uri & uri, FileType fileType, unsigned long long fileSize);
+	// modificationTime is in milliseconds since epoch, 0 means unknown
+	FileStatus(const Uri & uri, FileType fileType, unsigned long long fileSize, unsigned long long modificationTime);
 	FileStatus(const FileStatus & other);
 	FileStatus(FileStatus && other);
 	~FileStatus();
@@ -22,6 +24,7 @@ public:
 	Uri getUri() const noexcept;
 	FileType getFileType() const noexcept;
 	unsigned long long getFileSize() const noexcept;
+	unsigned long long getModificationTime() const noexcept;
 
 	// Helpers
 	bool isFile() const noexcept;
@@ -41,7 +44,6 @@ public:
 
 	 unsigned long long getBlockSize() const noexcept;
 
-	 unsigned long long getModificationTime() const noexcept;
 	 unsigned long long getAccessTime() const noexcept;
 
 	 std::string getOwner() const noexcept;
@@ -52,6 +54,7 @@ private:
 	Uri uri;
 	FileType fileType;
 	unsigned long long fileSize;
+	unsigned long long modificationTime;
 };
 
 #endif /* _BLAZING_FILE_STATUS_H_ */
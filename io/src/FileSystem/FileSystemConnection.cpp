@@ -214,11 +214,32 @@ bool verifyConnectionProperties(const std::string & projectId,
 
 }  // END namespace GoogleCloudStorageConnection
 
+namespace LocalFileSystemConnection {
+
+const std::string connectionPropertyName(ConnectionProperty connectionProperty) {
+	switch(connectionProperty) {
+	case ConnectionProperty::USE_MEMORY_MAP: return "local.use_memory_map"; break;
+	}
+
+	return "UNDEFINED";
+}
+
+const std::string connectionPropertyEnvName(ConnectionProperty connectionProperty) {
+	std::string property = "BLAZING_";
+	property += connectionPropertyName(connectionProperty);
+	property = StringUtil::replace(property, ".", "_");
+	property = StringUtil::toUpper(property);
+
+	return property;
+}
+
+}  // END namespace LocalFileSystemConnection
+
 // BEGIN FileSystemConnection
 
 FileSystemConnection::FileSystemConnection() : fileSystemType(FileSystemType::UNDEFINED) {}
 
-FileSystemConnection::FileSystemConnection(FileSystemType fileSystemType) {
+FileSystemConnection::FileSystemConnection(FileSystemType fileSystemType, bool useMemoryMap) {
 	const bool isUndefined = (fileSystemType == FileSystemType::UNDEFINED);
 	const bool isLocal = (fileSystemType == FileSystemType::LOCAL);
 
@@ -228,6 +249,12 @@ FileSystemConnection::FileSystemConnection(FileSystemType fileSystemType) {
 	}
 
 	this->fileSystemType = fileSystemType;
+
+	// NOTE only set when enabled, so the default local connection doesn't have properties
+	if(useMemoryMap) {
+		using namespace LocalFileSystemConnection;
+		this->connectionProperties[connectionPropertyName(ConnectionProperty::USE_MEMORY_MAP)] = "true";
+	}
 }
 
 FileSystemConnection::FileSystemConnection(const std::string & host,
@@ -343,7 +370,8 @@ FileSystemConnection::FileSystemConnection(const std::string & fileSystemConnect
 			return;
 		}
 
-		if(requireConnectionProperties()) {
+		// the properties of the local file system are optional
+		if(requireConnectionProperties() || fileSystemTypeSplit[1].empty() == false) {
 			const std::vector<std::string> connectionPropertiesSplit = StringUtil::split(fileSystemTypeSplit[1], ",");
 
 			for(const std::string & property : connectionPropertiesSplit) {
@@ -441,6 +469,28 @@ const std::string FileSystemConnection::getConnectionProperty(
 	return this->connectionProperties.at(propertyName);
 }
 
+const std::string FileSystemConnection::getConnectionProperty(
+	LocalFileSystemConnection::ConnectionProperty connectionProperty) const noexcept {
+	using namespace LocalFileSystemConnection;
+
+	if(this->isValid() == false) {
+		return std::string();
+	}
+
+	if(this->fileSystemType != FileSystemType::LOCAL) {
+		return std::string();
+	}
+
+	const std::string propertyName = connectionPropertyName(connectionProperty);
+	const auto it = this->connectionProperties.find(propertyName);
+
+	if(it == this->connectionProperties.end()) {
+		return std::string();
+	}
+
+	return it->second;
+}
+
 std::string FileSystemConnection::toString() const {
 	if(this->fileSystemType == FileSystemType::UNDEFINED) {
 		return std::string();
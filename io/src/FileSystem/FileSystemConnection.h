@@ -67,6 +67,16 @@ const std::string connectionPropertyName(ConnectionProperty connectionProperty);
 const std::string connectionPropertyEnvName(ConnectionProperty connectionProperty);  // format: BLAZING_GCS_PROPERTY
 }  // namespace GoogleCloudStorageConnection
 
+namespace LocalFileSystemConnection {
+enum class ConnectionProperty : char {
+	UNDEFINED,
+	USE_MEMORY_MAP  // "true" to read the files through a memory mapping instead of read calls
+};
+
+const std::string connectionPropertyName(ConnectionProperty connectionProperty);	 // format: local.property
+const std::string connectionPropertyEnvName(ConnectionProperty connectionProperty);  // format: BLAZING_LOCAL_PROPERTY
+}  // namespace LocalFileSystemConnection
+
 // NOTE Immutable class
 class FileSystemConnection {
 public:
@@ -80,9 +90,9 @@ public:
 	 *
 	 * @note
 	 * Current implementation of this constructor will only accept FileSystemType::LOCAL, any other value will construct
-	 * an invalid FileSystemConnection
+	 * an invalid FileSystemConnection. Set useMemoryMap to read the local files through a memory mapping.
 	 */
-	FileSystemConnection(FileSystemType fileSystemType);
+	FileSystemConnection(FileSystemType fileSystemType, bool useMemoryMap = false);
 
 	/**
 	 * @brief Constructs a Hadoop File System connection
@@ -167,6 +177,10 @@ public:
 	const std::string getConnectionProperty(GoogleCloudStorageConnection::ConnectionProperty connectionProperty) const
 		noexcept;
 
+	// is property is not present or the instance is invalid and not local then return empty string
+	const std::string getConnectionProperty(LocalFileSystemConnection::ConnectionProperty connectionProperty) const
+		noexcept;
+
 	std::string toString() const;  // json format
 
 	FileSystemConnection & operator=(const FileSystemConnection & other);
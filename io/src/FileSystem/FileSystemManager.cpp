@@ -53,7 +53,9 @@ bool FileSystemManager::deregisterFileSystem(const std::string & authority) {
 
 bool FileSystemManager::exists(const Uri & uri) const { return this->pimpl->exists(uri); }
 
-FileStatus FileSystemManager::getFileStatus(const Uri & uri) const { return this->pimpl->getFileStatus(uri); }
+FileStatus FileSystemManager::getFileStatus(const Uri & uri, bool useCache) const {
+	return this->pimpl->getFileStatus(uri, useCache);
+}
 
 std::vector<FileStatus> FileSystemManager::list(const Uri & uri, const FileFilter & filter) const {
 	return this->pimpl->list(uri, filter);
@@ -68,6 +70,10 @@ std::vector<Uri> FileSystemManager::list(const Uri & uri, const std::string & wi
 	return this->pimpl->list(uri, wildcard);
 }
 
+std::vector<FileStatus> FileSystemManager::listStatuses(const Uri & uri) const {
+	return this->pimpl->listStatuses(uri);
+}
+
 std::vector<std::string> FileSystemManager::listResourceNames(
 	const Uri & uri, FileType fileType, const std::string & wildcard) const {
 	return this->pimpl->listResourceNames(uri, fileType, wildcard);
@@ -94,3 +100,11 @@ std::shared_ptr<arrow::io::RandomAccessFile> FileSystemManager::openReadable(con
 std::shared_ptr<arrow::io::OutputStream> FileSystemManager::openWriteable(const Uri & uri) const {
 	return this->pimpl->openWriteable(uri);
 }
+
+void FileSystemManager::setListingCacheTtl(int seconds) { this->pimpl->setListingCacheTtl(seconds); }
+
+int FileSystemManager::getListingCacheTtl() const { return this->pimpl->getListingCacheTtl(); }
+
+void FileSystemManager::invalidateListingCache(const std::string & uriPrefix) {
+	this->pimpl->invalidateListingCache(uriPrefix);
+}
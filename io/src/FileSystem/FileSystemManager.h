@@ -25,12 +25,13 @@ public:
 
 	// Query
 	bool exists(const Uri & uri) const;
-	FileStatus getFileStatus(const Uri & uri) const;
+	FileStatus getFileStatus(const Uri & uri, bool useCache = true) const;  // useCache false reads the current status
 
 	// List
 	std::vector<FileStatus> list(const Uri & uri, const FileFilter & filter) const;
 	std::vector<FileStatus> list(const Uri & uri, FileType fileType, const std::string & wildcard = "*") const;
 	std::vector<Uri> list(const Uri & uri, const std::string & wildcard = "*") const;
+	std::vector<FileStatus> listStatuses(const Uri & uri) const;  // the files and folders in uri, with their types
 	std::vector<std::string> listResourceNames(
 		const Uri & uri, FileType fileType, const std::string & wildcard = "*") const;
 	std::vector<std::string> listResourceNames(const Uri & uri, const std::string & wildcard = "*") const;
@@ -45,6 +46,11 @@ public:
 	std::shared_ptr<arrow::io::RandomAccessFile> openReadable(const Uri & uri) const;
 	std::shared_ptr<arrow::io::OutputStream> openWriteable(const Uri & uri) const;
 
+	// Listing cache: the results of exists, getFileStatus, list(uri, wildcard) and listStatuses are kept for ttl seconds
+	void setListingCacheTtl(int seconds);  // 0 disables the cache, which is the default
+	int getListingCacheTtl() const;
+	void invalidateListingCache(const std::string & uriPrefix = "");  // for the uris that start with uriPrefix
+
 private:
 	class Private;
 	const std::unique_ptr<Private> pimpl;  // private implementation
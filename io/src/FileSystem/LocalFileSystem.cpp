@@ -7,13 +7,14 @@
 
 #include "private/LocalFileSystem_p.h"
 
-LocalFileSystem::LocalFileSystem(const Path & root) : pimpl(new LocalFileSystem::Private(root)) {}
+LocalFileSystem::LocalFileSystem(const Path & root, bool useMemoryMap)
+	: pimpl(new LocalFileSystem::Private(root, useMemoryMap)) {}
 
 LocalFileSystem::~LocalFileSystem() {}
 
 FileSystemConnection LocalFileSystem::getFileSystemConnection() const noexcept {
 	// alwayes returns a fiexed connection string
-	return FileSystemConnection(FileSystemType::LOCAL);
+	return FileSystemConnection(FileSystemType::LOCAL, this->pimpl->useMemoryMap);
 }
 
 Path LocalFileSystem::getRoot() const noexcept { return this->pimpl->root; }
@@ -12,7 +12,8 @@
 
 class LocalFileSystem : public FileSystemInterface {
 public:
-	LocalFileSystem(const Path & root = Path("/"));
+	// when useMemoryMap is true the files are opened for reading through a memory mapping
+	LocalFileSystem(const Path & root = Path("/"), bool useMemoryMap = false);
 	virtual ~LocalFileSystem();
 
 	FileSystemType getFileSystemType() const noexcept { return FileSystemType::LOCAL; }
@@ -18,7 +18,10 @@ std::unique_ptr<FileSystemInterface> FileSystemFactory::createFileSystem(
 
 	switch(fileSystemType) {
 	case FileSystemType::LOCAL: {
-		fileSystem = std::unique_ptr<LocalFileSystem>(new LocalFileSystem(root));
+		using namespace LocalFileSystemConnection;
+		const bool useMemoryMap =
+			(fileSystemConnection.getConnectionProperty(ConnectionProperty::USE_MEMORY_MAP) == "true");
+		fileSystem = std::unique_ptr<LocalFileSystem>(new LocalFileSystem(root, useMemoryMap));
 	} break;
 
 	case FileSystemType::HDFS: {
@@ -14,11 +14,28 @@
 
 namespace Logging = Library::Logging;
 
-FileSystemManager::Private::Private() {}
+namespace {
+
+template <typename Map, typename Predicate>
+void eraseCacheEntries(Map & cache, Predicate predicate) {
+	for(auto it = cache.begin(); it != cache.end();) {
+		if(predicate(it->first)) {
+			it = cache.erase(it);
+		} else {
+			++it;
+		}
+	}
+}
+
+}  // namespace
+
+FileSystemManager::Private::Private() : listingCacheTtl(0) {}
 
 FileSystemManager::Private::~Private() {}
 
 bool FileSystemManager::Private::registerFileSystem(const FileSystemEntity & fileSystemEntity) {
+	this->invalidateListingCache(std::string());
+
 	const std::string & authority = fileSystemEntity.getAuthority();
 	const FileSystemConnection & fileSystemConnection = fileSystemEntity.getFileSystemConnection();
 	const Path & root = fileSystemEntity.getRoot();
@@ -69,6 +86,8 @@ bool FileSystemManager::Private::registerFileSystem(const FileSystemEntity & fil
 }
 
 bool FileSystemManager::Private::deregisterFileSystem(const std::string & authority) {
+	this->invalidateListingCache(std::string());
+
 	bool found = false;
 
 	for(const auto & entry : this->fileSystemIds) {
@@ -112,11 +131,20 @@ bool FileSystemManager::Private::exists(const Uri & uri) const {
 	if(uri.isValid() == false) {
 		return false;
 	}
+	const std::string key = uri.toString(true);
+	bool cached;
+	if(this->findCached(this->existsCache, key, cached)) {
+		return cached;
+	}
+
 	try {
 		const int fileSystemId = this->verifyFileSystemUri(uri);
 
 		const auto ret = this->fileSystems.at(fileSystemId)->exists(uri);
 
+		if(ret) {
+			this->storeCached(this->existsCache, key, ret);
+		}
 		return ret;
 	} catch(const std::exception & e) {
 		std::string uriStr = uri.toString();
@@ -125,11 +153,17 @@ bool FileSystemManager::Private::exists(const Uri & uri) const {
 	}
 }
 
-FileStatus FileSystemManager::Private::getFileStatus(const Uri & uri) const {
+FileStatus FileSystemManager::Private::getFileStatus(const Uri & uri, bool useCache) const {
 	if(uri.isValid() == false) {
 		// TODO percy thrown exception
 	}
 
+	const std::string key = uri.toString(true);
+	FileStatus cached;
+	if(useCache && this->findCached(this->fileStatusCache, key, cached)) {
+		return cached;
+	}
+
 	try {
 		const int fileSystemId = this->verifyFileSystemUri(uri);
 
@@ -137,6 +171,7 @@ FileStatus FileSystemManager::Private::getFileStatus(const Uri & uri) const {
 
 		const auto ret = this->fileSystems.at(fileSystemId)->getFileStatus(uri);
 
+		this->storeCached(this->fileStatusCache, key, ret);
 		return ret;
 	} catch(const std::exception & e) {
 		std::string uriStr = uri.toString();
@@ -189,6 +224,12 @@ std::vector<Uri> FileSystemManager::Private::list(const Uri & uri, const std::st
 	if(uri.isValid() == false) {
 		// TODO percy thrown exception
 	}
+	const auto key = std::make_pair(uri.toString(true), wildcard);
+	std::vector<Uri> cached;
+	if(this->findCached(this->listCache, key, cached)) {
+		return cached;
+	}
+
 	try {
 		const int fileSystemId = this->verifyFileSystemUri(uri);
 
@@ -196,6 +237,7 @@ std::vector<Uri> FileSystemManager::Private::list(const Uri & uri, const std::st
 
 		const auto ret = this->fileSystems.at(fileSystemId)->list(uri, wildcard);
 
+		this->storeCached(this->listCache, key, ret);
 		return ret;
 	} catch(const std::exception & e) {
 		std::string uriStr = uri.toString();
@@ -204,6 +246,32 @@ std::vector<Uri> FileSystemManager::Private::list(const Uri & uri, const std::st
 	}
 }
 
+std::vector<FileStatus> FileSystemManager::Private::listStatuses(const Uri & uri) const {
+	if(uri.isValid() == false) {
+		// TODO percy thrown exception
+	}
+	const std::string key = uri.toString(true);
+	std::vector<FileStatus> cached;
+	if(this->findCached(this->statusListCache, key, cached)) {
+		return cached;
+	}
+
+	try {
+		const int fileSystemId = this->verifyFileSystemUri(uri);
+
+		// TODO check fileSystemId ... manage error cases
+
+		const auto ret = this->fileSystems.at(fileSystemId)->list(uri, FileOrFolderFilter());
+
+		this->storeCached(this->statusListCache, key, ret);
+		return ret;
+	} catch(const std::exception & e) {
+		std::string uriStr = uri.toString();
+		Logging::Logger().logError("Caught error in listStatuses with Uri: " + uriStr);
+		throw;
+	}
+}
+
 std::vector<std::string> FileSystemManager::Private::listResourceNames(
 	const Uri & uri, FileType fileType, const std::string & wildcard) const {
 	if(uri.isValid() == false) {
@@ -253,6 +321,7 @@ bool FileSystemManager::Private::makeDirectory(const Uri & uri) const {
 
 		// TODO check fileSystemId ... manage error cases
 
+		this->invalidateListingCacheFor(uri);
 		const auto ret = this->fileSystems.at(fileSystemId)->makeDirectory(uri);
 
 		return ret;
@@ -272,6 +341,7 @@ bool FileSystemManager::Private::remove(const Uri & uri) const {
 
 		// TODO check fileSystemId ... manage error cases
 
+		this->invalidateListingCacheFor(uri);
 		const auto ret = this->fileSystems.at(fileSystemId)->remove(uri);
 
 		return ret;
@@ -298,6 +368,9 @@ bool FileSystemManager::Private::move(const Uri & src, const Uri & dst) const {
 		const int fileSystemIdSrc = this->verifyFileSystemUri(src);
 		const int fileSystemIdDst = this->verifyFileSystemUri(dst);
 
+		this->invalidateListingCacheFor(src);
+		this->invalidateListingCacheFor(dst);
+
 		if(fileSystemIdSrc != fileSystemIdDst) {
 			// we need to copy and then delete the original
 			// TODO when we implement the copy operation in the FileSystemManager, we can replace the manual copy step
@@ -328,6 +401,7 @@ bool FileSystemManager::Private::truncateFile(const Uri & uri, long long length)
 
 		// TODO check fileSystemId ... manage error cases
 
+		this->invalidateListingCacheFor(uri);
 		const auto ret = this->fileSystems.at(fileSystemId)->truncateFile(uri, length);
 
 		return ret;
@@ -365,6 +439,7 @@ std::shared_ptr<arrow::io::OutputStream> FileSystemManager::Private::openWriteab
 
 		// TODO check fileSystemId ... manage error cases
 
+		this->invalidateListingCacheFor(uri);
 		return this->fileSystems.at(fileSystemId)->openWriteable(uri);
 	} catch(const std::exception & e) {
 		std::string uriStr = uri.toString();
@@ -373,8 +448,81 @@ std::shared_ptr<arrow::io::OutputStream> FileSystemManager::Private::openWriteab
 	}
 }
 
+void FileSystemManager::Private::setListingCacheTtl(int seconds) {
+	this->listingCacheTtl = seconds;
+	if(seconds <= 0) {
+		this->invalidateListingCache(std::string());
+	}
+}
+
+int FileSystemManager::Private::getListingCacheTtl() const { return this->listingCacheTtl; }
+
+void FileSystemManager::Private::invalidateListingCache(const std::string & uriPrefix) {
+	std::lock_guard<std::mutex> lock(this->listingCacheMutex);
+
+	if(uriPrefix.empty()) {
+		this->existsCache.clear();
+		this->fileStatusCache.clear();
+		this->listCache.clear();
+		this->statusListCache.clear();
+		return;
+	}
+
+	const auto startsWithPrefix = [&uriPrefix](const std::string & uri) {
+		return uri.compare(0, uriPrefix.size(), uriPrefix) == 0;
+	};
+	eraseCacheEntries(this->existsCache, [&](const std::string & key) { return startsWithPrefix(key); });
+	eraseCacheEntries(this->fileStatusCache, [&](const std::string & key) { return startsWithPrefix(key); });
+	eraseCacheEntries(this->listCache,
+		[&](const std::pair<std::string, std::string> & key) { return startsWithPrefix(key.first); });
+	eraseCacheEntries(this->statusListCache, [&](const std::string & key) { return startsWithPrefix(key); });
+}
+
 // Private stuff
 
+template <typename Key, typename Value>
+bool FileSystemManager::Private::findCached(
+	const std::map<Key, CacheEntry<Value>> & cache, const Key & key, Value & value) const {
+	const int ttl = this->listingCacheTtl;
+	if(ttl <= 0) {
+		return false;
+	}
+
+	std::lock_guard<std::mutex> lock(this->listingCacheMutex);
+	auto it = cache.find(key);
+	if(it == cache.end() || std::chrono::steady_clock::now() - it->second.time > std::chrono::seconds(ttl)) {
+		return false;
+	}
+	value = it->second.value;
+	return true;
+}
+
+template <typename Key, typename Value>
+void FileSystemManager::Private::storeCached(
+	std::map<Key, CacheEntry<Value>> & cache, const Key & key, const Value & value) const {
+	if(this->listingCacheTtl <= 0) {
+		return;
+	}
+
+	std::lock_guard<std::mutex> lock(this->listingCacheMutex);
+	cache[key] = CacheEntry<Value>{std::chrono::steady_clock::now(), value};
+}
+
+void FileSystemManager::Private::invalidateListingCacheFor(const Uri & uri) const {
+	// a change to uri changes the status of uri and its children, and the listings of its parents
+	const std::string uriString = uri.toString(true);
+	const auto isRelated = [&uriString](const std::string & key) {
+		return key.compare(0, uriString.size(), uriString) == 0 || uriString.compare(0, key.size(), key) == 0;
+	};
+
+	std::lock_guard<std::mutex> lock(this->listingCacheMutex);
+	eraseCacheEntries(this->existsCache, isRelated);
+	eraseCacheEntries(this->fileStatusCache, isRelated);
+	eraseCacheEntries(
+		this->listCache, [&](const std::pair<std::string, std::string> & key) { return isRelated(key.first); });
+	eraseCacheEntries(this->statusListCache, isRelated);
+}
+
 int FileSystemManager::Private::verifyFileSystemUri(const Uri & uri) const {
 	try {
 		const int fileSystemId = this->fileSystemIds.at(uri.getAuthority());
@@ -6,8 +6,12 @@
 #ifndef _FILESYSTEM_MANAGER_PRIVATE_H_
 #define _FILESYSTEM_MANAGER_PRIVATE_H_
 
+#include <atomic>
+#include <chrono>
 #include <map>
+#include <mutex>
 #include <string>
+#include <utility>
 #include <vector>
 
 #include "FileSystem/FileSystemInterface.h"
@@ -24,12 +28,13 @@ public:
 
 	// Query
 	bool exists(const Uri & uri) const;
-	FileStatus getFileStatus(const Uri & uri) const;
+	FileStatus getFileStatus(const Uri & uri, bool useCache) const;
 
 	// List
 	std::vector<FileStatus> list(const Uri & uri, const FileFilter & filter) const;
 	std::vector<FileStatus> list(const Uri & uri, FileType fileType, const std::string & wildcard = "*") const;
 	std::vector<Uri> list(const Uri & uri, const std::string & wildcard = "*") const;
+	std::vector<FileStatus> listStatuses(const Uri & uri) const;
 	std::vector<std::string> listResourceNames(
 		const Uri & uri, FileType fileType, const std::string & wildcard = "*") const;
 	std::vector<std::string> listResourceNames(const Uri & uri, const std::string & wildcard = "*") const;
@@ -44,13 +49,38 @@ public:
 	std::shared_ptr<arrow::io::RandomAccessFile> openReadable(const Uri & uri) const;
 	std::shared_ptr<arrow::io::OutputStream> openWriteable(const Uri & uri) const;
 
+	// Listing cache
+	void setListingCacheTtl(int seconds);
+	int getListingCacheTtl() const;
+	void invalidateListingCache(const std::string & uriPrefix);
+
 private:
+	template <typename Value>
+	struct CacheEntry {
+		std::chrono::steady_clock::time_point time;
+		Value value;
+	};
+
 	int verifyFileSystemUri(const Uri & uri) const;  // returns FileSystem id if ok, -1 otherwise
 
+	template <typename Key, typename Value>
+	bool findCached(const std::map<Key, CacheEntry<Value>> & cache, const Key & key, Value & value) const;
+	template <typename Key, typename Value>
+	void storeCached(std::map<Key, CacheEntry<Value>> & cache, const Key & key, const Value & value) const;
+	void invalidateListingCacheFor(const Uri & uri) const;  // for the uri, its children and its parents
+
 private:
 	std::map<std::string, Path> roots;								// <authority, root>
 	std::map<std::string, int> fileSystemIds;						// <authority, fs id>
 	std::vector<std::unique_ptr<FileSystemInterface>> fileSystems;  // [fs id] = fs
+
+	// NOTE the uris that do not exist are not cached, so the files that are created later are found
+	std::atomic<int> listingCacheTtl;  // seconds
+	mutable std::mutex listingCacheMutex;
+	mutable std::map<std::string, CacheEntry<bool>> existsCache;     // <uri, exists>
+	mutable std::map<std::string, CacheEntry<FileStatus>> fileStatusCache;     // <uri, status>
+	mutable std::map<std::pair<std::string, std::string>, CacheEntry<std::vector<Uri>>> listCache;  // <(uri, wildcard), uris>
+	mutable std::map<std::string, CacheEntry<std::vector<FileStatus>>> statusListCache;  // <uri, statuses>
 };
 
 #endif /* _FILESYSTEM_MANAGER_PRIVATE_H_ */
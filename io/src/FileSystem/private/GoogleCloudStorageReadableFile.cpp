@@ -18,7 +18,21 @@
 
 namespace Logging = Library::Logging;
 
-// TODO: handle the situation when not all data is read
+namespace {
+
+// the status codes of the errors that may not happen again when the request is retried
+bool isTransientError(const google::cloud::Status & status) {
+	switch(status.code()) {
+	case google::cloud::StatusCode::kUnavailable:
+	case google::cloud::StatusCode::kDeadlineExceeded:
+	case google::cloud::StatusCode::kResourceExhausted:
+	case google::cloud::StatusCode::kInternal:
+	case google::cloud::StatusCode::kAborted: return true;
+	default: return false;
+	}
+}
+
+}  // namespace
 
 GoogleCloudStorageReadableFile::~GoogleCloudStorageReadableFile() {}
 
@@ -29,6 +43,36 @@ GoogleCloudStorageReadableFile::GoogleCloudStorageReadableFile(
 	this->gcsClient = gcsClient;
 	position = 0;
 	valid = true;
+
+	// NOTE every request goes through the reader, it coalesces the small reads and retries the failed ones
+	auto fetch = [gcsClient, bucketName, key](int64_t position, int64_t nbytes, uint8_t * out, bool & retryable) {
+		auto results = gcsClient->ReadObject(bucketName, key, gcs::ReadRange(position, position + nbytes));
+
+		if(results.status().ok()) {
+			results.read((char *) out, nbytes);
+		}
+		// NOTE percy check for badbit also the user should never read more bytes than the result content size
+		if(!results.status().ok() || results.bad()) {
+			retryable = isTransientError(results.status());
+			Logging::Logger().logWarn("GoogleCloudStorageReadableFile, ReadObject failed for bucketName: " +
+									  bucketName + " key " + key + " " + results.status().message());
+			return (int64_t) -1;
+		}
+		return (int64_t) results.gcount();
+	};
+
+	auto size = [gcsClient, bucketName, key]() {
+		google::cloud::StatusOr<gcs::ObjectMetadata> objectMetadata = gcsClient->GetObjectMetadata(bucketName, key);
+
+		if(!objectMetadata) {
+			Logging::Logger().logWarn("GoogleCloudStorageReadableFile::GetSize, GetObjectMetadata failed: " +
+									  objectMetadata.status().message() + " with " + key);
+			return (int64_t) -1;
+		}
+		return (int64_t) objectMetadata->size();
+	};
+
+	reader = std::unique_ptr<RangeReader>(new RangeReader(fetch, size));
 }
 
 arrow::Status GoogleCloudStorageReadableFile::Seek(int64_t position) {
@@ -45,268 +89,42 @@ arrow::Status GoogleCloudStorageReadableFile::Close() {
 }
 
 arrow::Result<int64_t> GoogleCloudStorageReadableFile::GetSize() {
-    int64_t size = -1;
-	using ::google::cloud::StatusOr;
-
-	StatusOr<gcs::ObjectMetadata> objectMetadata = this->gcsClient->GetObjectMetadata(this->bucketName, this->key);
-
-	if(objectMetadata) {  // if success
-		const long long contentLength = objectMetadata->size();
-		size = contentLength;
-	} else {
-		size = -1;
-		Logging::Logger().logWarn("GoogleCloudStorageReadableFile::GetSize, HeadObject failed");
-
-		// TODO percy
-		//        bool shouldRetry = results.GetError().ShouldRetry();
-		//        if (shouldRetry){
-		//            Logging::Logger().logError(results.GetError().GetExceptionName() + " : " +
-		//            results.GetError().GetMessage() + "  SHOULD RETRY");
-		//        } else {
-		//            Logging::Logger().logError(results.GetError().GetExceptionName() + " : " +
-		//            results.GetError().GetMessage() + "  SHOULD NOT RETRY");
-		//        }
-
-        // TODO william jp errors for new arrow-0.17 API
-		//return arrow::Status::IOError("Error: " + objectMetadata.status().message() + " with " + this->key);
-        
-        return size;
+	int64_t size = reader->getSize();
+	if(size < 0) {
+		return arrow::Status::IOError(
+			"GoogleCloudStorageReadableFile::GetSize failed for bucketName: " + bucketName + " key " + key);
 	}
-
 	return size;
 }
 
 arrow::Result<int64_t> GoogleCloudStorageReadableFile::Read(int64_t nbytes, void* buffer) {
-    int64_t bytesRead = -1;
-	auto results = this->gcsClient->ReadObject(this->bucketName, key, gcs::ReadRange(position, position + nbytes));
-
-	if(!results.status().ok()) {
-		// TODO: Make bad arrow status here
-		Logging::Logger().logWarn(
-			"GoogleCloudStorageReadableFile::Read, GetObject failed for bucketName: " + bucketName + " key " + key);
-
-		// TODO percy retry logic
-		// bool shouldRetry = results.GetError().ShouldRetry();
-
-		//        if (shouldRetry){
-		//            Logging::Logger().logTrace("retrying");
-		//            return this->Read(nbytes, bytesRead, buffer);
-		//        } else {
-		//            *bytesRead = 0;
-		//            Logging::Logger().logError(results.GetError().GetExceptionName() + " : " +
-		//            results.GetError().GetMessage() + "  SHOULD NOT RETRY");
-		//        }
-
-        // TODO william jp errors for new arrow-0.17 API
-		//return arrow::Status::IOError("Error: " + results.status().message() + " with " + this->key);
-        
-        return bytesRead;
-	} else {
-		// TODO percy this doesnt work so we would need to read all the content in order to get the size ... costly!
-		// results.seekg (0, results.end);
-		// int length = results.tellg();
-		// results.seekg (0, results.beg);
-		// std::cout << "OKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKKY : " << length  << std::endl;
-
-		// TODO percy will asume gsc can read all the content
-		// so we avoid read first all the stuff only to get its size (results.gcount() doesnt work)
-		bytesRead = nbytes;
-		//*bytesRead = nbytes < *bytesRead ? nbytes : *bytesRead;
-		results.read((char *) buffer, bytesRead);
-
-		// NOTE percy check for badbit also the user should never read more bytes than the result content size
-		if(results.bad()) {
-			bytesRead = 0;
-		}
-
-		position += bytesRead;
-		return bytesRead;
-	}
-    
-    return bytesRead;
+	ARROW_ASSIGN_OR_RAISE(int64_t bytesRead, this->ReadAt(position, nbytes, buffer));
+	return bytesRead;
 }
 
 arrow::Result<std::shared_ptr<arrow::Buffer>> GoogleCloudStorageReadableFile::Read(int64_t nbytes) {
-    std::shared_ptr<arrow::Buffer> out = nullptr;
-    
-	//	std::cout<<"GoogleCloudStorageReadableFile::Read " + std::to_string(nbytes)<<std::endl;
-	auto results = this->gcsClient->ReadObject(this->bucketName, key, gcs::ReadRange(position, position + nbytes));
-
-	if(!results.status().ok()) {
-		// TODO: Make bad arrow status here
-
-		Logging::Logger().logWarn(
-			"GoogleCloudStorageReadableFile::Read, GetObject failed for bucketName: " + bucketName + " key " + key);
-		// TODO percy
-		//        bool shouldRetry = results.GetError().ShouldRetry();
-		//        if (shouldRetry){
-		//            Logging::Logger().logTrace("retrying");
-		//            return this->Read(nbytes, out);
-		//        } else {
-		//            Logging::Logger().logError(results.GetError().GetExceptionName() + " : " +
-		//            results.GetError().GetMessage() + "  SHOULD NOT RETRY");
-		//        }
-
-        // TODO william jp errors for new arrow-0.17 API
-		//return arrow::Status::IOError("Error: " + results.status().message() + " with " + this->key);
-        
-        return out;
-	} else {
-		// old implementation
-		/*
-std::shared_ptr<arrow::ResizableBuffer> buffer;
-AllocateResizableBuffer(arrow::default_memory_pool(), nbytes, &buffer);
-
-int64_t bytesRead = results.GetResult().GetContentLength();
-
-memcpy(buffer->mutable_data(), results.GetResult().GetBody().rdbuf(), bytesRead);
-
-position += bytesRead;
-*out = buffer;
-return arrow::Status::OK();
-*/
-
-		// TODO percy will asume gsc can read all the content
-		// so we avoid read first all the stuff only to get its size (results.gcount() doesnt work)
-		int64_t bytesRead = nbytes;  // results.gcount();
-		// bytesRead = nbytes < bytesRead ? nbytes : bytesRead;
-		position += bytesRead;
-		// if (bytesRead < nbytes){
-		//    Logging::Logger().logError("Did not read all the bytes at GoogleCloudStorageReadableFile::ReadAt(int64_t
-		//    position, int64_t nbytes, std::shared_ptr<arrow::Buffer>* out)");
-		//}
-		//		results.GetResult().GetBody().read((char*)(out->get()->mutable_data()), bytesRead);
-
-		std::shared_ptr<arrow::ResizableBuffer> buffer;
-		AllocateResizableBuffer(arrow::default_memory_pool(), nbytes, &buffer);
-
-		results.read((char *) (buffer->mutable_data()), bytesRead);
-
-		// NOTE percy check for badbit also the user should never read more bytes than the result content size
-		if(results.bad()) {
-			bytesRead = 0;
-		} else {
-			out = buffer;
-		}
-
-		return out;
-	}
+	return this->ReadAt(position, nbytes);
 }
 
 arrow::Result<int64_t> GoogleCloudStorageReadableFile::ReadAt(int64_t position, int64_t nbytes, void* buffer) {
-    int64_t bytesRead = -1;
-    
-	//	std::cout<<"GoogleCloudStorageReadableFile::ReadAt " + std::to_string(nbytes)<<std::endl;
-
-	auto results = this->gcsClient->ReadObject(this->bucketName, key, gcs::ReadRange(position, position + nbytes));
-
-	if(!results.status().ok()) {
-		// TODO: Make bad arrow status here
-
-		Logging::Logger().logWarn(
-			"GoogleCloudStorageReadableFile::ReadAt, GetObject failed for bucketName: " + bucketName + " key " + key);
-
-		// TODO percy
-		//        bool shouldRetry = results.GetError().ShouldRetry();
-		//        if (shouldRetry){
-		//            Logging::Logger().logTrace("retrying");
-		//            return this->ReadAt(position, nbytes, bytesRead, buffer);
-		//        } else {
-		//            *bytesRead = 0;
-		//            Logging::Logger().logError(results.GetError().GetExceptionName() + " : " +
-		//            results.GetError().GetMessage() + "  SHOULD NOT RETRY");
-		//        }
-
-        // TODO william jp errors for new arrow-0.17 API
-		//return arrow::Status::IOError("Error: " + results.status().message() + " with " + this->key);
-        
-        return bytesRead;
-	} else {
-		// TODO percy will asume gsc can read all the content
-		// so we avoid read first all the stuff only to get its size (results.gcount() doesnt work)
-		bytesRead = nbytes;
-		//*bytesRead = nbytes < *bytesRead ? nbytes : *bytesRead;
-		this->position = position + bytesRead;
-		results.read((char *) buffer, bytesRead);
-
-		// NOTE percy check for badbit also the user should never read more bytes than the result content size
-		if(results.bad()) {
-			bytesRead = 0;
-		}
-
-		return bytesRead;
+	int64_t bytesRead = reader->readAt(position, nbytes, (uint8_t *) buffer);
+	if(bytesRead < 0) {
+		return arrow::Status::IOError(
+			"GoogleCloudStorageReadableFile::ReadAt failed for bucketName: " + bucketName + " key " + key);
 	}
-    
-    return bytesRead;
+	this->position = position + bytesRead;
+	return bytesRead;
 }
 
 arrow::Result<std::shared_ptr<arrow::Buffer>> GoogleCloudStorageReadableFile::ReadAt(int64_t position, int64_t nbytes) {
-    std::shared_ptr<arrow::Buffer> out = nullptr;
-
-	//	std::cout<<"GoogleCloudStorageReadableFile::ReadAt " + std::to_string(nbytes)<<std::endl;
-
-	auto results = this->gcsClient->ReadObject(this->bucketName, key, gcs::ReadRange(position, position + nbytes));
-
-	if(!results.status().ok()) {
-		// TODO: Make bad arrow status here
-
-		Logging::Logger().logWarn(
-			"GoogleCloudStorageReadableFile::ReadAt, GetObject failed for bucketName: " + bucketName + " key " + key);
-		// TODO percy
-		//        bool shouldRetry = results.GetError().ShouldRetry();
-		//        if (shouldRetry){
-		//            Logging::Logger().logTrace("retrying");
-		//            return this->ReadAt(position, nbytes, out);
-		//        } else {
-		//            Logging::Logger().logError(results.GetError().GetExceptionName() + " : " +
-		//            results.GetError().GetMessage() + "  SHOULD NOT RETRY");
-		//        }
-
-        // TODO william jp errors for new arrow-0.17 API
-        //return arrow::Status::IOError("Error: " + results.status().message() + " with " + this->key);		
-        
-        return out;
-	} else {
-		// old implementation
-		/*
-		//byutes read should always be full amount
-		//should almost always be nBytes
-		std::shared_ptr<arrow::ResizableBuffer> buffer;
-		AllocateResizableBuffer(arrow::default_memory_pool(), nbytes, &buffer);
-
-		int64_t bytesRead = nbytes;
-
-		memcpy(buffer->mutable_data(), results.GetResult().GetBody().rdbuf(), bytesRead);
-
-		*out = buffer;
-		return arrow::Status::OK();
-		*/
-
-		// TODO percy will asume gsc can read all the content
-		// so we avoid read first all the stuff only to get its size (results.gcount() doesnt work)
-		int64_t bytesRead = nbytes;  // results.gcount();
-		// bytesRead = nbytes < bytesRead ? nbytes : bytesRead;
-		this->position = position + nbytes;
-		// if (bytesRead < nbytes){
-		//    Logging::Logger().logError("Did not read all the bytes at GoogleCloudStorageReadableFile::ReadAt(int64_t
-		//    position, int64_t nbytes, std::shared_ptr<arrow::Buffer>* out)");
-		//}
-		//		results.GetResult().GetBody().read((char*)(out->get()->mutable_data()), bytesRead);
-
-		std::shared_ptr<arrow::ResizableBuffer> buffer;
-		AllocateResizableBuffer(arrow::default_memory_pool(), nbytes, &buffer);
-
-		results.read((char *) (buffer->mutable_data()), bytesRead);
-
-		// NOTE percy check for badbit also the user should never read more bytes than the result content size
-		if(results.bad()) {
-			bytesRead = 0;
-		} else {
-			out = buffer;
-		}
+	std::shared_ptr<arrow::ResizableBuffer> buffer;
+	ARROW_RETURN_NOT_OK(AllocateResizableBuffer(arrow::default_memory_pool(), nbytes, &buffer));
 
-		return out;
+	ARROW_ASSIGN_OR_RAISE(int64_t bytesRead, this->ReadAt(position, nbytes, buffer->mutable_data()));
+	if(bytesRead < nbytes) {
+		ARROW_RETURN_NOT_OK(buffer->Resize(bytesRead));
 	}
+	return std::static_pointer_cast<arrow::Buffer>(buffer);
 }
 
 bool GoogleCloudStorageReadableFile::supports_zero_copy() const { return false; }
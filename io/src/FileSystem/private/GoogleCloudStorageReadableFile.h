@@ -8,6 +8,9 @@
 
 #include "arrow/io/interfaces.h"
 #include "arrow/status.h"
+#include <memory>
+
+#include "RangeReader.h"
 
 // BEGIN UGLY PATCH william jp c.gonzales if we don't do this we get a compile error: Mismatched major version (always before of the 1sr google header)
 #define GOOGLE_CLOUD_CPP_GOOGLE_CLOUD_STORAGE_VERSION_INFO_H 1
@@ -60,6 +63,7 @@ private:
 	std::string key;
 	size_t position;
 	bool valid;
+	std::unique_ptr<RangeReader> reader;
 
 	ARROW_DISALLOW_COPY_AND_ASSIGN(GoogleCloudStorageReadableFile);
 };
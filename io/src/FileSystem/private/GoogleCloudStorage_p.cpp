@@ -180,7 +180,9 @@ FileStatus GoogleCloudStorage::Private::getFileStatus(const Uri & uri) const {
 			const FileStatus fileStatus(uri, fileType, contentLength);
 			return fileStatus;
 		} else {  // is probably a file (e.g. application/octet-stream or text/x-python and so on ...
-			const FileStatus fileStatus(uri, FileType::FILE, contentLength);
+			const unsigned long long modificationTime = std::chrono::duration_cast<std::chrono::milliseconds>(
+				objectMetadata->updated().time_since_epoch()).count();
+			const FileStatus fileStatus(uri, FileType::FILE, contentLength, modificationTime);
 			return fileStatus;
 		}
 	} else {
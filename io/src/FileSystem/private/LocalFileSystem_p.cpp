@@ -25,6 +25,8 @@
 #include "arrow/io/file.h"
 #include "arrow/status.h"
 
+#include "MemoryMappedReadableFile.h"
+
 const int FILE_RETRY_DELAY = 10000;
 
 #include "ExceptionHandling/BlazingException.h"
@@ -39,7 +41,7 @@ namespace Logging = Library::Logging;
 #define FILE_PERMISSION_BITS_MODE 0600
 #endif
 
-LocalFileSystem::Private::Private(const Path & root) : root(root) {}
+LocalFileSystem::Private::Private(const Path & root, bool useMemoryMap) : root(root), useMemoryMap(useMemoryMap) {}
 
 inline void openDirExceptions(Uri uri) {
 	switch(errno) {
@@ -128,7 +130,9 @@ FileStatus LocalFileSystem::Private::getFileStatus(const Uri & uri) const {
 		default: fileType = FileType::UNDEFINED; break;
 		}
 
-		return FileStatus(uri, fileType, stat_buf.st_size);
+		const unsigned long long modificationTime =
+			(unsigned long long) stat_buf.st_mtim.tv_sec * 1000 + stat_buf.st_mtim.tv_nsec / 1000000;
+		return FileStatus(uri, fileType, stat_buf.st_size, modificationTime);
 	} else {
 		switch(errno) {
 		case EACCES: throw BlazingInvalidPermissionsFileException(uri);
@@ -744,6 +748,16 @@ std::shared_ptr<arrow::io::RandomAccessFile> LocalFileSystem::Private::openReada
 	const Uri uriWithRoot(uri.getScheme(), uri.getAuthority(), this->root + uri.getPath().toString());
 	const Path path = uriWithRoot.getPath();
 
+	if(this->useMemoryMap) {
+		auto mappedFile = MemoryMappedReadableFile::Open(path.toString());
+
+		if(!mappedFile.status().ok()) {
+			throw BlazingFileSystemException(
+				"Unable to open " + uriWithRoot.toString() + " for reading: " + mappedFile.status().message());
+		}
+		return mappedFile.ValueOrDie();
+	}
+
 	auto readableFile = arrow::io::ReadableFile::Open(path.toString());
             
 	if(!readableFile.status().ok()) {
@@ -10,7 +10,7 @@
 
 class LocalFileSystem::Private {
 public:
-	Private(const Path & root);
+	Private(const Path & root, bool useMemoryMap);
 
 	// Query
 	bool exists(const Uri & uri) const;
@@ -36,6 +36,7 @@ public:
 public:
 	// State
 	Path root;
+	bool useMemoryMap;
 };
 
 #endif /* _LOCAL_FILE_SYSTEM_PRIVATE_H_ */
@@ -0,0 +1,181 @@
+/*
+ * Copyright 2020 BlazingDB, Inc.
+ */
+
+#include "MemoryMappedReadableFile.h"
+
+#include <algorithm>
+#include <cerrno>
+#include <cstring>
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+#include "arrow/buffer.h"
+
+#include "Library/Logging/Logger.h"
+namespace Logging = Library::Logging;
+
+// the mapping of the whole file, it is unmapped when the file and all the buffers that point into it are gone
+class MemoryMappedReadableFile::Region {
+public:
+	Region(uint8_t * data, int64_t size) : data(data), size(size) {}
+
+	~Region() {
+		if(data != nullptr) {
+			munmap(data, size);
+		}
+	}
+
+	uint8_t * const data;
+	const int64_t size;
+};
+
+namespace {
+
+// a buffer that points into a region, it keeps the region mapped while it is alive
+class RegionBuffer : public arrow::Buffer {
+public:
+	RegionBuffer(const uint8_t * data, int64_t size, std::shared_ptr<const void> region)
+		: arrow::Buffer(data, size), region(std::move(region)) {}
+
+private:
+	std::shared_ptr<const void> region;
+};
+
+}  // namespace
+
+arrow::Result<std::shared_ptr<MemoryMappedReadableFile>> MemoryMappedReadableFile::Open(const std::string & path) {
+	const int fd = open(path.c_str(), O_RDONLY);
+	if(fd == -1) {
+		return arrow::Status::IOError("Unable to open " + path + ": " + std::strerror(errno));
+	}
+
+	struct stat fileStat;
+	if(fstat(fd, &fileStat) == -1) {
+		const int error = errno;
+		close(fd);
+		return arrow::Status::IOError("Unable to read the size of " + path + ": " + std::strerror(error));
+	}
+
+	const int64_t size = fileStat.st_size;
+	uint8_t * data = nullptr;
+	if(size > 0) {  // empty files can not be mapped
+		void * mapping = mmap(nullptr, size, PROT_READ, MAP_SHARED, fd, 0);
+		if(mapping == MAP_FAILED) {
+			const int error = errno;
+			close(fd);
+			return arrow::Status::IOError("Unable to map " + path + " in memory: " + std::strerror(error));
+		}
+		data = static_cast<uint8_t *>(mapping);
+
+		// NOTE the advice is only a hint, the reads work the same when it is ignored
+		if(madvise(data, size, MADV_SEQUENTIAL) == -1) {
+			Logging::Logger().logWarn("MemoryMappedReadableFile: madvise failed for " + path + ": " + std::strerror(errno));
+		}
+	}
+	// the mapping stays valid after the descriptor is closed
+	close(fd);
+
+	std::shared_ptr<Region> region = std::make_shared<Region>(data, size);
+	return std::shared_ptr<MemoryMappedReadableFile>(new MemoryMappedReadableFile(path, std::move(region)));
+}
+
+MemoryMappedReadableFile::MemoryMappedReadableFile(const std::string & path, std::shared_ptr<Region> region)
+	: path(path), region(std::move(region)), position(0) {}
+
+MemoryMappedReadableFile::~MemoryMappedReadableFile() {}
+
+arrow::Status MemoryMappedReadableFile::Close() {
+	// the buffers that were read keep the region mapped
+	region.reset();
+	return arrow::Status::OK();
+}
+
+bool MemoryMappedReadableFile::closed() const { return region == nullptr; }
+
+arrow::Status MemoryMappedReadableFile::checkOpen() const {
+	if(closed()) {
+		return arrow::Status::Invalid("MemoryMappedReadableFile: " + path + " is closed");
+	}
+	return arrow::Status::OK();
+}
+
+arrow::Result<int64_t> MemoryMappedReadableFile::clip(int64_t position, int64_t nbytes) const {
+	ARROW_RETURN_NOT_OK(checkOpen());
+	if(position < 0 || nbytes < 0) {
+		return arrow::Status::Invalid("MemoryMappedReadableFile: invalid read of " + std::to_string(nbytes) +
+									  " bytes at " + std::to_string(position) + " for " + path);
+	}
+	return std::max<int64_t>(0, std::min(nbytes, region->size - position));
+}
+
+void MemoryMappedReadableFile::adviseWillNeed(int64_t position, int64_t nbytes) const {
+	if(nbytes <= 0) {
+		return;
+	}
+	// madvise needs an address aligned to the page size
+	static const int64_t pageSize = sysconf(_SC_PAGESIZE);
+	const int64_t start = position - position % pageSize;
+	madvise(region->data + start, position + nbytes - start, MADV_WILLNEED);
+}
+
+arrow::Result<int64_t> MemoryMappedReadableFile::GetSize() {
+	ARROW_RETURN_NOT_OK(checkOpen());
+	return region->size;
+}
+
+arrow::Status MemoryMappedReadableFile::Seek(int64_t position) {
+	ARROW_RETURN_NOT_OK(checkOpen());
+	if(position < 0) {
+		return arrow::Status::Invalid("MemoryMappedReadableFile: invalid seek to " + std::to_string(position));
+	}
+	this->position = position;
+	return arrow::Status::OK();
+}
+
+arrow::Result<int64_t> MemoryMappedReadableFile::Tell() const {
+	ARROW_RETURN_NOT_OK(checkOpen());
+	return this->position;
+}
+
+arrow::Result<int64_t> MemoryMappedReadableFile::Read(int64_t nbytes, void * out) {
+	ARROW_ASSIGN_OR_RAISE(int64_t bytesRead, this->ReadAt(position, nbytes, out));
+	this->position += bytesRead;
+	return bytesRead;
+}
+
+arrow::Result<std::shared_ptr<arrow::Buffer>> MemoryMappedReadableFile::Read(int64_t nbytes) {
+	ARROW_ASSIGN_OR_RAISE(std::shared_ptr<arrow::Buffer> buffer, this->ReadAt(position, nbytes));
+	this->position += buffer->size();
+	return buffer;
+}
+
+arrow::Result<int64_t> MemoryMappedReadableFile::ReadAt(int64_t position, int64_t nbytes, void * out) {
+	ARROW_ASSIGN_OR_RAISE(int64_t bytesRead, clip(position, nbytes));
+	if(bytesRead > 0) {
+		std::memcpy(out, region->data + position, bytesRead);
+	}
+	return bytesRead;
+}
+
+arrow::Result<std::shared_ptr<arrow::Buffer>> MemoryMappedReadableFile::ReadAt(int64_t position, int64_t nbytes) {
+	ARROW_ASSIGN_OR_RAISE(int64_t bytesRead, clip(position, nbytes));
+	if(bytesRead == 0) {
+		return std::make_shared<RegionBuffer>(nullptr, 0, region);
+	}
+	// the pages are read in the background while the caller gets to them
+	adviseWillNeed(position, bytesRead);
+	return std::make_shared<RegionBuffer>(region->data + position, bytesRead, region);
+}
+
+arrow::Status MemoryMappedReadableFile::WillNeed(const std::vector<arrow::io::ReadRange> & ranges) {
+	for(const arrow::io::ReadRange & range : ranges) {
+		ARROW_ASSIGN_OR_RAISE(int64_t nbytes, clip(range.offset, range.length));
+		adviseWillNeed(range.offset, nbytes);
+	}
+	return arrow::Status::OK();
+}
+
+bool MemoryMappedReadableFile::supports_zero_copy() const { return true; }
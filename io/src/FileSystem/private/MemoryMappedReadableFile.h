@@ -0,0 +1,68 @@
+/*
+ * Copyright 2020 BlazingDB, Inc.
+ */
+
+#ifndef SRC_FILESYSTEM_PRIVATE_MEMORYMAPPEDREADABLEFILE_H_
+#define SRC_FILESYSTEM_PRIVATE_MEMORYMAPPEDREADABLEFILE_H_
+
+#include "arrow/io/interfaces.h"
+#include "arrow/result.h"
+#include "arrow/status.h"
+#include <memory>
+#include <string>
+#include <vector>
+
+/**
+ * Readable local file that maps the whole file in memory. The buffers returned by Read and ReadAt point into the
+ * mapping instead of being copied, and they keep the mapping alive after the file is closed.
+ * The mapping is advised as sequential, so the kernel reads ahead aggressively and drops the pages that were already
+ * scanned, and the ranges that are read (or announced with WillNeed) are advised as needed, so their pages are read
+ * in the background before they are touched.
+ */
+class MemoryMappedReadableFile : public arrow::io::RandomAccessFile {
+public:
+	static arrow::Result<std::shared_ptr<MemoryMappedReadableFile>> Open(const std::string & path);
+
+	~MemoryMappedReadableFile();
+
+	arrow::Status Close() override;
+
+	arrow::Result<int64_t> GetSize() override;
+
+	arrow::Result<int64_t> Read(int64_t nbytes, void * out) override;
+
+	arrow::Result<std::shared_ptr<arrow::Buffer>> Read(int64_t nbytes) override;
+
+	arrow::Result<int64_t> ReadAt(int64_t position, int64_t nbytes, void * out) override;
+
+	arrow::Result<std::shared_ptr<arrow::Buffer>> ReadAt(int64_t position, int64_t nbytes) override;
+
+	arrow::Status WillNeed(const std::vector<arrow::io::ReadRange> & ranges) override;
+
+	bool supports_zero_copy() const override;
+
+	arrow::Status Seek(int64_t position) override;
+	arrow::Result<int64_t> Tell() const override;
+
+	bool closed() const override;
+
+private:
+	class Region;
+
+	MemoryMappedReadableFile(const std::string & path, std::shared_ptr<Region> region);
+
+	arrow::Status checkOpen() const;
+
+	// clips [position, position + nbytes) to the file, returns the number of bytes that can be read
+	arrow::Result<int64_t> clip(int64_t position, int64_t nbytes) const;
+
+	void adviseWillNeed(int64_t position, int64_t nbytes) const;
+
+	std::string path;
+	std::shared_ptr<Region> region;
+	int64_t position;
+
+	ARROW_DISALLOW_COPY_AND_ASSIGN(MemoryMappedReadableFile);
+};
+
+#endif /* SRC_FILESYSTEM_PRIVATE_MEMORYMAPPEDREADABLEFILE_H_ */
@@ -0,0 +1,181 @@
+/*
+ * Copyright 2020 BlazingDB, Inc.
+ */
+
+#include "RangeReader.h"
+
+#include <algorithm>
+#include <chrono>
+#include <cstring>
+#include <iterator>
+#include <string>
+#include <thread>
+
+#include "Library/Logging/Logger.h"
+namespace Logging = Library::Logging;
+
+RangeReader::RangeReader(FetchFunction fetch, SizeFunction size, Options options)
+	: fetch(fetch), size(size), options(options), objectSize(-1), lastReadEnd(-1), cachedBytes(0), requestCount(0),
+	  randomGenerator(std::random_device{}()) {}
+
+int64_t RangeReader::getSize() {
+	std::lock_guard<std::mutex> lock(mutex);
+	return getSizeUnlocked();
+}
+
+int64_t RangeReader::getSizeUnlocked() {
+	if(objectSize < 0) {
+		objectSize = size();
+	}
+	return objectSize;
+}
+
+int64_t RangeReader::getRequestCount() const { return requestCount; }
+
+int64_t RangeReader::readAt(int64_t position, int64_t nbytes, uint8_t * out) {
+	// NOTE the lock is held while fetching, the reads of one file are mostly done by one thread
+	std::lock_guard<std::mutex> lock(mutex);
+
+	const int64_t objectSize = getSizeUnlocked();
+	if(objectSize >= 0) {
+		nbytes = std::max<int64_t>(0, std::min(nbytes, objectSize - position));
+	}
+
+	int64_t bytesRead = 0;
+	while(bytesRead < nbytes) {
+		const int64_t current = position + bytesRead;
+		const int64_t remaining = nbytes - bytesRead;
+
+		auto it = findRange(current);
+		if(it == ranges.end()) {
+			if(remaining > options.cacheSize) {
+				// too big to be cached, it goes straight to the output
+				int64_t fetched = fetchWithRetries(current, remaining, out + bytesRead);
+				if(fetched < 0) {
+					return -1;
+				}
+				bytesRead += fetched;
+				break;
+			}
+
+			int64_t fetched = fetchRange(current, remaining, objectSize);
+			if(fetched < 0) {
+				return -1;
+			}
+			it = findRange(current);
+			if(it == ranges.end()) {
+				break;  // the object ends before current
+			}
+		}
+
+		const int64_t offset = current - it->first;
+		const int64_t count = std::min<int64_t>(remaining, it->second.data.size() - offset);
+		std::memcpy(out + bytesRead, it->second.data.data() + offset, count);
+		bytesRead += count;
+
+		lru.erase(it->second.lruPosition);
+		lru.push_front(it->first);
+		it->second.lruPosition = lru.begin();
+	}
+
+	lastReadEnd = position + bytesRead;
+	return bytesRead;
+}
+
+std::map<int64_t, RangeReader::CachedRange>::iterator RangeReader::findRange(int64_t position) {
+	auto it = ranges.upper_bound(position);
+	if(it == ranges.begin()) {
+		return ranges.end();
+	}
+	--it;
+	if(position < it->first + (int64_t) it->second.data.size()) {
+		return it;
+	}
+	return ranges.end();
+}
+
+int64_t RangeReader::fetchRange(int64_t position, int64_t nbytes, int64_t objectSize) {
+	int64_t start = position;
+	int64_t length = std::max(nbytes, options.minRequestSize);
+
+	const bool isSequential =
+		lastReadEnd >= 0 && position >= lastReadEnd && position - lastReadEnd <= options.holeSize;
+	if(isSequential) {
+		length = std::max(length, options.readAheadSize);
+	}
+	// the ranges around position are not fetched again, position is not in any of them
+	auto next = ranges.upper_bound(position);
+	int64_t previousEnd = 0;
+	if(next != ranges.begin()) {
+		auto previous = std::prev(next);
+		previousEnd = previous->first + previous->second.data.size();
+	}
+	if(objectSize >= 0 && position >= objectSize - options.tailSize) {
+		start = std::max(previousEnd, std::min(position, objectSize - options.tailSize));
+	}
+
+	int64_t end = std::max(start + length, position + nbytes);
+	end = std::min(end, start + std::max(options.cacheSize, nbytes));
+	if(next != ranges.end()) {
+		end = std::min(end, next->first);
+	}
+	if(objectSize >= 0) {
+		end = std::min(end, objectSize);
+	}
+	if(end <= start) {
+		return 0;
+	}
+
+	std::vector<uint8_t> data(end - start);
+	int64_t fetched = fetchWithRetries(start, end - start, data.data());
+	if(fetched <= 0) {
+		return fetched;
+	}
+	data.resize(fetched);
+
+	auto existing = ranges.find(start);
+	if(existing != ranges.end()) {
+		removeRange(existing);
+	}
+	while(!lru.empty() && cachedBytes + fetched > options.cacheSize) {
+		removeRange(ranges.find(lru.back()));
+	}
+
+	lru.push_front(start);
+	CachedRange & range = ranges[start];
+	range.data = std::move(data);
+	range.lruPosition = lru.begin();
+	cachedBytes += fetched;
+	return fetched;
+}
+
+int64_t RangeReader::fetchWithRetries(int64_t position, int64_t nbytes, uint8_t * out) {
+	for(int attempt = 0;; attempt++) {
+		bool retryable = false;
+		requestCount++;
+		int64_t fetched = fetch(position, nbytes, out, retryable);
+		if(fetched >= 0) {
+			return fetched;
+		}
+		if(!retryable || attempt >= options.maxRetries) {
+			Logging::Logger().logError("RangeReader: request for " + std::to_string(nbytes) + " bytes at " +
+									   std::to_string(position) + " failed after " + std::to_string(attempt + 1) +
+									   " attempts");
+			return -1;
+		}
+
+		// full jitter over the upper half of the exponential backoff
+		int64_t backoff = std::min(options.maxBackoffMs, options.baseBackoffMs << std::min(attempt, 20));
+		std::uniform_int_distribution<int64_t> jitter(backoff / 2, backoff);
+		int64_t delay = jitter(randomGenerator);
+		Logging::Logger().logWarn("RangeReader: request for " + std::to_string(nbytes) + " bytes at " +
+								  std::to_string(position) + " failed, retrying in " + std::to_string(delay) + " ms");
+		std::this_thread::sleep_for(std::chrono::milliseconds(delay));
+	}
+}
+
+void RangeReader::removeRange(std::map<int64_t, CachedRange>::iterator it) {
+	cachedBytes -= it->second.data.size();
+	lru.erase(it->second.lruPosition);
+	ranges.erase(it);
+}
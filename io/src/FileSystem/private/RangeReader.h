@@ -0,0 +1,100 @@
+/*
+ * Copyright 2020 BlazingDB, Inc.
+ */
+
+#ifndef SRC_FILESYSTEM_PRIVATE_RANGEREADER_H_
+#define SRC_FILESYSTEM_PRIVATE_RANGEREADER_H_
+
+#include <atomic>
+#include <cstdint>
+#include <functional>
+#include <list>
+#include <map>
+#include <mutex>
+#include <random>
+#include <vector>
+
+struct RangeReaderOptions {
+	int64_t minRequestSize = 256 * 1024;
+	int64_t readAheadSize = 16 * 1024 * 1024;
+	int64_t holeSize = 1024 * 1024;
+	int64_t tailSize = 64 * 1024;
+	int64_t cacheSize = 64 * 1024 * 1024;
+	int maxRetries = 5;
+	int64_t baseBackoffMs = 50;
+	int64_t maxBackoffMs = 5000;
+};
+
+/**
+ * Read layer for object stores (S3, GCS), where every request pays a round trip. The readers of parquet and orc
+ * make many small reads (footer, page headers, column chunks), so instead of one request per read:
+ * - a read that misses the cache fetches at least minRequestSize bytes, so neighbour reads are served by one request
+ * - a read that continues a previous one (allowing holes of up to holeSize bytes, e.g. the column chunks of the
+ *   columns that are not read) fetches readAheadSize bytes, so the next column chunks are already there
+ * - a read near the end of the object fetches its last tailSize bytes, where parquet and orc keep their footers
+ * The fetched ranges are kept in a cache of up to cacheSize bytes, in LRU order. Failed requests that can be retried
+ * are sent again with a jittered exponential backoff.
+ * The object store is only reached through the fetch and size functions, so it can be replaced by a stand-in.
+ */
+class RangeReader {
+public:
+	/**
+	 * Reads [position, position + nbytes) of the object into out. Returns the number of bytes read, or -1 on error
+	 * setting retryable if sending the request again may succeed.
+	 */
+	using FetchFunction = std::function<int64_t(int64_t position, int64_t nbytes, uint8_t * out, bool & retryable)>;
+
+	/**
+	 * Returns the size of the object, or -1 if it can not be known.
+	 */
+	using SizeFunction = std::function<int64_t()>;
+
+	using Options = RangeReaderOptions;
+
+	RangeReader(FetchFunction fetch, SizeFunction size, Options options = Options());
+
+	int64_t getSize();
+
+	/**
+	 * Reads [position, position + nbytes) into out. Returns the number of bytes read, that is less than nbytes when
+	 * the object ends before, or -1 if a request failed.
+	 */
+	int64_t readAt(int64_t position, int64_t nbytes, uint8_t * out);
+
+	/**
+	 * The number of requests sent to the object store, retries included.
+	 */
+	int64_t getRequestCount() const;
+
+private:
+	struct CachedRange {
+		std::vector<uint8_t> data;
+		std::list<int64_t>::iterator lruPosition;
+	};
+
+	int64_t getSizeUnlocked();
+
+	std::map<int64_t, CachedRange>::iterator findRange(int64_t position);
+
+	int64_t fetchRange(int64_t position, int64_t nbytes, int64_t size);
+
+	int64_t fetchWithRetries(int64_t position, int64_t nbytes, uint8_t * out);
+
+	void removeRange(std::map<int64_t, CachedRange>::iterator it);
+
+	FetchFunction fetch;
+	SizeFunction size;
+	Options options;
+
+	std::mutex mutex;
+	int64_t objectSize;
+	int64_t lastReadEnd;
+	// cached ranges by start position, and their start positions from the most to the least recently used
+	std::map<int64_t, CachedRange> ranges;
+	std::list<int64_t> lru;
+	int64_t cachedBytes;
+	std::atomic<int64_t> requestCount;
+	std::mt19937_64 randomGenerator;
+};
+
+#endif /* SRC_FILESYSTEM_PRIVATE_RANGEREADER_H_ */
@@ -351,12 +351,13 @@ FileStatus S3FileSystem::Private::getFileStatus(const Uri & uri) const {
 
 		std::string contentType = result.GetContentType().data();
 		long long contentLength = result.GetContentLength();
+		const unsigned long long modificationTime = result.GetLastModified().Millis();
 
 		if(objectKey[objectKey.size() - 1] == '/' || contentType == "application/x-directory") {
 			const FileStatus fileStatus(uri, FileType::DIRECTORY, contentLength);
 			return fileStatus;
 		} else {
-			const FileStatus fileStatus(uri, FileType::FILE, contentLength);
+			const FileStatus fileStatus(uri, FileType::FILE, contentLength, modificationTime);
 			return fileStatus;
 		}
 	} else {
@@ -429,7 +430,7 @@ std::vector<FileStatus> S3FileSystem::Private::list(const Uri & uri, const FileF
 	request.WithDelimiter("/");  // NOTE percy since we control how to create files in S3 we should use this convention
 	request.WithPrefix(objectKey.data());
 
-	auto objectsOutcome = this->s3Client->ListObjectsV2(request);
+	auto objectsOutcome = this->listAllObjects(request);
 
 	if(objectsOutcome.IsSuccess()) {
 		if(this->root.isRoot()) {  // if root is '/' then we don't need to replace the uris to relative paths
@@ -554,7 +555,7 @@ std::vector<Uri> S3FileSystem::Private::list(const Uri & uri, const std::string
 	request.WithDelimiter("/");  // NOTE percy since we control how to create files in S3 we should use this convention
 	request.WithPrefix(objectKey.data());
 
-	auto objectsOutcome = this->s3Client->ListObjectsV2(request);
+	auto objectsOutcome = this->listAllObjects(request);
 
 	if(objectsOutcome.IsSuccess()) {
 		const Path wildcardPath = uriWithRoot.getPath() + wildcard;
@@ -669,7 +670,7 @@ std::vector<std::string> S3FileSystem::Private::listResourceNames(
 	request.WithDelimiter("/");  // NOTE percy since we control how to create files in S3 we should use this convention
 	request.WithPrefix(objectKey.data());
 
-	auto objectsOutcome = this->s3Client->ListObjectsV2(request);
+	auto objectsOutcome = this->listAllObjects(request);
 
 	if(objectsOutcome.IsSuccess()) {
 		const Path wildcardPath = uriWithRoot.getPath() + wildcard;
@@ -798,7 +799,7 @@ std::vector<std::string> S3FileSystem::Private::listResourceNames(const Uri & ur
 	request.WithDelimiter("/");  // NOTE percy since we control how to create files in S3 we should use this convention
 	request.WithPrefix(objectKey.data());
 
-	auto objectsOutcome = this->s3Client->ListObjectsV2(request);
+	auto objectsOutcome = this->listAllObjects(request);
 
 	if(objectsOutcome.IsSuccess()) {
 		const Path wildcardPath = uriWithRoot.getPath() + wildcard;
@@ -1166,6 +1167,35 @@ bool S3FileSystem::Private::openWriteable(const Uri & uri, std::shared_ptr<S3Out
 	return true;
 }
 
+Aws::S3::Model::ListObjectsV2Outcome S3FileSystem::Private::listAllObjects(
+	Aws::S3::Model::ListObjectsV2Request request) const {
+	// NOTE each response has up to 1000 keys, the next page is requested with the continuation token
+	auto outcome = this->s3Client->ListObjectsV2(request);
+	if(!outcome.IsSuccess() || !outcome.GetResult().GetIsTruncated()) {
+		return outcome;
+	}
+
+	Aws::S3::Model::ListObjectsV2Result result = outcome.GetResult();
+	while(outcome.GetResult().GetIsTruncated()) {
+		request.SetContinuationToken(outcome.GetResult().GetNextContinuationToken());
+		outcome = this->s3Client->ListObjectsV2(request);
+		if(!outcome.IsSuccess()) {
+			return outcome;
+		}
+
+		for(auto const & s3Object : outcome.GetResult().GetContents()) {
+			result.AddContents(s3Object);
+		}
+		for(auto const & s3Folder : outcome.GetResult().GetCommonPrefixes()) {
+			result.AddCommonPrefixes(s3Folder);
+		}
+	}
+	result.SetIsTruncated(false);
+	result.SetKeyCount(result.GetContents().size() + result.GetCommonPrefixes().size());
+
+	return Aws::S3::Model::ListObjectsV2Outcome(std::move(result));
+}
+
 const std::string S3FileSystem::Private::getBucketName() const {
 	using namespace S3FileSystemConnection;
 	return this->fileSystemConnection.getConnectionProperty(ConnectionProperty::BUCKET_NAME);
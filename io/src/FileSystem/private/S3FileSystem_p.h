@@ -7,6 +7,7 @@
 #define _S3_FILE_SYSTEM_PRIVATE_H_
 
 #include "aws/s3/S3Client.h"
+#include "aws/s3/model/ListObjectsV2Request.h"
 
 #include "S3OutputStream.h"
 #include "S3ReadableFile.h"
@@ -62,6 +63,9 @@ private:
 	const std::string
 	getSSEKMSKeyId() const;  // if isAWSKMSEncrypted is true then returns the KMS_KEY_AMAZON_RESOURCE_NAME
 
+	// sends the request until the listing is not truncated, returns the objects and prefixes of all the pages
+	Aws::S3::Model::ListObjectsV2Outcome listAllObjects(Aws::S3::Model::ListObjectsV2Request request) const;
+
 private:
 	FileSystemConnection fileSystemConnection;
 	std::shared_ptr<Aws::S3::S3Client> s3Client;
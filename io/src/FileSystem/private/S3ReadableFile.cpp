@@ -22,8 +22,6 @@
 #include "Library/Logging/Logger.h"
 namespace Logging = Library::Logging;
 
-// TODO: handle the situation when not all data is read
-
 S3ReadableFile::~S3ReadableFile() {}
 
 
@@ -33,6 +31,51 @@ S3ReadableFile::S3ReadableFile(std::shared_ptr<Aws::S3::S3Client> s3Client, std:
 	this->s3Client = s3Client;
 	position = 0;
 	valid = true;
+
+	// NOTE every request goes through the reader, it coalesces the small reads and retries the failed ones
+	auto fetch = [s3Client, bucketName, key](int64_t position, int64_t nbytes, uint8_t * out, bool & retryable) {
+		Aws::S3::Model::GetObjectRequest object_request;
+
+		object_request.SetBucket(bucketName.data());
+		object_request.SetKey(key.data());
+		// the end of an http range is inclusive
+		auto range = "bytes=" + std::to_string(position) + "-" + std::to_string(position + nbytes - 1);
+		object_request.SetRange(range.data());
+
+		auto results = s3Client->GetObject(object_request);
+
+		if(!results.IsSuccess()) {
+			retryable = results.GetError().ShouldRetry();
+			Logging::Logger().logWarn("S3ReadableFile, GetObject failed for bucketName: " + bucketName + " key " +
+									  key + " " + std::string(results.GetError().GetExceptionName().data()) + " : " +
+									  results.GetError().GetMessage().data());
+			return (int64_t) -1;
+		}
+
+		int64_t bytesRead = results.GetResult().GetContentLength();
+		bytesRead = nbytes < bytesRead ? nbytes : bytesRead;
+		results.GetResult().GetBody().read((char *) out, bytesRead);
+		return bytesRead;
+	};
+
+	auto size = [s3Client, bucketName, key]() {
+		Aws::S3::Model::HeadObjectRequest request;
+
+		request.SetBucket(bucketName.data());
+		request.SetKey(key.data());
+
+		Aws::S3::Model::HeadObjectOutcome results = s3Client->HeadObject(request);
+
+		if(!results.IsSuccess()) {
+			Logging::Logger().logWarn("S3ReadableFile::GetSize, HeadObject failed");
+			Logging::Logger().logError(std::string(results.GetError().GetExceptionName().data()) + " : " +
+									   results.GetError().GetMessage().data());
+			return (int64_t) -1;
+		}
+		return (int64_t) results.GetResult().GetContentLength();
+	};
+
+	reader = std::unique_ptr<RangeReader>(new RangeReader(fetch, size));
 }
 
 arrow::Status S3ReadableFile::Seek(int64_t position) {
@@ -49,258 +92,40 @@ arrow::Status S3ReadableFile::Close() {
 }
 
 arrow::Result<int64_t> S3ReadableFile::GetSize() {
-    int64_t size = -1;
-	Aws::S3::Model::HeadObjectRequest request;
-
-	request.SetBucket(bucketName.data());
-	request.SetKey(key.data());
-
-	Aws::S3::Model::HeadObjectOutcome results = this->s3Client->HeadObject(request);
-
-	if(results.IsSuccess()) {
-		size = results.GetResult().GetContentLength();
-
-	} else {
-		size = -1;
-		Logging::Logger().logWarn("S3ReadableFile::GetSize, HeadObject failed");
-		bool shouldRetry = results.GetError().ShouldRetry();
-		if(shouldRetry) {
-			Logging::Logger().logError(
-				std::string(results.GetError().GetExceptionName().data()) + " : " + results.GetError().GetMessage().data() + "  SHOULD RETRY");
-		} else {
-			Logging::Logger().logError(
-				std::string(results.GetError().GetExceptionName().data()) + " : " + results.GetError().GetMessage().data() + "  SHOULD NOT RETRY");
-		}
-
-        // TODO william jp errors for new arrow-0.17 API
-		//return arrow::Status::IOError(results.GetError().GetExceptionName() + " : " + results.GetError().GetMessage());
+	int64_t size = reader->getSize();
+	if(size < 0) {
+		return arrow::Status::IOError("S3ReadableFile::GetSize failed for bucketName: " + bucketName + " key " + key);
 	}
-
 	return size;
 }
 
-//arrow::Status S3ReadableFile::Read(int64_t nbytes, int64_t * bytesRead, void * buffer) {
 arrow::Result<int64_t> S3ReadableFile::Read(int64_t nbytes, void* buffer) {
-    int64_t bytesRead = -1;
-	//	std::cout<<"S3ReadableFile::Read " + std::to_string(nbytes)<<std::endl;
-	Aws::S3::Model::GetObjectRequest object_request;
-
-	object_request.SetBucket(bucketName.data());
-	object_request.SetKey(key.data());
-    auto a = "bytes=" + std::to_string(position) + "-" + std::to_string(position + nbytes);
-	object_request.SetRange(a.data());
-
-	auto results = this->s3Client->GetObject(object_request);
-
-	if(!results.IsSuccess()) {
-		// TODO: Make bad arrow status here
-		Logging::Logger().logWarn(
-			"S3ReadableFile::Read, GetObject failed for bucketName: " + bucketName + " key " + key);
-		bool shouldRetry = results.GetError().ShouldRetry();
-
-		if(shouldRetry) {
-			Logging::Logger().logTrace("retrying");
-			return this->Read(nbytes, buffer);
-		} else {
-			bytesRead = 0;
-			Logging::Logger().logError(
-				std::string(results.GetError().GetExceptionName().data()) + " : " + results.GetError().GetMessage().data() + "  SHOULD NOT RETRY");
-		}
-
-        // TODO william jp errors for new arrow-0.17 API
-		//return arrow::Status::IOError(results.GetError().GetExceptionName() + " : " + results.GetError().GetMessage());
-        return bytesRead;
-	} else {
-		bytesRead = results.GetResult().GetContentLength();
-		bytesRead = nbytes < bytesRead ? nbytes : bytesRead;
-		results.GetResult().GetBody().read((char *) buffer, bytesRead);
-		position += bytesRead;
-		return bytesRead;
-	}
-    
-    return bytesRead;
+	ARROW_ASSIGN_OR_RAISE(int64_t bytesRead, this->ReadAt(position, nbytes, buffer));
+	return bytesRead;
 }
 
-//arrow::Status S3ReadableFile::Read(int64_t nbytes, std::shared_ptr<arrow::Buffer> * out) {
 arrow::Result<std::shared_ptr<arrow::Buffer>> S3ReadableFile::Read(int64_t nbytes) {
-    std::shared_ptr<arrow::Buffer> out = nullptr;
-
-	//	std::cout<<"S3ReadableFile::Read " + std::to_string(nbytes)<<std::endl;
-	Aws::S3::Model::GetObjectRequest object_request;
-
-	object_request.SetBucket(bucketName.data());
-	object_request.SetKey(key.data());
-    auto a = "bytes=" + std::to_string(position) + "-" + std::to_string(position + nbytes);
-	object_request.SetRange(a.data());
-
-	auto results = this->s3Client->GetObject(object_request);
-
-	if(!results.IsSuccess()) {
-		// TODO: Make bad arrow status here
-
-		Logging::Logger().logWarn(
-			"S3ReadableFile::Read, GetObject failed for bucketName: " + bucketName + " key " + key);
-		bool shouldRetry = results.GetError().ShouldRetry();
-		if(shouldRetry) {
-			Logging::Logger().logTrace("retrying");
-			return this->Read(nbytes);
-		} else {
-			Logging::Logger().logError(
-				std::string(results.GetError().GetExceptionName().data()) + " : " + results.GetError().GetMessage().data() + "  SHOULD NOT RETRY");
-		}
-
-        // TODO william jp errors for new arrow-0.17 API
-		//return arrow::Status::IOError(results.GetError().GetExceptionName() + " : " + results.GetError().GetMessage());
-        
-        return out;
-	} else {
-		// old implementation
-		/*
-std::shared_ptr<arrow::ResizableBuffer> buffer;
-AllocateResizableBuffer(arrow::default_memory_pool(), nbytes, &buffer);
-
-int64_t bytesRead = results.GetResult().GetContentLength();
-
-memcpy(buffer->mutable_data(), results.GetResult().GetBody().rdbuf(), bytesRead);
-
-position += bytesRead;
-*out = buffer;
-return arrow::Status::OK();
-*/
-
-		int64_t bytesRead = results.GetResult().GetContentLength();
-		bytesRead = nbytes < bytesRead ? nbytes : bytesRead;
-		position += bytesRead;
-		if(bytesRead < nbytes) {
-			Logging::Logger().logError(
-				"Did not read all the bytes at S3ReadableFile::ReadAt(int64_t position, int64_t nbytes, "
-				"std::shared_ptr<arrow::Buffer>* out)");
-		}
-		//		results.GetResult().GetBody().read((char*)(out->get()->mutable_data()), bytesRead);
-
-		std::shared_ptr<arrow::ResizableBuffer> buffer;
-		AllocateResizableBuffer(arrow::default_memory_pool(), nbytes, &buffer);
-
-		results.GetResult().GetBody().read((char *) (buffer->mutable_data()), bytesRead);
-		out = buffer;
-
-		return out;
-	}
+	return this->ReadAt(position, nbytes);
 }
 
-//arrow::Status S3ReadableFile::ReadAt(int64_t position, int64_t nbytes, int64_t * bytesRead, void * buffer) {
 arrow::Result<int64_t> S3ReadableFile::ReadAt(int64_t position, int64_t nbytes, void* buffer) {
-    int64_t bytesRead = -1;
-        
-	//	std::cout<<"S3ReadableFile::ReadAt " + std::to_string(nbytes)<<std::endl;
-
-	Aws::S3::Model::GetObjectRequest object_request;
-
-	object_request.SetBucket(bucketName.data());
-	object_request.SetKey(key.data());
-    auto a = "bytes=" + std::to_string(position) + "-" + std::to_string(position + nbytes);
-	object_request.SetRange(a.data());
-
-	auto results = this->s3Client->GetObject(object_request);
-
-	if(!results.IsSuccess()) {
-		// TODO: Make bad arrow status here
-
-		Logging::Logger().logWarn(
-			"S3ReadableFile::ReadAt, GetObject failed for bucketName: " + bucketName + " key " + key);
-		bool shouldRetry = results.GetError().ShouldRetry();
-		if(shouldRetry) {
-			Logging::Logger().logTrace("retrying");
-			return this->ReadAt(position, nbytes, buffer);
-		} else {
-			bytesRead = 0;
-			Logging::Logger().logError(
-				std::string(results.GetError().GetExceptionName().data()) + " : " + results.GetError().GetMessage().data() + "  SHOULD NOT RETRY");
-		}
-
-        // TODO william jp errors for new arrow-0.17 API
-		//return arrow::Status::IOError(results.GetError().GetExceptionName() + " : " + results.GetError().GetMessage());
-        
-        return bytesRead;
-	} else {
-		bytesRead = results.GetResult().GetContentLength();
-		bytesRead = nbytes < bytesRead ? nbytes : bytesRead;
-		this->position = position + bytesRead;
-		results.GetResult().GetBody().read((char *) buffer, bytesRead);
-
-		return bytesRead;
+	int64_t bytesRead = reader->readAt(position, nbytes, (uint8_t *) buffer);
+	if(bytesRead < 0) {
+		return arrow::Status::IOError("S3ReadableFile::ReadAt failed for bucketName: " + bucketName + " key " + key);
 	}
-    
-    return bytesRead;
+	this->position = position + bytesRead;
+	return bytesRead;
 }
 
-//arrow::Status S3ReadableFile::ReadAt(int64_t position, int64_t nbytes, std::shared_ptr<arrow::Buffer> * out) {
 arrow::Result<std::shared_ptr<arrow::Buffer>> S3ReadableFile::ReadAt(int64_t position, int64_t nbytes) {
-    std::shared_ptr<arrow::Buffer> out = nullptr;
-        
-	//	std::cout<<"S3ReadableFile::ReadAt " + std::to_string(nbytes)<<std::endl;
-
-	Aws::S3::Model::GetObjectRequest object_request;
-
-	object_request.SetBucket(bucketName.data());
-	object_request.SetKey(key.data());
-    auto a = "bytes=" + std::to_string(position) + "-" + std::to_string(position + nbytes);
-	object_request.SetRange(a.data());
-
-	auto results = this->s3Client->GetObject(object_request);
-
-	if(!results.IsSuccess()) {
-		// TODO: Make bad arrow status here
-
-		Logging::Logger().logWarn(
-			"S3ReadableFile::ReadAt, GetObject failed for bucketName: " + bucketName + " key " + key);
-		bool shouldRetry = results.GetError().ShouldRetry();
-		if(shouldRetry) {
-			Logging::Logger().logTrace("retrying");
-			return this->ReadAt(position, nbytes);
-		} else {
-			Logging::Logger().logError(
-				std::string(results.GetError().GetExceptionName().data()) + " : " + results.GetError().GetMessage().data() + "  SHOULD NOT RETRY");
-		}
-
-        // TODO william jp errors for new arrow-0.17 API
-		//return arrow::Status::IOError(results.GetError().GetExceptionName() + " : " + results.GetError().GetMessage());
-        
-        return out;
-	} else {
-		// old implementation
-		/*
-		//byutes read should always be full amount
-		//should almost always be nBytes
-		std::shared_ptr<arrow::ResizableBuffer> buffer;
-		AllocateResizableBuffer(arrow::default_memory_pool(), nbytes, &buffer);
-
-		int64_t bytesRead = nbytes;
-
-		memcpy(buffer->mutable_data(), results.GetResult().GetBody().rdbuf(), bytesRead);
-
-		*out = buffer;
-		return arrow::Status::OK();
-		*/
-
-		int64_t bytesRead = results.GetResult().GetContentLength();
-		bytesRead = nbytes < bytesRead ? nbytes : bytesRead;
-		this->position = position + nbytes;
-		if(bytesRead < nbytes) {
-			Logging::Logger().logError(
-				"Did not read all the bytes at S3ReadableFile::ReadAt(int64_t position, int64_t nbytes, "
-				"std::shared_ptr<arrow::Buffer>* out)");
-		}
-		//		results.GetResult().GetBody().read((char*)(out->get()->mutable_data()), bytesRead);
-
-		std::shared_ptr<arrow::ResizableBuffer> buffer;
-		AllocateResizableBuffer(arrow::default_memory_pool(), nbytes, &buffer);
-
-		results.GetResult().GetBody().read((char *) (buffer->mutable_data()), bytesRead);
-		out = buffer;
+	std::shared_ptr<arrow::ResizableBuffer> buffer;
+	ARROW_RETURN_NOT_OK(AllocateResizableBuffer(arrow::default_memory_pool(), nbytes, &buffer));
 
-		return out;
+	ARROW_ASSIGN_OR_RAISE(int64_t bytesRead, this->ReadAt(position, nbytes, buffer->mutable_data()));
+	if(bytesRead < nbytes) {
+		ARROW_RETURN_NOT_OK(buffer->Resize(bytesRead));
 	}
+	return std::static_pointer_cast<arrow::Buffer>(buffer);
 }
 
 bool S3ReadableFile::supports_zero_copy() const { return false; }
@@ -9,9 +9,12 @@
 
 #include "arrow/io/interfaces.h"
 #include "arrow/status.h"
+#include <memory>
 #include <aws/core/utils/memory/stl/AWSString.h>
 #include <aws/s3/S3Client.h>
 
+#include "RangeReader.h"
+
 class S3ReadableFile : public arrow::io::RandomAccessFile {
 public:
 	S3ReadableFile(std::shared_ptr<Aws::S3::S3Client> s3Client, std::string bucket, std::string key);
@@ -44,6 +47,7 @@ private:
 	std::string key;
 	size_t position;
 	bool valid;
+	std::unique_ptr<RangeReader> reader;
 
 	ARROW_DISALLOW_COPY_AND_ASSIGN(S3ReadableFile);
 };
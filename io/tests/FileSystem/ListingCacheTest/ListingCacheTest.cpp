@@ -0,0 +1,133 @@
+#include <algorithm>
+#include <cstdio>
+#include <cstdlib>
+#include <fstream>
+#include <string>
+#include <sys/stat.h>
+#include <unistd.h>
+
+#include "gtest/gtest.h"
+
+#include "FileSystem/FileSystemManager.h"
+
+// BEGIN test classes
+
+class ListingCacheTest : public testing::Test {
+protected:
+	virtual void SetUp() {
+		char folderTemplate[] = "/tmp/ListingCacheTestXXXXXX";
+		folder = mkdtemp(folderTemplate);
+		fileSystemManager.setListingCacheTtl(60);
+		createFile("a.csv");
+		createFile("b.csv");
+	}
+
+	virtual void TearDown() {
+		for(const std::string & name : {"a.csv", "b.csv", "c.csv"}) {
+			std::remove((folder + "/" + name).c_str());
+		}
+		rmdir((folder + "/d").c_str());
+		rmdir(folder.c_str());
+	}
+
+	void createFile(const std::string & name) { std::ofstream(folder + "/" + name) << "1,2\n"; }
+
+protected:
+	FileSystemManager fileSystemManager;
+	std::string folder;
+};
+
+// END test classes
+
+// BEGIN tests
+
+TEST_F(ListingCacheTest, ListingsAreCachedUntilInvalidated) {
+	const Uri uri(folder + "/");
+
+	EXPECT_EQ(fileSystemManager.list(uri).size(), 2);
+	createFile("c.csv");
+	EXPECT_EQ(fileSystemManager.list(uri).size(), 2);
+
+	fileSystemManager.invalidateListingCache(folder);
+	EXPECT_EQ(fileSystemManager.list(uri).size(), 3);
+}
+
+TEST_F(ListingCacheTest, WildcardsAreCachedSeparately) {
+	const Uri uri(folder + "/");
+
+	EXPECT_EQ(fileSystemManager.list(uri, "a*").size(), 1);
+	EXPECT_EQ(fileSystemManager.list(uri, "*").size(), 2);
+}
+
+TEST_F(ListingCacheTest, OtherPrefixesAreKept) {
+	const Uri uri(folder + "/");
+
+	EXPECT_EQ(fileSystemManager.list(uri).size(), 2);
+	createFile("c.csv");
+
+	fileSystemManager.invalidateListingCache("/some/other/folder");
+	EXPECT_EQ(fileSystemManager.list(uri).size(), 2);
+}
+
+TEST_F(ListingCacheTest, StatusListingsHaveTheTypesAndAreCached) {
+	const Uri uri(folder + "/");
+	mkdir((folder + "/d").c_str(), 0755);
+
+	std::vector<FileStatus> statuses = fileSystemManager.listStatuses(uri);
+	EXPECT_EQ(statuses.size(), 3);
+	EXPECT_EQ(std::count_if(statuses.begin(), statuses.end(), [](const FileStatus & status) {
+		return status.isDirectory();
+	}), 1);
+
+	createFile("c.csv");
+	EXPECT_EQ(fileSystemManager.listStatuses(uri).size(), 3);
+	fileSystemManager.invalidateListingCache(folder);
+	EXPECT_EQ(fileSystemManager.listStatuses(uri).size(), 4);
+}
+
+TEST_F(ListingCacheTest, MissingPathsAreNotCached) {
+	const Uri uri(folder + "/c.csv");
+
+	EXPECT_FALSE(fileSystemManager.exists(uri));
+	createFile("c.csv");
+	EXPECT_TRUE(fileSystemManager.exists(uri));
+}
+
+TEST_F(ListingCacheTest, WritesInvalidateTheParentListing) {
+	const Uri uri(folder + "/");
+
+	EXPECT_EQ(fileSystemManager.list(uri).size(), 2);
+	EXPECT_TRUE(fileSystemManager.openWriteable(Uri(folder + "/c.csv"))->Close().ok());
+
+	EXPECT_EQ(fileSystemManager.list(uri).size(), 3);
+}
+
+TEST_F(ListingCacheTest, UncachedStatusesAreRead) {
+	const Uri uri(folder + "/a.csv");
+
+	EXPECT_EQ(fileSystemManager.getFileStatus(uri).getFileSize(), 4);
+	std::ofstream(folder + "/a.csv", std::ios::app) << "3,4\n";
+	EXPECT_EQ(fileSystemManager.getFileStatus(uri).getFileSize(), 4);
+	EXPECT_EQ(fileSystemManager.getFileStatus(uri, false).getFileSize(), 8);
+}
+
+TEST_F(ListingCacheTest, TheCacheIsDisabledByDefault) {
+	FileSystemManager defaultFileSystemManager;
+	const Uri uri(folder + "/");
+
+	EXPECT_EQ(defaultFileSystemManager.getListingCacheTtl(), 0);
+	EXPECT_EQ(defaultFileSystemManager.list(uri).size(), 2);
+	createFile("c.csv");
+	EXPECT_EQ(defaultFileSystemManager.list(uri).size(), 3);
+}
+
+TEST_F(ListingCacheTest, ZeroTtlDisablesTheCache) {
+	const Uri uri(folder + "/");
+	fileSystemManager.setListingCacheTtl(0);
+
+	EXPECT_EQ(fileSystemManager.list(uri).size(), 2);
+	createFile("c.csv");
+	EXPECT_EQ(fileSystemManager.list(uri).size(), 3);
+}
+
+// END tests
@@ -0,0 +1,128 @@
+#include <cstdint>
+#include <cstdio>
+#include <cstring>
+#include <memory>
+#include <string>
+#include <unistd.h>
+#include <vector>
+
+#include "gtest/gtest.h"
+
+#include "arrow/buffer.h"
+
+#include "FileSystem/private/MemoryMappedReadableFile.h"
+
+// BEGIN test classes
+
+// writes a temporary file with known contents for each test
+class MemoryMappedReadableFileTest : public testing::Test {
+protected:
+	virtual void SetUp() {
+		char name[] = "/tmp/MemoryMappedReadableFileTestXXXXXX";
+		const int fd = mkstemp(name);
+		ASSERT_NE(fd, -1);
+		path = name;
+
+		contents.resize(3 * 1024 * 1024 + 123);
+		for(size_t i = 0; i < contents.size(); i++) {
+			contents[i] = (uint8_t)(i * 31 + 7);
+		}
+		ASSERT_EQ(write(fd, contents.data(), contents.size()), (ssize_t) contents.size());
+		close(fd);
+	}
+
+	virtual void TearDown() { std::remove(path.c_str()); }
+
+	std::shared_ptr<MemoryMappedReadableFile> open() {
+		auto file = MemoryMappedReadableFile::Open(path);
+		EXPECT_TRUE(file.ok());
+		return file.ValueOrDie();
+	}
+
+protected:
+	std::string path;
+	std::vector<uint8_t> contents;
+};
+
+// END test classes
+
+// BEGIN tests
+
+TEST_F(MemoryMappedReadableFileTest, ReadsTheWholeFile) {
+	std::shared_ptr<MemoryMappedReadableFile> file = open();
+
+	EXPECT_TRUE(file->supports_zero_copy());
+	EXPECT_EQ(file->GetSize().ValueOrDie(), (int64_t) contents.size());
+
+	std::shared_ptr<arrow::Buffer> buffer = file->Read(contents.size() + 10).ValueOrDie();
+	ASSERT_EQ(buffer->size(), (int64_t) contents.size());
+	EXPECT_EQ(std::memcmp(buffer->data(), contents.data(), contents.size()), 0);
+	EXPECT_EQ(file->Tell().ValueOrDie(), (int64_t) contents.size());
+	EXPECT_EQ(file->Read(10).ValueOrDie()->size(), 0);
+}
+
+TEST_F(MemoryMappedReadableFileTest, ReadsMoveThePosition) {
+	std::shared_ptr<MemoryMappedReadableFile> file = open();
+	std::vector<uint8_t> out(1000);
+
+	ASSERT_TRUE(file->Seek(5000).ok());
+	EXPECT_EQ(file->Read(1000, out.data()).ValueOrDie(), 1000);
+	EXPECT_EQ(std::memcmp(out.data(), contents.data() + 5000, 1000), 0);
+	EXPECT_EQ(file->Read(1000, out.data()).ValueOrDie(), 1000);
+	EXPECT_EQ(std::memcmp(out.data(), contents.data() + 6000, 1000), 0);
+	EXPECT_EQ(file->Tell().ValueOrDie(), 7000);
+}
+
+TEST_F(MemoryMappedReadableFileTest, ReadAtIsPartialAtTheEnd) {
+	std::shared_ptr<MemoryMappedReadableFile> file = open();
+	const int64_t size = contents.size();
+	std::vector<uint8_t> out(1000);
+
+	EXPECT_EQ(file->ReadAt(size - 500, 1000, out.data()).ValueOrDie(), 500);
+	EXPECT_EQ(std::memcmp(out.data(), contents.data() + size - 500, 500), 0);
+	EXPECT_EQ(file->ReadAt(size + 10, 1000).ValueOrDie()->size(), 0);
+	EXPECT_FALSE(file->ReadAt(-1, 10).ok());
+	// ReadAt doesn't move the position
+	EXPECT_EQ(file->Tell().ValueOrDie(), 0);
+}
+
+TEST_F(MemoryMappedReadableFileTest, BuffersOutliveTheFile) {
+	std::shared_ptr<MemoryMappedReadableFile> file = open();
+
+	std::shared_ptr<arrow::Buffer> buffer = file->ReadAt(4097, 100000).ValueOrDie();
+	ASSERT_TRUE(file->Close().ok());
+	file.reset();
+
+	EXPECT_EQ(std::memcmp(buffer->data(), contents.data() + 4097, 100000), 0);
+}
+
+TEST_F(MemoryMappedReadableFileTest, ClosedFilesCanNotBeRead) {
+	std::shared_ptr<MemoryMappedReadableFile> file = open();
+
+	ASSERT_TRUE(file->Close().ok());
+
+	EXPECT_TRUE(file->closed());
+	EXPECT_FALSE(file->ReadAt(0, 10).ok());
+	EXPECT_FALSE(file->GetSize().ok());
+}
+
+TEST_F(MemoryMappedReadableFileTest, WillNeedAcceptsUnalignedRanges) {
+	std::shared_ptr<MemoryMappedReadableFile> file = open();
+
+	EXPECT_TRUE(file->WillNeed({{1, 10}, {70000, 1024 * 1024}, {(int64_t) contents.size() - 5, 100}}).ok());
+}
+
+TEST_F(MemoryMappedReadableFileTest, EmptyFilesCanBeRead) {
+	std::FILE * truncated = std::fopen(path.c_str(), "w");
+	std::fclose(truncated);
+	std::shared_ptr<MemoryMappedReadableFile> file = open();
+
+	EXPECT_EQ(file->GetSize().ValueOrDie(), 0);
+	EXPECT_EQ(file->Read(10).ValueOrDie()->size(), 0);
+}
+
+TEST_F(MemoryMappedReadableFileTest, MissingFilesFailToOpen) {
+	EXPECT_FALSE(MemoryMappedReadableFile::Open(path + ".missing").ok());
+}
+
+// END tests
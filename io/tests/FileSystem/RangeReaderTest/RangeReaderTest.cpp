@@ -0,0 +1,187 @@
+#include <algorithm>
+#include <cstdint>
+#include <cstring>
+#include <memory>
+#include <utility>
+#include <vector>
+
+#include "gtest/gtest.h"
+
+#include "FileSystem/private/RangeReader.h"
+
+// BEGIN test classes
+
+// in memory stand-in for an object store, it records the requests and can fail the first ones
+class RangeReaderTest : public testing::Test {
+protected:
+	virtual void SetUp() {
+		object.resize(8 * 1024 * 1024);
+		for(size_t i = 0; i < object.size(); i++) {
+			object[i] = (uint8_t)(i * 31 + 7);
+		}
+		failures = 0;
+		retryable = true;
+
+		options.minRequestSize = 64 * 1024;
+		options.readAheadSize = 1024 * 1024;
+		options.holeSize = 128 * 1024;
+		options.tailSize = 16 * 1024;
+		options.cacheSize = 4 * 1024 * 1024;
+		options.maxRetries = 3;
+		options.baseBackoffMs = 1;
+		options.maxBackoffMs = 2;
+	}
+
+	virtual void TearDown() {}
+
+	std::unique_ptr<RangeReader> makeReader() {
+		auto fetch = [this](int64_t position, int64_t nbytes, uint8_t * out, bool & retryable) {
+			requests.push_back(std::make_pair(position, nbytes));
+			if(failures > 0) {
+				failures--;
+				retryable = this->retryable;
+				return (int64_t) -1;
+			}
+			int64_t count = std::min<int64_t>(nbytes, object.size() - position);
+			std::memcpy(out, object.data() + position, count);
+			return count;
+		};
+		auto size = [this]() { return (int64_t) object.size(); };
+		return std::unique_ptr<RangeReader>(new RangeReader(fetch, size, options));
+	}
+
+	void checkRead(RangeReader & reader, int64_t position, int64_t nbytes) {
+		std::vector<uint8_t> buffer(nbytes);
+		ASSERT_EQ(reader.readAt(position, nbytes, buffer.data()), nbytes);
+		ASSERT_EQ(std::memcmp(buffer.data(), object.data() + position, nbytes), 0);
+	}
+
+protected:
+	std::vector<uint8_t> object;
+	std::vector<std::pair<int64_t, int64_t>> requests;
+	int failures;
+	bool retryable;
+	RangeReader::Options options;
+};
+
+// END test classes
+
+// BEGIN tests
+
+TEST_F(RangeReaderTest, SmallNearbyReadsAreCoalesced) {
+	std::unique_ptr<RangeReader> reader = makeReader();
+
+	checkRead(*reader, 1000, 100);
+	checkRead(*reader, 2000, 100);
+	checkRead(*reader, 1500, 300);
+	checkRead(*reader, 60 * 1024, 1024);
+
+	EXPECT_EQ(requests.size(), 1);
+	EXPECT_EQ(requests[0].first, 1000);
+	EXPECT_EQ(requests[0].second, options.minRequestSize);
+}
+
+TEST_F(RangeReaderTest, SequentialReadsReadAhead) {
+	std::unique_ptr<RangeReader> reader = makeReader();
+
+	// the column chunks of three columns, skipping the ones in between
+	checkRead(*reader, 0, 100 * 1024);
+	checkRead(*reader, 150 * 1024, 100 * 1024);
+	checkRead(*reader, 300 * 1024, 100 * 1024);
+	checkRead(*reader, 450 * 1024, 100 * 1024);
+
+	EXPECT_EQ(requests.size(), 2);
+	EXPECT_EQ(requests[1].first, 150 * 1024);
+	EXPECT_EQ(requests[1].second, options.readAheadSize);
+}
+
+TEST_F(RangeReaderTest, FooterReadsFetchTheTail) {
+	std::unique_ptr<RangeReader> reader = makeReader();
+	const int64_t size = object.size();
+
+	// parquet reads the footer length and magic number, then the footer
+	checkRead(*reader, size - 8, 8);
+	checkRead(*reader, size - 2000, 1992);
+
+	EXPECT_EQ(reader->getSize(), size);
+	EXPECT_EQ(requests.size(), 1);
+	EXPECT_EQ(requests[0].first, size - options.tailSize);
+	EXPECT_EQ(requests[0].second, options.tailSize);
+}
+
+TEST_F(RangeReaderTest, ReadsArePartialAtTheEnd) {
+	std::unique_ptr<RangeReader> reader = makeReader();
+	const int64_t size = object.size();
+
+	std::vector<uint8_t> buffer(1000);
+	EXPECT_EQ(reader->readAt(size - 500, 1000, buffer.data()), 500);
+	EXPECT_EQ(std::memcmp(buffer.data(), object.data() + size - 500, 500), 0);
+	EXPECT_EQ(reader->readAt(size + 10, 1000, buffer.data()), 0);
+}
+
+TEST_F(RangeReaderTest, CachedRangesAreNotFetchedAgain) {
+	std::unique_ptr<RangeReader> reader = makeReader();
+
+	checkRead(*reader, 3 * 1024 * 1024, 1000);
+	requests.clear();
+	// the first bytes are fetched, the rest comes from the cached range
+	checkRead(*reader, 3 * 1024 * 1024 - 10 * 1024, 20 * 1024);
+
+	EXPECT_EQ(requests.size(), 1);
+	EXPECT_EQ(requests[0].second, 10 * 1024);
+}
+
+TEST_F(RangeReaderTest, TransientFailuresAreRetried) {
+	std::unique_ptr<RangeReader> reader = makeReader();
+	failures = 2;
+
+	checkRead(*reader, 5000, 100);
+
+	EXPECT_EQ(requests.size(), 3);
+	EXPECT_EQ(reader->getRequestCount(), 3);
+}
+
+TEST_F(RangeReaderTest, PermanentFailuresAreNotRetried) {
+	std::unique_ptr<RangeReader> reader = makeReader();
+	failures = 1;
+	retryable = false;
+
+	std::vector<uint8_t> buffer(100);
+	EXPECT_EQ(reader->readAt(5000, 100, buffer.data()), -1);
+	EXPECT_EQ(requests.size(), 1);
+}
+
+TEST_F(RangeReaderTest, RetriesAreBounded) {
+	std::unique_ptr<RangeReader> reader = makeReader();
+	failures = 100;
+
+	std::vector<uint8_t> buffer(100);
+	EXPECT_EQ(reader->readAt(5000, 100, buffer.data()), -1);
+	EXPECT_EQ(requests.size(), options.maxRetries + 1);
+}
+
+TEST_F(RangeReaderTest, CacheStaysWithinBudget) {
+	options.cacheSize = 1024 * 1024;
+	std::unique_ptr<RangeReader> reader = makeReader();
+
+	// random reads over the whole object, each one fetches a new range
+	for(int64_t position = 0; position < (int64_t) object.size() - 1000; position += 200 * 1024) {
+		checkRead(*reader, position, 1000);
+	}
+	const size_t firstPassRequests = requests.size();
+	checkRead(*reader, 0, 1000);
+
+	// the first ranges were evicted to make room for the last ones
+	EXPECT_EQ(requests.size(), firstPassRequests + 1);
+}
+
+TEST_F(RangeReaderTest, LargeReadsBypassTheCache) {
+	std::unique_ptr<RangeReader> reader = makeReader();
+
+	checkRead(*reader, 0, 6 * 1024 * 1024);
+
+	EXPECT_EQ(requests.size(), 1);
+	EXPECT_EQ(requests[0].second, 6 * 1024 * 1024);
+}
+
+// END tests
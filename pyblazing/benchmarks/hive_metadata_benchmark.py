@@ -0,0 +1,69 @@
+"""
+Micro-benchmark of the metadata construction done by create_table for a
+partitioned (Hive) table.
+
+It builds a synthetic table with 200k partitions, without HiveServer2 nor
+files on disk, and times the steps that depend on the number of partitions:
+parsing the output of 'show partitions', mapping files to their partition
+values and building the partition min/max metadata.
+
+Usage:
+    python hive_metadata_benchmark.py [num_partitions]
+"""
+
+import sys
+import time
+from types import SimpleNamespace
+
+from pyblazing.apiv2.context import get_uri_values, parseHiveMetadata
+from pyblazing.apiv2.hive import parsePartitions
+
+
+def make_partition_rows(num_partitions):
+    rows = []
+    for i in range(num_partitions):
+        year = 2000 + i % 20
+        month = 1 + (i // 20) % 12
+        day = 1 + (i // 240) % 28
+        city = "city" + str(i // 6720)
+        rows.append(
+            (
+                "year=%d/month=%d/dt=%d-%02d-%02d/city=%s"
+                % (year, month, year, month, day, city),
+            )
+        )
+    return rows
+
+
+def timed(label, function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    print("%-24s %8.3f s" % (label, time.perf_counter() - start))
+    return result
+
+
+def main():
+    num_partitions = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    location = "/data/warehouse/synthetic"
+
+    # cudf type ids: 4 INT64, 3 INT32, 14 TIMESTAMP_MILLISECONDS, 23 STRING
+    columns = [("value", 4, False), ("year", 3, True), ("month", 3, True)]
+    columns = columns + [("dt", 14, True), ("city", 23, True)]
+    schema = {"columns": columns}
+    table = SimpleNamespace(
+        column_names=[name.encode() for name, dtype, partition in columns],
+        column_types=[dtype for name, dtype, partition in columns],
+    )
+
+    rows = make_partition_rows(num_partitions)
+    print("partitions: " + str(num_partitions))
+
+    partitions = timed("parsePartitions", parsePartitions, rows, schema)
+    files = [(location + "/" + row[0] + "/part-0.parquet").encode() for row in rows]
+    uri_values = timed("get_uri_values", get_uri_values, files, partitions, location)
+    metadata = timed("parseHiveMetadata", parseHiveMetadata, table, uri_values)
+    print("metadata shape: " + str(metadata.shape))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark of scans over large local CSV and Parquet files, read with and
+without memory mapping.
+
+It writes a table with num_rows rows (a few GB of CSV with the default) as
+CSV and as Parquet in a directory, registers that directory twice with
+localfs, once with mmap=True, and times the same scans over both. The files
+are read once before timing, so both are measured with the files in the page
+cache, where the memory mapping saves the copies of the read calls.
+
+Usage:
+    python local_mmap_benchmark.py [directory] [num_rows]
+"""
+
+import os
+import sys
+import time
+
+import cudf
+import numpy as np
+
+from blazingsql import BlazingContext
+
+QUERIES = [
+    "select sum(c0), min(c1), max(c2) from {table}",
+    "select c0, count(*) from {table} where c1 > 0.5 group by c0",
+]
+
+
+def write_files(directory, num_rows):
+    frame = cudf.DataFrame(
+        {
+            "c0": np.random.randint(0, 1000, num_rows),
+            "c1": np.random.random(num_rows),
+            "c2": np.random.random(num_rows),
+            "c3": np.random.random(num_rows),
+        }
+    )
+    frame.to_csv(os.path.join(directory, "table.csv"), index=False)
+    frame.to_parquet(os.path.join(directory, "table.parquet"))
+
+
+def timed_query(bc, query, repetitions):
+    # the first run also plans the query and loads the file in the page cache
+    bc.sql(query)
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        bc.sql(query)
+    return (time.perf_counter() - start) / repetitions
+
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) > 1 else "/tmp/local_mmap_benchmark"
+    num_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 50000000
+    repetitions = 3
+
+    os.makedirs(directory, exist_ok=True)
+    write_files(directory, num_rows)
+
+    bc = BlazingContext()
+    bc.localfs("plain", root=directory)
+    bc.localfs("mapped", root=directory, mmap=True)
+    for file_format in ["csv", "parquet"]:
+        size = os.path.getsize(os.path.join(directory, "table." + file_format))
+        print("%s: %.2f GB" % (file_format, size / 1e9))
+        for prefix in ["plain", "mapped"]:
+            path = "file://" + prefix + "/table." + file_format
+            bc.create_table(prefix + "_" + file_format, path)
+
+    for file_format in ["csv", "parquet"]:
+        size = os.path.getsize(os.path.join(directory, "table." + file_format))
+        for query in QUERIES:
+            print(query.format(table="<" + file_format + " table>"))
+            for prefix in ["plain", "mapped"]:
+                table = prefix + "_" + file_format
+                query_time = timed_query(bc, query.format(table=table), repetitions)
+                throughput = size / query_time / 1e9
+                print("    %-8s %8.3f s %8.2f GB/s" % (prefix, query_time, throughput))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark of queries over a wide in memory table that read only a few of
+its columns.
+
+It creates a cudf table with 500 columns and the same table with only the 3
+columns the queries use, and times each query over both. With projection
+pushdown only the scanned columns are given to the engine, so the times over
+the wide table should be close to the ones over the narrow table.
+
+Usage:
+    python projection_pushdown_benchmark.py [num_rows] [num_columns]
+"""
+
+import sys
+import time
+
+import cudf
+import numpy as np
+
+from blazingsql import BlazingContext
+
+QUERIES = [
+    "select sum(c0), min(c1), max(c2) from {table}",
+    "select c0, c1 from {table} where c2 > 0.5",
+    "select c0, count(*) from {table} group by c0",
+]
+
+
+def make_frame(num_rows, num_columns):
+    data = {"c0": np.random.randint(0, 1000, num_rows)}
+    for i in range(1, num_columns):
+        data["c" + str(i)] = np.random.random(num_rows)
+    return cudf.DataFrame(data)
+
+
+def timed_query(bc, query, repetitions):
+    # the first run also plans the query
+    bc.sql(query)
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        bc.sql(query)
+    return (time.perf_counter() - start) / repetitions
+
+
+def main():
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    num_columns = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    repetitions = 5
+
+    bc = BlazingContext()
+    wide = make_frame(num_rows, num_columns)
+    bc.create_table("wide", wide)
+    bc.create_table("narrow", wide[["c0", "c1", "c2"]])
+    print("rows: " + str(num_rows) + ", columns: " + str(num_columns))
+
+    for query in QUERIES:
+        wide_time = timed_query(bc, query.format(table="wide"), repetitions)
+        narrow_time = timed_query(bc, query.format(table="narrow"), repetitions)
+        print(query.format(table="<table>"))
+        print("    %-8s %8.3f s" % ("wide", wide_time))
+        print("    %-8s %8.3f s" % ("narrow", narrow_time))
+
+
+if __name__ == "__main__":
+    main()
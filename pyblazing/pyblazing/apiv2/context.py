@@ -5,16 +5,27 @@ from collections import OrderedDict
 
 from urllib.parse import urlparse
 
-from threading import Lock
+from threading import Condition, Lock
 from weakref import ref
+from concurrent.futures import ThreadPoolExecutor
 from pyblazing.apiv2.filesystem import FileSystem
 from pyblazing.apiv2 import DataType
 
 import json
+import copy
+import asyncio
 import collections
+import functools
+import hashlib
+import heapq
+import itertools
+import datetime
+import re
+import tempfile
 
 from pyhive import hive
 from .hive import (
+    HiveMetadataCache,
     convertTypeNameStrToCudfType,
     getFolderListFromPartitions,
     getPartitionsFromUserPartitions,
@@ -27,6 +38,7 @@ import os
 import pandas
 import numpy as np
 import pyarrow
+import pyarrow.ipc
 from pathlib import PurePath
 import cio
 import dask_cudf
@@ -232,8 +244,10 @@ def collectPartitionsRunQuery(
         ):  # this is a dask cudf table
             if len(tables[table_index].partition_keys) > 0:
                 tables[table_index].input = []
+                # only the columns of the table scan, see getScanProjection
+                column_names = tables[table_index].column_names
                 for key in tables[table_index].partition_keys:
-                    tables[table_index].input.append(worker.data[key])
+                    tables[table_index].input.append(worker.data[key][column_names])
 
     try:
         dfs = cio.runQueryCaller(
@@ -320,31 +334,20 @@ def mergeTableScans(tableScanInfo):
     return table_columns
 
 
-def modifyAlgebraForDataframesWithOnlyWantedColumns(
-    algebra, tableScanInfo, originalTables
-):
-    for table_name in tableScanInfo:
-        # TODO: handle situation with multiple tables being joined twice
-        if originalTables[table_name].fileType == DataType.ARROW:
-            orig_scan = tableScanInfo[table_name]["table_scans"][0]
-            orig_col_indexes = tableScanInfo[table_name]["table_columns"][0]
-            merged_col_indexes = list(range(len(orig_col_indexes)))
-
-            new_col_indexes = []
-            if len(merged_col_indexes) > 0:
-                if orig_col_indexes == merged_col_indexes:
-                    new_col_indexes = list(range(0, len(orig_col_indexes)))
-                else:
-                    enumerated_indexes = enumerate(merged_col_indexes)
-                    for new_index, merged_col_index in enumerated_indexes:
-                        if merged_col_index in orig_col_indexes:
-                            new_col_indexes.append(new_index)
-
-            orig_project = "projects=[" + str(orig_col_indexes) + "]"
-            new_project = "projects=[" + str(new_col_indexes) + "]"
-            new_scan = orig_scan.replace(orig_project, new_project)
-            algebra = algebra.replace(orig_scan, new_scan)
-    return algebra
+def getScanProjection(table_scan, num_columns):
+    """
+    Returns the indices of the columns read by a table scan of an in memory
+    table, and the table scan rewritten to read them from a table that only
+    has those columns, in that order.
+    """
+    match = re.search(r"projects=\[\[([0-9, ]+)\]\]", table_scan)
+    if match is None:
+        # the scan reads all the columns
+        return list(range(num_columns)), table_scan
+    column_indices = [int(index) for index in match.group(1).split(",")]
+    new_projects = ", ".join(str(index) for index in range(len(column_indices)))
+    new_scan = table_scan.replace(match.group(0), "projects=[[" + new_projects + "]]")
+    return column_indices, new_scan
 
 
 def get_uri_values(files, partitions, base_folder):
@@ -362,141 +365,347 @@ def get_uri_values(files, partitions, base_folder):
     return uri_values
 
 
+# value used by hive for the partitions with a null partition column
+HIVE_NULL_PARTITION_VALUE = "__HIVE_DEFAULT_PARTITION__"
+
+
+def partitionValuesToArrow(values, dtype):
+    # converts the string values of a partition column with one vectorized
+    # conversion per column
+    if dtype == np.dtype("object"):
+        return pyarrow.array(
+            [None if v == HIVE_NULL_PARTITION_VALUE else v for v in values],
+            type=pyarrow.string(),
+        )
+
+    str_values = np.array(values, dtype=np.str_)
+    mask = str_values == HIVE_NULL_PARTITION_VALUE
+    if mask.any():
+        str_values[mask] = "0" if dtype.kind != "M" else "1970-01-01"
+    else:
+        mask = None
+
+    if dtype.kind == "M":
+        np_values = str_values.astype("datetime64[ns]").astype(dtype)
+    elif dtype == np.dtype("bool"):
+        np_values = np.isin(np.char.lower(str_values), ["true", "1"])
+    elif dtype.kind in ("i", "u", "f"):
+        try:
+            np_values = str_values.astype(dtype)
+        except ValueError:
+            try:
+                # integer partitions may have been written as floats (e.g. 1.0)
+                np_values = str_values.astype(np.float64).astype(dtype)
+            except ValueError:
+                np_values, mask = parsePartitionNumbers(str_values, dtype, mask)
+    else:
+        np_values = str_values.astype(dtype)
+    return pyarrow.array(np_values, mask=mask)
+
+
+_leading_number_re = re.compile(r"\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)")
+
+
+def parsePartitionNumbers(str_values, dtype, mask):
+    # parses the values one by one keeping the leading number of a malformed
+    # value, like np.fromstring did. Values without a number are null
+    np_values = np.zeros(len(str_values), dtype=dtype)
+    invalid = np.zeros(len(str_values), dtype=np.bool_)
+    for i, value in enumerate(str_values):
+        match = _leading_number_re.match(str(value))
+        if match is None:
+            print("ERROR: could not parse the partition value " + str(value))
+            invalid[i] = True
+        else:
+            np_values[i] = float(match.group(1))
+    if invalid.any():
+        mask = invalid if mask is None else mask | invalid
+    return np_values, mask
+
+
 def parseHiveMetadata(curr_table, uri_values):
-    metadata = {}
-    names = []
-    # not all columns will have hive metadata, so this vector will capture
-    # all the names that will actually be used in the end
-    final_names = []
     n_cols = len(curr_table.column_names)
+    n_files = len(uri_values)
 
     dtypes = [cio.cudf_type_int_to_np_types(t) for t in curr_table.column_types]
 
     columns = [name.decode() for name in curr_table.column_names]
-    for index in range(n_cols):
-        col_name = columns[index]
-        names.append("min_" + str(index) + "_" + col_name)
-        names.append("max_" + str(index) + "_" + col_name)
+    column_indices = {col_name: index for index, col_name in enumerate(columns)}
 
-    names.append("file_handle_index")
-    names.append("row_group_index")
-    minmax_metadata_table = [[] for _ in range(2 * n_cols + 2)]
+    # group the partition values per column, so that each column is
+    # converted at once
     table_partition = {}
-    for file_index, uri_value in enumerate(uri_values):
-        for index, [col_name, col_value_id] in enumerate(uri_value):
-            if col_name in columns:
-                col_index = columns.index(col_name)
-            else:
+    for uri_value in uri_values:
+        for col_name, col_value_id in uri_value:
+            if col_name not in column_indices:
                 print(
                     "ERROR: could not find partition column name "
                     + str(col_name)
                     + " in table names"
                 )
-            if dtypes[col_index] == np.dtype("object"):
-                np_col_value = col_value_id
-            elif (
-                dtypes[col_index] == np.dtype("datetime64[s]")
-                or dtypes[col_index] == np.dtype("datetime64[ms]")
-                or dtypes[col_index] == np.dtype("datetime64[us]")
-                or dtypes[col_index] == np.dtype("datetime64[ns]")
-            ):
-                np_col_value = np.datetime64(col_value_id)
-            else:
-                np_col_value = np.fromstring(col_value_id, dtypes[col_index], sep=" ")[
-                    0
-                ]
+                continue
+            table_partition.setdefault(col_name, []).append(col_value_id)
 
-            table_partition.setdefault(col_name, []).append(np_col_value)
-        minmax_metadata_table[len(minmax_metadata_table) - 2].append(file_index)
-        # this assumes that you only have one row group per partitioned file
-        # but is addressed in the mergeMetadata function, where you will have
-        # information about how many rowgroups per file and you can expand
-        # the hive metadata accordingly
-        minmax_metadata_table[len(minmax_metadata_table) - 1].append(
-            0
-        )  # this is the rowgroup index
+    # not all columns will have hive metadata, so these will capture
+    # only the columns that will actually be used in the end
+    final_names = []
+    arrays = []
     for index in range(n_cols):
         col_name = columns[index]
         if col_name in table_partition:
             col_value_ids = table_partition[col_name]
-            minmax_metadata_table[2 * index] = col_value_ids
-            minmax_metadata_table[2 * index + 1] = col_value_ids
+            if len(col_value_ids) != n_files:
+                print(
+                    "ERROR: partition column "
+                    + str(col_name)
+                    + " does not have a value for every file"
+                )
+                continue
+            # partitions have a single value per file, so min and max are
+            # the same values
+            values = partitionValuesToArrow(col_value_ids, dtypes[index])
+            arrays.append(values)
+            arrays.append(values)
+            final_names.append("min_" + str(index) + "_" + col_name)
+            final_names.append("max_" + str(index) + "_" + col_name)
+
+    arrays.append(pyarrow.array(np.arange(n_files, dtype=np.int32)))
+    final_names.append("file_handle_index")
+    # this assumes that you only have one row group per partitioned file
+    # but is addressed in the mergeMetadata function, where you will have
+    # information about how many rowgroups per file and you can expand
+    # the hive metadata accordingly
+    arrays.append(pyarrow.array(np.zeros(n_files, dtype=np.int32)))
+    final_names.append("row_group_index")
+
+    return cudf.DataFrame.from_arrow(pyarrow.Table.from_arrays(arrays, final_names))
+
+
+def get_table_statistics(table):
+    """
+    Computes table level statistics used by the relational algebra planner.
+
+    Returns a tuple (row_count, column_statistics) where column_statistics has
+    one (min, max, null_count, distinct_count, distinct_count_exact) tuple per
+    column. Unknown values are None. Statistics come from the file metadata
+    (row group min/max, null counts and number of rows) or from the data itself
+    for in memory tables. The distinct counts are upper bounds, so
+    distinct_count_exact is False and the planner doesn't infer unique keys
+    from them.
+    """
+    n_cols = len(table.column_names)
+    unknown = [(None, None, None, None, False)] * n_cols
+
+    if table.fileType == DataType.CUDF:
+        return len(table.input), unknown
+    if table.fileType == DataType.ARROW:
+        return table.arrow_table.num_rows, unknown
+    if not table.has_metadata():
+        return None, unknown
+
+    metadata = table.metadata
+    if isinstance(metadata, dask_cudf.core.DataFrame):
+        metadata = metadata.compute()
+    metadata_names = set(metadata._data.keys())
+    if "num_rows" not in metadata_names:
+        return None, unknown
+    row_count = float(metadata["num_rows"].sum())
+
+    def to_number(col):
+        if np.issubdtype(col.dtype, np.datetime64):
+            col = col.astype("int64")
+        elif col.dtype == np.bool_:
+            col = col.astype("int8")
+        elif not np.issubdtype(col.dtype, np.number):
+            return None
+        return col
+
+    column_statistics = []
+    for index, name in enumerate(table.column_names):
+        if isinstance(name, bytes):
+            name = name.decode()
+        suffix = str(index) + "_" + name
+        min_value = None
+        max_value = None
+        null_count = None
+        distinct_count = None
+        if "min_" + suffix in metadata_names and "max_" + suffix in metadata_names:
+            min_col = to_number(metadata["min_" + suffix])
+            max_col = to_number(metadata["max_" + suffix])
+            if min_col is not None and max_col is not None:
+                min_value = float(min_col.min())
+                max_value = float(max_col.max())
+                is_discrete = not np.issubdtype(min_col.dtype, np.floating)
+                if is_discrete:
+                    # the value range is an upper bound for the number of
+                    # distinct values of integer like columns
+                    value_range = max_value - min_value + 1
+                    distinct_count = min(row_count, value_range)
+        if "null_count_" + suffix in metadata_names:
+            null_counts = metadata["null_count_" + suffix]
+            # -1 means the file did not have null count statistics
+            if null_counts.min() >= 0:
+                null_count = int(null_counts.sum())
+        column_statistics.append(
+            (min_value, max_value, null_count, distinct_count, False)
+        )
 
-    series = []
-    for index in range(n_cols):
-        col_name = columns[index]
-        if col_name in table_partition:
-            if (
-                dtypes[index] == np.dtype("datetime64[s]")
-                or dtypes[index] == np.dtype("datetime64[ms]")
-                or dtypes[index] == np.dtype("datetime64[us]")
-                or dtypes[index] == np.dtype("datetime64[ns]")
+    return row_count, column_statistics
+
+
+def parseMetadataWithCache(
+    files,
+    offset,
+    schema,
+    file_format_hint,
+    kwargs,
+    footer_reader_threads=16,
+    footer_reader_retries=2,
+    cache_dir=None,
+):
+    """
+    Parses the metadata of the files like cio.parseMetadataCaller. When a
+    cache_dir is given, the metadata of each file is stored there and reused
+    while the file keeps the same uri, size and modification time, so the
+    footers of an unchanged file are read only once.
+    """
+
+    def parse(file_list, file_offset):
+        return cio.parseMetadataCaller(
+            file_list,
+            file_offset,
+            schema,
+            file_format_hint,
+            kwargs,
+            footer_reader_threads,
+            footer_reader_retries,
+        )
+
+    if cache_dir is None or len(files) == 0:
+        return parse(files, offset)
+
+    schema_key = [
+        [str(name) for name in schema["names"]],
+        [int(dtype) for dtype in schema["types"]],
+        file_format_hint,
+    ]
+    statuses = cio.getFileStatusesCaller(files, footer_reader_threads)
+    paths = []
+    for file, (size, mtime) in zip(files, statuses):
+        if mtime == 0:
+            # unknown modification time, the metadata is not cached
+            paths.append(None)
+            continue
+        key = json.dumps([file, size, mtime, schema_key])
+        key = hashlib.sha1(key.encode()).hexdigest()
+        paths.append(os.path.join(cache_dir, key + ".arrow"))
+
+    pieces = [None] * len(files)
+    for i, path in enumerate(paths):
+        if path is not None and os.path.isfile(path):
+            try:
+                with pyarrow.OSFile(path, "rb") as source:
+                    pieces[i] = pyarrow.ipc.open_file(source).read_all()
+            except (OSError, pyarrow.ArrowException):
+                pieces[i] = None
+            # empty pieces, or pieces written with an older layout, are parsed
+            # again
+            if pieces[i] is not None and (
+                pieces[i].num_rows == 0 or "num_rows" not in pieces[i].schema.names
             ):
-                # when creating a pandas series, for a datetime type,
-                # it has to be in ns because that is the only internal
-                # datetime representation
-                col1 = pandas.Series(
-                    minmax_metadata_table[2 * index],
-                    dtype=np.dtype("datetime64[ns]"),
-                    name=names[2 * index],
-                )
-                col2 = pandas.Series(
-                    minmax_metadata_table[2 * index + 1],
-                    dtype=np.dtype("datetime64[ns]"),
-                    name=names[2 * index + 1],
-                )
-            else:
-                col1 = pandas.Series(
-                    minmax_metadata_table[2 * index],
-                    dtype=dtypes[index],
-                    name=names[2 * index],
-                )
-                col2 = pandas.Series(
-                    minmax_metadata_table[2 * index + 1],
-                    dtype=dtypes[index],
-                    name=names[2 * index + 1],
-                )
-            series.append(col1)
-            series.append(col2)
-            final_names.append(names[2 * index])
-            final_names.append(names[2 * index + 1])
-    index = n_cols
-    col1 = pandas.Series(
-        minmax_metadata_table[2 * index], dtype=np.int32, name=names[2 * index]
-    )
-    col2 = pandas.Series(
-        minmax_metadata_table[2 * index + 1], dtype=np.int32, name=names[2 * index + 1]
-    )
-    final_names.append(names[2 * index])
-    final_names.append(names[2 * index + 1])
-    series.append(col1)
-    series.append(col2)
+                pieces[i] = None
+
+    missing = [i for i, piece in enumerate(pieces) if piece is None]
+    if len(missing) > 0:
+        parsed = parse([files[i] for i in missing], (0, len(missing)))
+        parsed = parsed.to_arrow(preserve_index=False)
+        file_handles = parsed.column("file_handle_index").to_pandas().values
+        os.makedirs(cache_dir, exist_ok=True)
+        for position, i in enumerate(missing):
+            pieces[i] = parsed.filter(pyarrow.array(file_handles == position))
+            # files without row groups don't have a piece of their own, their
+            # columns depend on the other files that were parsed with them
+            if paths[i] is None or pieces[i].num_rows == 0:
+                continue
+            temp_path = paths[i] + "." + str(os.getpid()) + ".tmp"
+            try:
+                with pyarrow.OSFile(temp_path, "wb") as sink:
+                    writer = pyarrow.ipc.new_file(sink, pieces[i].schema)
+                    writer.write_table(pieces[i])
+                    writer.close()
+                os.replace(temp_path, paths[i])
+            except (OSError, pyarrow.ArrowException) as e:
+                logging.warning("Could not cache parquet metadata: " + str(e))
+
+    # the columns with min/max depend on the statistics found in the files,
+    # if the cached pieces don't agree all the files are parsed again
+    if any(not piece.schema.equals(pieces[0].schema) for piece in pieces):
+        return parse(files, offset)
+
+    file_handle_column = pieces[0].schema.get_field_index("file_handle_index")
+    for i, piece in enumerate(pieces):
+        file_handles = np.full(piece.num_rows, offset[0] + i, dtype=np.int32)
+        pieces[i] = piece.set_column(
+            file_handle_column, "file_handle_index", pyarrow.array(file_handles)
+        )
+    return cudf.DataFrame.from_arrow(pyarrow.concat_tables(pieces))
+
+
+def write_arrow_file(path, arrow_table):
+    # writes an Arrow IPC file, through a temporary file so that readers never
+    # see a partially written one
+    temp_path = path + "." + str(os.getpid()) + ".tmp"
+    with pyarrow.OSFile(temp_path, "wb") as sink:
+        writer = pyarrow.ipc.new_file(sink, arrow_table.schema)
+        writer.write_table(arrow_table)
+        writer.close()
+    os.replace(temp_path, path)
+
+
+def read_arrow_file(path):
+    with pyarrow.OSFile(path, "rb") as source:
+        return pyarrow.ipc.open_file(source).read_all()
+
+
+# version of the layout of the catalogs written by BlazingContext.save_catalog
+CATALOG_FORMAT_VERSION = 1
+
+
+def names_to_json(names):
+    # the column names parsed from files are bytes, the ones of in memory or
+    # user given schemas are str
+    is_bytes = len(names) > 0 and isinstance(names[0], bytes)
+    return {
+        "names": [name.decode() if is_bytes else name for name in names],
+        "bytes": is_bytes,
+    }
+
+
+def names_from_json(value):
+    if value["bytes"]:
+        return [name.encode() for name in value["names"]]
+    return value["names"]
+
+
+def args_to_json(args):
+    # the args are given to the engine as strings, so only the values that
+    # load_catalog gets back with the same type (and string) are saved
+    def to_json(name, value):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, np.generic):
+            return to_json(name, value.item())
+        if isinstance(value, list):
+            return [to_json(name, item) for item in value]
+        raise TypeError(
+            "The argument "
+            + str(name)
+            + " of type "
+            + type(value).__name__
+            + " can not be saved to the catalog"
+        )
 
-    frame = OrderedDict((key, value) for (key, value) in zip(final_names, series))
-    metadata = cudf.DataFrame(frame)
-    for index, col_type in enumerate(dtypes):
-        min_col_name = names[2 * index]
-        max_col_name = names[2 * index + 1]
-        if (
-            dtypes[index] == np.dtype("datetime64[s]")
-            or dtypes[index] == np.dtype("datetime64[ms]")
-            or dtypes[index] == np.dtype("datetime64[us]")
-            or dtypes[index] == np.dtype("datetime64[ns]")
-        ):
-            if (min_col_name in metadata) and (max_col_name in metadata):
-                if (
-                    metadata[min_col_name].dtype != dtypes[index]
-                    or metadata[max_col_name].dtype != dtypes[index]
-                ):
-                    # here we are casting the timestamp types from ns
-                    # to their correct desired types
-                    metadata[min_col_name] = metadata[min_col_name].astype(
-                        dtypes[index]
-                    )
-                    metadata[max_col_name] = metadata[max_col_name].astype(
-                        dtypes[index]
-                    )
-    return metadata
+    return {str(name): to_json(name, value) for name, value in args.items()}
 
 
 def mergeMetadata(curr_table, fileMetadata, hiveMetadata):
@@ -530,6 +739,10 @@ def mergeMetadata(curr_table, fileMetadata, hiveMetadata):
         col_name = columns[index]
         names.append("min_" + str(index) + "_" + col_name)
         names.append("max_" + str(index) + "_" + col_name)
+    for index in range(n_cols):
+        names.append("null_count_" + str(index) + "_" + columns[index])
+    names.append("num_rows")
+    names.append("total_byte_size")
     names.append("file_handle_index")
     names.append("row_group_index")
 
@@ -629,6 +842,699 @@ def get_plan(algebra):
     return visit(new_lines)
 
 
+# splits a sql string into quoted literals/identifiers, comments and the text
+# between them, so that comments are dropped and whitespace is only collapsed
+# outside of the quotes
+_sql_quoted_re = re.compile(
+    r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|`[^`]*`|--[^\n]*|/\*.*?\*/)", re.DOTALL
+)
+_whitespace_re = re.compile(r"\s+")
+
+
+def _is_sql_comment(part):
+    return part.startswith("--") or part.startswith("/*")
+
+
+def normalize_sql(sql):
+    # the comments are removed before collapsing the newlines that end them
+    parts = _sql_quoted_re.split(sql)
+    for index in range(1, len(parts), 2):
+        if _is_sql_comment(parts[index]):
+            parts[index] = " "
+    parts = _sql_quoted_re.split("".join(parts))
+    for index in range(0, len(parts), 2):
+        # the spaces next to quoted text are kept, x 'ab' is not x'ab'
+        parts[index] = _whitespace_re.sub(" ", parts[index])
+    return "".join(parts).strip()
+
+
+class PlanCache(object):
+    """
+    LRU cache of the optimized relational algebra produced by Calcite, and of
+    the json plan derived from it with get_plan, so that repeated queries
+    don't have to go through the planner again.
+
+    Entries are keyed by the normalized sql text and the catalog version of
+    the BlazingContext, so any create_table or drop_table makes older entries
+    unreachable (they will eventually be evicted).
+    """
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.entries = OrderedDict()
+        self.lock = Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def enabled(self):
+        return self.max_size > 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses = self.misses + 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits = self.hits + 1
+            return entry
+
+    def put(self, key, algebra, plan=None):
+        if not self.enabled():
+            return
+        with self.lock:
+            self.entries[key] = {"algebra": algebra, "plan": plan}
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self.entries),
+                "max_size": self.max_size,
+            }
+
+
+def get_table_version(table, get_file_statuses):
+    """
+    Returns a value that changes when the data of the table may have changed,
+    or None when that can not be known. For in memory tables it is the
+    identity of the table and its input, for tables of files it also includes
+    the size and modification time of each file, as returned by
+    get_file_statuses for the list of paths.
+    """
+    version = [id(table), id(table.input)]
+    if table.files is not None and len(table.files) > 0:
+        files = [
+            file.decode() if isinstance(file, bytes) else str(file)
+            for file in table.files
+        ]
+        for file, (size, mtime) in zip(files, get_file_statuses(files)):
+            if mtime == 0:
+                # the filesystem doesn't report the modification time
+                return None
+            version.append((file, size, mtime))
+    return tuple(version)
+
+
+class ArrowColumnCache(object):
+    """
+    LRU cache of the cudf columns converted from arrow tables, so that the
+    columns read by a query are not converted again by the next ones. The
+    budget is in bytes of arrow data, a budget of 0 disables the cache.
+
+    Entries are keyed by table name, arrow table and column, and are
+    invalidated when the table is created again or dropped.
+    """
+
+    def __init__(self, max_bytes=0):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.lock = Lock()
+
+    def get_column(self, table_name, arrow_table, column_index):
+        key = (table_name, id(arrow_table), column_index)
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key][0]
+
+        name = arrow_table.column_names[column_index]
+        arrow_column = arrow_table.column(column_index)
+        arrow_batch = pyarrow.Table.from_arrays([arrow_column], names=[name])
+        column = cudf.DataFrame.from_arrow(arrow_batch)[name]
+        nbytes = arrow_column.nbytes
+        if nbytes > self.max_bytes:
+            return column
+
+        with self.lock:
+            if key not in self.entries:
+                self.entries[key] = (column, nbytes)
+                self.bytes = self.bytes + nbytes
+                while self.bytes > self.max_bytes:
+                    _, (_, old_nbytes) = self.entries.popitem(last=False)
+                    self.bytes = self.bytes - old_nbytes
+        return column
+
+    def invalidate(self, table_name):
+        with self.lock:
+            for key in [key for key in self.entries if key[0] == table_name]:
+                _, nbytes = self.entries.pop(key)
+                self.bytes = self.bytes - nbytes
+
+
+class ResultCache(object):
+    """
+    LRU cache of query results, kept as arrow tables in host memory and
+    spilled to local disk when the host memory budget is exceeded. Both
+    budgets are in bytes, a budget of 0 disables that level.
+
+    Entries are keyed by the plan of the query and the version of every table
+    it reads (see get_table_version), and are invalidated when one of those
+    tables is created again or dropped. Spilled results are written to unique
+    files, so several processes can share the cache directory.
+    """
+
+    def __init__(self, max_host_bytes=0, max_disk_bytes=0, cache_dir="/tmp"):
+        self.max_host_bytes = max_host_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.cache_dir = os.path.join(cache_dir, "result_cache")
+        self.host_entries = OrderedDict()
+        self.disk_entries = OrderedDict()
+        self.host_bytes = 0
+        self.disk_bytes = 0
+        self.entry_tables = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+
+    def enabled(self):
+        return self.max_host_bytes > 0 or self.max_disk_bytes > 0
+
+    def get(self, key):
+        with self.lock:
+            if key in self.host_entries:
+                self.host_entries.move_to_end(key)
+                arrow_table = self.host_entries[key]
+            elif key in self.disk_entries:
+                self.disk_entries.move_to_end(key)
+                path, nbytes = self.disk_entries[key]
+                try:
+                    with pyarrow.memory_map(path) as source:
+                        arrow_table = pyarrow.ipc.open_file(source).read_all()
+                except (OSError, pyarrow.ArrowException) as e:
+                    logging.warning("Could not read cached result: " + str(e))
+                    self._remove(key)
+                    self.misses = self.misses + 1
+                    return None
+            else:
+                self.misses = self.misses + 1
+                return None
+            self.hits = self.hits + 1
+        return cudf.DataFrame.from_arrow(arrow_table)
+
+    def put(self, key, table_names, result):
+        if not self.enabled() or not isinstance(result, cudf.DataFrame):
+            return
+        arrow_table = result.to_arrow()
+        nbytes = arrow_table.nbytes
+        with self.lock:
+            self._remove(key)
+            self.entry_tables[key] = set(table_names)
+            if nbytes <= self.max_host_bytes:
+                self.host_entries[key] = arrow_table
+                self.host_bytes = self.host_bytes + nbytes
+                while self.host_bytes > self.max_host_bytes:
+                    old_key, old_table = self.host_entries.popitem(last=False)
+                    self.host_bytes = self.host_bytes - old_table.nbytes
+                    self._spill(old_key, old_table)
+            else:
+                self._spill(key, arrow_table)
+
+    def _spill(self, key, arrow_table):
+        # must be called with self.lock acquired
+        nbytes = arrow_table.nbytes
+        if nbytes > self.max_disk_bytes:
+            self.entry_tables.pop(key, None)
+            return
+        while self.disk_bytes + nbytes > self.max_disk_bytes:
+            self._remove(next(iter(self.disk_entries)))
+        path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # the directory is shared by all the processes, the file names are
+            # made unique by mkstemp
+            fd, path = tempfile.mkstemp(prefix="result_", dir=self.cache_dir)
+            os.close(fd)
+            with pyarrow.OSFile(path, "wb") as sink:
+                writer = pyarrow.ipc.new_file(sink, arrow_table.schema)
+                writer.write_table(arrow_table)
+                writer.close()
+        except (OSError, pyarrow.ArrowException) as e:
+            logging.warning("Could not spill cached result to disk: " + str(e))
+            if path is not None:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.entry_tables.pop(key, None)
+            return
+        self.disk_entries[key] = (path, nbytes)
+        self.disk_bytes = self.disk_bytes + nbytes
+
+    def _remove(self, key):
+        # must be called with self.lock acquired
+        if key in self.host_entries:
+            arrow_table = self.host_entries.pop(key)
+            self.host_bytes = self.host_bytes - arrow_table.nbytes
+        if key in self.disk_entries:
+            path, nbytes = self.disk_entries.pop(key)
+            self.disk_bytes = self.disk_bytes - nbytes
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.entry_tables.pop(key, None)
+
+    def invalidate(self, table_name):
+        """
+        Removes all the entries of queries that read the given table.
+        """
+        with self.lock:
+            keys = [
+                key
+                for key, table_names in self.entry_tables.items()
+                if table_name in table_names
+            ]
+            for key in keys:
+                self._remove(key)
+
+    def clear(self):
+        with self.lock:
+            for key in list(self.entry_tables.keys()):
+                self._remove(key)
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "host_entries": len(self.host_entries),
+                "host_bytes": self.host_bytes,
+                "max_host_bytes": self.max_host_bytes,
+                "disk_entries": len(self.disk_entries),
+                "disk_bytes": self.disk_bytes,
+                "max_disk_bytes": self.max_disk_bytes,
+            }
+
+
+class QueryScheduler(object):
+    """
+    Admission control for the queries of a BlazingContext. A query has to be
+    admitted before it runs, and it is only admitted when every worker it
+    runs on has less than max_queries_per_worker running queries.
+
+    Waiting queries are admitted by priority (higher first), then by fair
+    share (the owner with fewer running queries first), then in arrival
+    order. A query that can not be admitted yet holds back the queries behind
+    it that need the same workers, so queries that run on all the workers
+    are not starved by single gpu queries.
+
+    A max_queries_per_worker of 0 disables admission control.
+    """
+
+    def __init__(self, max_queries_per_worker=0):
+        self.max_queries_per_worker = max_queries_per_worker
+        self.condition = Condition()
+        self.running = collections.Counter()
+        self.running_per_owner = collections.Counter()
+        self.waiting = []
+        self.sequence = itertools.count()
+
+    def enabled(self):
+        return self.max_queries_per_worker > 0
+
+    def _order_key(self, ticket):
+        return (
+            -ticket["priority"],
+            self.running_per_owner[ticket["owner"]],
+            ticket["sequence"],
+        )
+
+    def _fits(self, ticket):
+        return all(
+            self.running[worker] < self.max_queries_per_worker
+            for worker in ticket["workers"]
+        )
+
+    def _dispatch(self):
+        # must be called with self.condition acquired
+        admitted = True
+        while admitted and self.waiting:
+            admitted = False
+            blocked = set()
+            for ticket in sorted(self.waiting, key=self._order_key):
+                if blocked.isdisjoint(ticket["workers"]) and self._fits(ticket):
+                    self.waiting.remove(ticket)
+                    self.running.update(ticket["workers"])
+                    self.running_per_owner[ticket["owner"]] += 1
+                    ticket["admitted"] = True
+                    if ticket["on_admit"] is not None:
+                        ticket["on_admit"]()
+                    admitted = True
+                    # the fair share order changed, sort again
+                    break
+                blocked.update(ticket["workers"])
+        self.condition.notify_all()
+
+    def _new_ticket(self, workers, priority, owner):
+        return {
+            "workers": list(workers),
+            "priority": priority,
+            "owner": owner,
+            "sequence": next(self.sequence),
+            "admitted": False,
+            "on_admit": None,
+        }
+
+    def admit(self, workers, priority=0, owner=None):
+        """
+        Blocks until the query can run on the given workers and returns the
+        ticket that has to be passed to release once the query is done.
+        """
+        ticket = self._new_ticket(workers, priority, owner)
+        if not self.enabled():
+            return ticket
+        with self.condition:
+            self.waiting.append(ticket)
+            self._dispatch()
+            while not ticket["admitted"]:
+                self.condition.wait()
+        return ticket
+
+    async def admit_async(self, workers, priority=0, owner=None):
+        """
+        Same as admit, but waits without blocking a thread. Must be awaited
+        from a running asyncio event loop. A query that is cancelled while it
+        waits leaves the queue.
+        """
+        ticket = self._new_ticket(workers, priority, owner)
+        if not self.enabled():
+            return ticket
+        loop = asyncio.get_event_loop()
+        admitted = loop.create_future()
+
+        def set_admitted():
+            if not admitted.done():
+                admitted.set_result(True)
+
+        # _dispatch can run on any thread
+        ticket["on_admit"] = lambda: loop.call_soon_threadsafe(set_admitted)
+        with self.condition:
+            self.waiting.append(ticket)
+            self._dispatch()
+        try:
+            await admitted
+        except asyncio.CancelledError:
+            with self.condition:
+                if not ticket["admitted"]:
+                    self.waiting.remove(ticket)
+                    # the queries held back by this one may fit now
+                    self._dispatch()
+            self.release(ticket)
+            raise
+        return ticket
+
+    def release(self, ticket):
+        if not ticket["admitted"]:
+            return
+        with self.condition:
+            ticket["admitted"] = False
+            self.running.subtract(ticket["workers"])
+            self.running_per_owner[ticket["owner"]] -= 1
+            self._dispatch()
+
+    def release_when_done(self, ticket, dask_futures):
+        """
+        Releases the ticket once all the dask futures of the query are done.
+        """
+        pending = [len(dask_futures)]
+        pending_lock = Lock()
+
+        def on_done(future):
+            with pending_lock:
+                pending[0] = pending[0] - 1
+                done = pending[0] == 0
+            if done:
+                self.release(ticket)
+
+        if len(dask_futures) == 0:
+            self.release(ticket)
+        for future in dask_futures:
+            future.add_done_callback(on_done)
+
+    def info(self):
+        with self.condition:
+            return {
+                "running": dict(+self.running),
+                "waiting": len(self.waiting),
+                "max_queries_per_worker": self.max_queries_per_worker,
+            }
+
+
+# Calcite prints the dynamic parameters (the ? in a sql query) as ?0, ?1, ...
+_dynamic_param_re = re.compile(r"\?(\d+)")
+_single_quoted_re = re.compile(r"('(?:[^']|'')*')")
+
+
+def get_dynamic_param_indexes(algebra):
+    parts = _single_quoted_re.split(algebra)
+    indexes = set()
+    for index in range(0, len(parts), 2):
+        indexes.update(int(i) for i in _dynamic_param_re.findall(parts[index]))
+    return indexes
+
+
+def to_algebra_literal(value):
+    # returns the value as a literal the way it is written in the logical plan
+    if value is None:
+        return "null"
+    if isinstance(value, (bool, np.bool_)):
+        return "true" if value else "false"
+    if isinstance(value, (int, np.integer)):
+        return str(int(value))
+    if isinstance(value, (float, np.floating)):
+        return repr(float(value))
+    # dates and timestamps are cast, so that they keep their type wherever the
+    # parameter is used
+    if isinstance(value, (datetime.datetime, pandas.Timestamp, np.datetime64)):
+        timestamp = pandas.Timestamp(value).strftime("%Y-%m-%d %H:%M:%S")
+        return "CAST(" + timestamp + "):TIMESTAMP"
+    if isinstance(value, datetime.date):
+        return "CAST(" + value.strftime("%Y-%m-%d") + "):DATE"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    raise TypeError(
+        "Unsupported parameter type " + str(type(value)) + " for value " + str(value)
+    )
+
+
+def bind_dynamic_params(text, literals, escape=None):
+    def replace(match):
+        literal = literals[int(match.group(1))]
+        return literal if escape is None else escape(literal)
+
+    parts = _single_quoted_re.split(text)
+    for index in range(0, len(parts), 2):
+        parts[index] = _dynamic_param_re.sub(replace, parts[index])
+    return "".join(parts)
+
+
+def escape_json_string(text):
+    return json.dumps(text)[1:-1]
+
+
+class PreparedQuery(object):
+    """
+    A query that was parsed, validated and optimized once by Calcite, and that
+    can be run many times with different values for its parameters.
+    Created with BlazingContext.prepare
+    """
+
+    def __init__(self, context, query):
+        self.context = context
+        self.query = query
+        self.catalog_version = None
+        self.algebra = ""
+        self.plan = None
+        self.table_names = []
+        self.table_scans = []
+        self.num_params = 0
+
+    def __repr__(self):
+        return "PreparedQuery(%r)" % (self.query)
+
+    def prepare(self):
+        """
+        Generates the plan of the query with Calcite. Returns False if the
+        query could not be parsed.
+        """
+        (
+            algebra,
+            plan,
+            catalog_version,
+            table_names,
+            table_scans,
+        ) = self.context._get_query_plan(self.query, None, True)
+        if algebra == "":
+            return False
+        self.catalog_version = catalog_version
+        self.algebra = algebra
+        self.plan = plan
+        self.table_names = table_names or []
+        self.table_scans = table_scans or []
+        param_indexes = get_dynamic_param_indexes(algebra)
+        self.num_params = max(param_indexes) + 1 if param_indexes else 0
+        return True
+
+    def bind(self, params=None):
+        """
+        Returns the json plan and the table scans with the parameters
+        replaced by the given values.
+        """
+        if params is None:
+            params = []
+        if len(params) < self.num_params:
+            raise ValueError(
+                "The prepared query expects "
+                + str(self.num_params)
+                + " parameters but "
+                + str(len(params))
+                + " were given"
+            )
+        literals = [to_algebra_literal(param) for param in params]
+        plan = bind_dynamic_params(self.plan, literals, escape_json_string)
+        table_scans = [bind_dynamic_params(scan, literals) for scan in self.table_scans]
+        return plan, table_scans
+
+    def execute(
+        self, params=None, return_futures=False, single_gpu=False, config_options={}
+    ):
+        """
+        Runs the prepared query with the given parameter values.
+
+        Parameters
+        ----------
+
+        params : list of values for the ? placeholders of the query,
+                in the same order as they appear in the query.
+        return_futures, single_gpu, config_options (optional) : same as
+                in BlazingContext.sql
+
+        Examples
+        --------
+
+        >>> handle = bc.prepare('SELECT * FROM orders WHERE o_custkey = ?')
+        >>> result = handle.execute([123])
+        """
+        # tables used by the query may have been created again since the
+        # query was prepared, in that case the plan has to be regenerated
+        if self.catalog_version != self.context.catalog_version:
+            if not self.prepare():
+                print("Parsing Error")
+                return
+        if "LogicalValues(tuples=[[]])" in self.algebra:
+            return cudf.DataFrame()
+        plan, table_scans = self.bind(params)
+        return self.context._run_plan(
+            plan,
+            self.table_names,
+            table_scans,
+            return_futures=return_futures,
+            single_gpu=single_gpu,
+            config_options=config_options,
+        )
+
+
+class QueryHandle(object):
+    """
+    Handle of a query started with BlazingContext.sql_async. It can be
+    awaited to get the result of the query, and be used to check the status
+    of the query or to cancel it.
+    """
+
+    def __init__(self, context, query):
+        self.context = context
+        self.query = query
+        self.state = "pending"
+        self.task = None
+        self.dask_futures = None
+
+    def __repr__(self):
+        return "QueryHandle(%r, status=%r)" % (self.query, self.status())
+
+    def __await__(self):
+        return self.task.__await__()
+
+    def status(self):
+        """
+        Returns one of 'pending', 'planning', 'waiting' (for its admission by
+        the query scheduler), 'running', 'finished', 'cancelled' or 'error'.
+        """
+        if self.task is not None and self.task.done():
+            if self.task.cancelled():
+                return "cancelled"
+            if self.task.exception() is not None:
+                return "error"
+            return "finished"
+        return self.state
+
+    def done(self):
+        return self.task is not None and self.task.done()
+
+    def cancel(self):
+        """
+        Cancels the query. Dask futures of a distributed query that is
+        already running are cancelled too. A query that is already running
+        on a single node without dask can not be interrupted, its result is
+        discarded.
+        """
+        if self.done():
+            return False
+        if self.dask_futures is not None and self.context.dask_client is not None:
+            self.context.dask_client.cancel(self.dask_futures)
+        return self.task.cancel()
+
+    async def result(self):
+        """
+        Waits for the query to finish and returns its result.
+        """
+        return await self.task
+
+
+def wrap_dask_future(future, loop):
+    """
+    Returns an asyncio future that is resolved with the result of the given
+    dask future, without blocking a thread while waiting for it.
+    """
+    aio_future = loop.create_future()
+
+    def set_result(result, exception):
+        if aio_future.cancelled():
+            return
+        if exception is not None:
+            aio_future.set_exception(exception)
+        else:
+            aio_future.set_result(result)
+
+    def on_done(future):
+        # dask runs the callbacks in a separate thread, so the result is
+        # fetched here instead of on the event loop
+        try:
+            result, exception = future.result(), None
+        except BaseException as e:
+            result, exception = None, e
+        loop.call_soon_threadsafe(set_result, result, exception)
+
+    future.add_done_callback(on_done)
+    return aio_future
+
+
 def resolve_relative_path(files):
     files_out = []
     for file in files:
@@ -654,6 +1560,144 @@ def resolve_relative_path(files):
     return files_out
 
 
+# The row groups to read from the files of a table are kept in a CSR like
+# representation: the row groups of the i-th file are
+# row_group_ids[row_group_offsets[i] : row_group_offsets[i + 1]]
+def group_row_groups_by_file(file_handle_index, row_group_index):
+    """
+    Groups the row groups of a metadata frame by file. Returns the sorted
+    unique file indexes, and the row_group_offsets and row_group_ids of their
+    row groups, keeping the order the row groups had in the metadata.
+    """
+    file_handle_index = np.asarray(file_handle_index)
+    order = np.argsort(file_handle_index, kind="stable")
+    row_group_ids = np.asarray(row_group_index)[order].astype(np.int32)
+    file_indices, counts = np.unique(file_handle_index[order], return_counts=True)
+    row_group_offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=row_group_offsets[1:])
+    return file_indices, row_group_offsets, row_group_ids
+
+
+def row_groups_to_csr(row_groups_ids):
+    # converts one list of row groups per file to row_group_offsets and
+    # row_group_ids
+    row_group_offsets = np.zeros(len(row_groups_ids) + 1, dtype=np.int64)
+    np.cumsum([len(x) for x in row_groups_ids], out=row_group_offsets[1:])
+    row_group_ids = np.fromiter(
+        itertools.chain.from_iterable(row_groups_ids),
+        dtype=np.int32,
+        count=row_group_offsets[-1],
+    )
+    return row_group_offsets, row_group_ids
+
+
+def slice_row_groups(row_group_offsets, row_group_ids, start_file, end_file):
+    # returns the row_group_offsets and row_group_ids of the files in
+    # [start_file, end_file)
+    offsets = row_group_offsets[start_file : end_file + 1]
+    if len(offsets) == 0:
+        return np.zeros(1, dtype=np.int64), row_group_ids[:0]
+    return offsets - offsets[0], row_group_ids[offsets[0] : offsets[-1]]
+
+
+# With SCAN_ASSIGNMENT_MODE=dynamic the row groups of a table are split in
+# around SCAN_BATCHES_PER_NODE batches per node, so that the nodes that finish
+# first can take over the remaining batches
+SCAN_BATCHES_PER_NODE = 8
+
+
+def get_row_group_weights(metadata, file_indices, row_group_offsets, row_group_ids):
+    """
+    Returns the weight of each row group of the CSR: its size in bytes from
+    the total_byte_size column of the metadata, or its number of rows when
+    the sizes are not known. The row groups that are not in the metadata, or
+    all of them when there is no metadata, weight 1.
+    """
+    row_group_ids = np.asarray(row_group_ids, dtype=np.int64)
+    if isinstance(metadata, dask_cudf.core.DataFrame):
+        metadata = metadata.compute()
+    if metadata is None or len(metadata) == 0:
+        return np.ones(len(row_group_ids), dtype=np.int64)
+    if "total_byte_size" in metadata.columns:
+        weight_column = "total_byte_size"
+    elif "num_rows" in metadata.columns:
+        weight_column = "num_rows"
+    else:
+        return np.ones(len(row_group_ids), dtype=np.int64)
+
+    meta_files = metadata["file_handle_index"].to_array().astype(np.int64)
+    meta_row_groups = metadata["row_group_index"].to_array().astype(np.int64)
+    meta_weights = metadata[weight_column].to_array().astype(np.int64)
+
+    # (file, row group) pairs are encoded as a single key to look them up
+    stride = max(meta_row_groups.max(initial=0), row_group_ids.max(initial=0)) + 1
+    meta_keys = meta_files * stride + meta_row_groups
+    order = np.argsort(meta_keys)
+    files = np.repeat(
+        np.asarray(file_indices, dtype=np.int64), np.diff(row_group_offsets)
+    )
+    keys = files * stride + row_group_ids
+    positions = np.searchsorted(meta_keys, keys, sorter=order)
+    found = order[np.minimum(positions, len(order) - 1)]
+    return np.where(meta_keys[found] == keys, meta_weights[found], 1)
+
+
+def make_scan_batches(row_group_offsets, row_group_ids, weights, max_row_groups):
+    """
+    Splits the row groups of each file in batches of at most max_row_groups
+    row groups (a single value or one per file), and orders the batches by
+    decreasing weight so the biggest ones are read first. Returns the file of
+    each batch, the row_group_offsets and row_group_ids of the batches and
+    their weights.
+    """
+    counts = np.diff(row_group_offsets)
+    num_row_groups = len(row_group_ids)
+    file_index = np.repeat(np.arange(len(counts)), counts)
+    position = np.arange(num_row_groups) - np.repeat(row_group_offsets[:-1], counts)
+    max_row_groups = np.broadcast_to(max_row_groups, counts.shape)
+    chunk = position // np.repeat(max_row_groups, counts)
+
+    new_batch = np.ones(num_row_groups, dtype=bool)
+    new_batch[1:] = (file_index[1:] != file_index[:-1]) | (chunk[1:] != chunk[:-1])
+    starts = np.flatnonzero(new_batch)
+    if len(starts) == 0:
+        empty = np.zeros(1, dtype=np.int64)
+        return file_index[:0], empty, row_group_ids[:0], weights[:0]
+
+    batch_weights = np.add.reduceat(weights, starts)
+    order = np.argsort(-batch_weights, kind="stable")
+    lengths = np.diff(np.append(starts, num_row_groups))[order]
+    batch_offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=batch_offsets[1:])
+    gather = np.arange(num_row_groups) + np.repeat(
+        starts[order] - batch_offsets[:-1], lengths
+    )
+    return (
+        file_index[starts[order]],
+        batch_offsets,
+        row_group_ids[gather],
+        batch_weights[order],
+    )
+
+
+def assign_slices_lpt(weights, num_slices):
+    """
+    Greedy longest processing time first assignment: from the heaviest to the
+    lightest, every item goes to the least loaded slice (the one with the
+    lowest index on ties), so the result is deterministic. Returns the slice
+    of each item.
+    """
+    weights = np.asarray(weights).tolist()
+    order = sorted(range(len(weights)), key=lambda item: -weights[item])
+    slices = [(0, i) for i in range(num_slices)]
+    assignment = np.zeros(len(weights), dtype=np.int64)
+    for item in order:
+        load, slice_index = heapq.heappop(slices)
+        assignment[item] = slice_index
+        heapq.heappush(slices, (load + weights[item], slice_index))
+    return assignment
+
+
 # this is to handle the cases where there is a file that does not actually
 # have data files that do not have data wont show up in the metadata and
 # we will want to remove them from the table schema
@@ -802,9 +1846,12 @@ class BlazingTable(object):
         force_conversion=False,
         metadata=None,
         row_groups_ids=[],
+        row_group_offsets=None,
+        row_group_ids=None,
     ):
         # row_groups_ids, vector<vector<int>> one vector
-        # of row_groups per file
+        # of row_groups per file. row_group_offsets and row_group_ids are
+        # the same information in CSR form, and take precedence
         self.name = name
         self.fileType = fileType
         if fileType == DataType.ARROW:
@@ -839,9 +1886,11 @@ class BlazingTable(object):
         self.slices = None
         # metadata, this is computed in create table, after call get_metadata
         self.metadata = metadata
-        # row_groups_ids, vector<vector<int>> one vector of
-        # row_groups per file
-        self.row_groups_ids = row_groups_ids
+        # row groups to read of each file, see group_row_groups_by_file
+        self.row_group_offsets = row_group_offsets
+        self.row_group_ids = row_group_ids
+        if row_group_offsets is None:
+            self.row_groups_ids = row_groups_ids
         # a pair of values with the startIndex and batchSize
         # info for each slice
         self.offset = (0, 0)
@@ -849,7 +1898,9 @@ class BlazingTable(object):
         self.column_names = []
         self.column_types = []
 
-        if self.fileType == DataType.CUDF:
+        if self.fileType == DataType.CUDF or self.fileType == DataType.ARROW:
+            # for arrow tables the input is an empty cudf.DataFrame with the
+            # same schema
             self.column_names = [x for x in self.input._data.keys()]
             data_values = self.input._data.values()
             self.column_types = [cio.np_to_cudf_types_int(x.dtype) for x in data_values]
@@ -857,11 +1908,42 @@ class BlazingTable(object):
             self.column_names = [x for x in input.columns]
             self.column_types = [cio.np_to_cudf_types_int(x) for x in input.dtypes]
 
+        # statistics for the relational algebra planner, these are computed
+        # in create table, after the metadata is available
+        self.row_count = None
+        self.column_statistics = []
+
+        # for tables created with lazy=True, loads the whole table the first
+        # time it is used in a query
+        self.lazy_loader = None
+
         # file_column_names are usually the same as column_names, except
         # for when in a hive table the column names defined by the hive schema
         # are different that the names in actual files
         self.file_column_names = self.column_names
 
+    @property
+    def row_groups_ids(self):
+        # one list of row groups per file
+        if self.row_group_offsets is None:
+            return None
+        return [
+            self.row_group_ids[start:end].tolist()
+            for start, end in zip(
+                self.row_group_offsets[:-1], self.row_group_offsets[1:]
+            )
+        ]
+
+    @row_groups_ids.setter
+    def row_groups_ids(self, row_groups_ids):
+        if row_groups_ids is None:
+            self.row_group_offsets = None
+            self.row_group_ids = None
+        else:
+            self.row_group_offsets, self.row_group_ids = row_groups_to_csr(
+                row_groups_ids
+            )
+
     def has_metadata(self):
         if isinstance(self.metadata, dask_cudf.core.DataFrame):
             return not self.metadata.compute().empty
@@ -869,30 +1951,30 @@ class BlazingTable(object):
             return not self.metadata.empty
         return False
 
-    def filterAndRemapColumns(self, tableColumns):
-        # only used for arrow
-        new_table = self.arrow_table
-
-        columns = []
-        names = []
-        i = 0
-        for column in new_table.itercolumns():
-            for index in tableColumns:
-                if i == index:
-                    names.append(self.arrow_table.field(i).name)
-                    columns.append(column)
-            i = i + 1
-        new_table = pyarrow.Table.from_arrays(columns, names=names)
-        new_table = BlazingTable(
-            self.name, new_table, DataType.ARROW, force_conversion=True
-        )
-
-        return new_table
+    def getProjectedTable(self, column_indices):
+        # a shallow copy of the table with only the columns in column_indices,
+        # in that order. The input is projected by the caller
+        node_table = copy.copy(self)
+        node_table.column_names = [self.column_names[i] for i in column_indices]
+        node_table.file_column_names = node_table.column_names
+        node_table.column_types = [self.column_types[i] for i in column_indices]
+        return node_table
+
+    def getArrowNodeTable(self, column_indices, column_cache):
+        # the table given to the engine for a scan of an arrow table, with
+        # only the columns in column_indices converted to cudf. The engine
+        # takes the whole table when the query starts, so the converted
+        # columns are all in device memory at the same time
+        frame = OrderedDict()
+        for index in column_indices:
+            frame[self.column_names[index]] = column_cache.get_column(
+                self.name, self.arrow_table, index
+            )
 
-    def convertForQuery(self):
-        return BlazingTable(
-            self.name, self.arrow_table, DataType.ARROW, force_conversion=True
-        )
+        node_table = self.getProjectedTable(column_indices)
+        node_table.fileType = DataType.CUDF
+        node_table.input = [cudf.DataFrame(frame)]
+        return node_table
 
     # until this is implemented we cant do self join with arrow tables
     #    def unionColumns(self,otherTable):
@@ -912,7 +1994,7 @@ class BlazingTable(object):
                 table.partition_keys = partition_keys_mapping[node["worker"]]
                 table.input = []
             else:
-                table.input = [table.input._meta]
+                table.input = [table.input._meta[table.column_names]]
                 table.partition_keys = []
             nodeFilesList.append(table)
 
@@ -931,11 +2013,14 @@ class BlazingTable(object):
             tempFiles = self.files[startIndex : startIndex + batchSize]
             uri_values = self.uri_values[startIndex : startIndex + batchSize]
 
-            slice_row_groups_ids = []
-            if self.row_groups_ids is not None:
-                slice_row_groups_ids = self.row_groups_ids[
-                    startIndex : startIndex + batchSize
-                ]
+            slice_offsets, slice_ids = None, None
+            if self.row_group_offsets is not None:
+                slice_offsets, slice_ids = slice_row_groups(
+                    self.row_group_offsets,
+                    self.row_group_ids,
+                    startIndex,
+                    startIndex + batchSize,
+                )
 
             bt = BlazingTable(
                 self.name,
@@ -945,7 +2030,8 @@ class BlazingTable(object):
                 calcite_to_file_indices=self.calcite_to_file_indices,
                 uri_values=uri_values,
                 args=self.args,
-                row_groups_ids=slice_row_groups_ids,
+                row_group_offsets=slice_offsets,
+                row_group_ids=slice_ids,
                 in_file=self.in_file,
             )
             bt.offset = (startIndex, batchSize)
@@ -1031,6 +2117,35 @@ class BlazingContext(object):
             TABLE_SCAN_KERNEL_NUM_THREADS: The number of threads used in the
                     TableScan & BindableTableScan kernels for reading batches
                     default: 4
+            KERNEL_EXECUTOR_THREADS : The max number of kernels that run at
+                    the same time on each node, across all the queries. The
+                    kernels run on a pool of threads reused between queries.
+                    A query waits until there are threads for all its kernels
+                    (a query with more kernels than this runs alone), and
+                    queries are admitted in arrival order. Distributed
+                    queries don't wait, as the nodes could admit them in
+                    different orders, but their kernels are counted.
+                    default: 256
+            LISTING_CACHE_TTL : The number of seconds that the results of
+                    listing a directory or reading the status of a file of a
+                    registered file system are reused, so that create_table
+                    and the scans of every query do not request them again.
+                    Paths that don't exist are not cached. Use
+                    invalidate_listing_cache to see the changes made before
+                    the results expire. 0 disables the cache.
+                    default: 0
+            LOCAL_FILES_MEMORY_MAP : If True, the local files that are not
+                    under a prefix registered with localfs are read through a
+                    memory mapping (see the mmap parameter of localfs).
+                    default: False
+            SCAN_ASSIGNMENT_MODE : How the files of a table are distributed
+                    among the nodes in a distributed query. With 'static'
+                    each node reads a fixed slice of the files. With
+                    'dynamic' the row groups are split in batches, biggest
+                    first, and the master node hands them out to the nodes
+                    as they finish the previous ones, so that slow nodes or
+                    skewed files don't delay the whole query.
+                    default: static
             MAX_DATA_LOAD_CONCAT_CACHE_BYTE_SIZE : The max size in bytes to
                     concatenate the batches read from the scan kernels
                     default: 400000000
@@ -1070,6 +2185,97 @@ class BlazingContext(object):
             MEMORY_MONITOR_PERIOD : How often the memory monitor checks memory
                     consumption. The value is in milliseconds.
                     default: 50  (milliseconds)
+            PLAN_CACHE_SIZE : The max number of optimized logical plans that
+                    are kept in memory, so that repeated queries do not go
+                    through Calcite again. Set to 0 to disable the cache.
+                    NOTE: This parameter only works when used in the
+                    BlazingContext
+                    default: 256
+            ASYNC_EXECUTOR_THREADS : The max number of threads used by
+                    sql_async to plan queries and to run them when there is no
+                    dask client.
+                    NOTE: This parameter only works when used in the
+                    BlazingContext
+                    default: 4
+            RESULT_CACHE_HOST_MEMORY : The max number of bytes of host
+                    memory used to keep the results of queries, so that
+                    repeating a query over tables that did not change returns
+                    the cached result. Results are invalidated when a table
+                    they read is created again or dropped, or when the size
+                    or modification time of one of its files changes. Only the
+                    results of queries that don't run on a dask cluster, and
+                    whose files have a known modification time, are cached.
+                    Set to 0 to disable the cache.
+                    NOTE: This parameter only works when used in the
+                    BlazingContext
+                    default: 0
+            RESULT_CACHE_DISK_SIZE : The max number of bytes of the results
+                    spilled to disk (under BLAZING_CACHE_DIRECTORY) when they
+                    don't fit in RESULT_CACHE_HOST_MEMORY. Set to 0 to never
+                    spill results to disk.
+                    NOTE: This parameter only works when used in the
+                    BlazingContext
+                    default: 0
+            ARROW_COLUMN_CACHE_SIZE : The max number of bytes of the columns
+                    of tables created from a pyarrow.Table or, without a dask
+                    client, from a pandas.DataFrame that are kept converted
+                    to cudf between queries. Only the columns read by a query
+                    are converted. Set to 0 to convert them again for every
+                    query.
+                    NOTE: This parameter only works when used in the
+                    BlazingContext
+                    default: 0
+            PARQUET_FOOTER_READER_THREADS : The max number of parquet
+                    footers read at the same time, per node, when creating a
+                    table.
+                    NOTE: This parameter only works when used in the
+                    BlazingContext
+                    default: 16
+            PARQUET_FOOTER_READER_RETRIES : The number of times the footer of
+                    a parquet file is read again after a failure (with an
+                    exponential backoff) before create_table fails.
+                    NOTE: This parameter only works when used in the
+                    BlazingContext
+                    default: 2
+            PARQUET_METADATA_CACHE : When True, the metadata read from the
+                    footers of each parquet file is kept on disk under
+                    BLAZING_CACHE_DIRECTORY, keyed by the uri, size and
+                    modification time of the file. Creating a table again
+                    over unchanged files doesn't read their footers. Files
+                    whose modification time can't be known (i.e. on HDFS)
+                    are not cached.
+                    NOTE: This parameter only works when used in the
+                    BlazingContext
+                    default: False
+            HIVE_METADATA_CACHE_TTL : The number of seconds the schema and
+                    partitions of a table created from a Hive cursor are
+                    reused without asking HiveServer2 again. The cache is
+                    kept on disk under BLAZING_CACHE_DIRECTORY so it is shared
+                    by BlazingContexts on the same machine. Expired entries
+                    are refreshed, the partitions are listed again but only
+                    the new ones are parsed. Tables of a cursor whose host
+                    can not be found are not cached. Set to 0 to disable it.
+                    NOTE: This parameter only works when used in the
+                    BlazingContext
+                    default: 0
+            MAX_CONCURRENT_QUERIES_PER_WORKER : The max number of queries
+                    that can run at the same time on each worker (or on the
+                    local node when there is no dask client). Queries over
+                    the limit wait to be admitted, by priority and then
+                    sharing the workers fairly among query owners (see the
+                    priority and owner parameters of sql). Set to 0 to admit
+                    every query right away.
+                    NOTE: This parameter only works when used in the
+                    BlazingContext
+                    default: 0
+            ENABLE_JOIN_REORDERING : When True, the logical plan goes
+                    through a cost based join reordering phase that uses the
+                    table statistics (row counts, min/max, null counts) to
+                    choose the join order instead of keeping the order in
+                    which the joins were written.
+                    NOTE: This parameter only works when used in the
+                    BlazingContext
+                    default: False
 
         Examples
         --------
@@ -1101,7 +2307,16 @@ class BlazingContext(object):
         """
 
         self.single_gpu_idx = 0
+        self.single_gpu_lock = Lock()
         self.lock = Lock()
+        # the relational algebra generator is not thread safe, and the catalog
+        # it reads is only changed with this lock acquired too. It is acquired
+        # before self.lock
+        self.planner_lock = Lock()
+        self.async_executor = ThreadPoolExecutor(
+            max_workers=int(config_options.get("ASYNC_EXECUTOR_THREADS", 4)),
+            thread_name_prefix="blazingsql-async",
+        )
         self.finalizeCaller = ref(cio.finalizeCaller)
         self.dask_client = dask_client
         self.nodes = []
@@ -1222,13 +2437,53 @@ class BlazingContext(object):
         self.db = DatabaseClass("main")
         self.schema = BlazingSchemaClass(self.db)
         self.generator = RelationalAlgebraGeneratorClass(self.schema)
+        join_reordering = config_options.get("ENABLE_JOIN_REORDERING", False)
+        if isinstance(join_reordering, str):
+            join_reordering = join_reordering.lower() == "true"
+        self.generator.setJoinReorderingEnabled(bool(join_reordering))
         self.tables = {}
         self.logs_initialized = False
 
+        # catalog_version is increased each time a table is created or
+        # dropped, it is part of the key of the plan_cache entries
+        self.catalog_version = 0
+        plan_cache_size = int(config_options.get("PLAN_CACHE_SIZE", 256))
+        self.plan_cache = PlanCache(plan_cache_size)
+        self.query_scheduler = QueryScheduler(
+            int(config_options.get("MAX_CONCURRENT_QUERIES_PER_WORKER", 0))
+        )
+        self.hive_metadata_cache = HiveMetadataCache(
+            os.path.join(cache_dir_path, "hive_metadata"),
+            float(config_options.get("HIVE_METADATA_CACHE_TTL", 0)),
+        )
+        self.result_cache = ResultCache(
+            int(config_options.get("RESULT_CACHE_HOST_MEMORY", 0)),
+            int(config_options.get("RESULT_CACHE_DISK_SIZE", 0)),
+            cache_dir_path,
+        )
+        self.arrow_column_cache = ArrowColumnCache(
+            int(config_options.get("ARROW_COLUMN_CACHE_SIZE", 0))
+        )
+        self.footer_reader_threads = int(
+            config_options.get("PARQUET_FOOTER_READER_THREADS", 16)
+        )
+        self.footer_reader_retries = int(
+            config_options.get("PARQUET_FOOTER_READER_RETRIES", 2)
+        )
+        self.parquet_metadata_cache_dir = None
+        parquet_metadata_cache = config_options.get("PARQUET_METADATA_CACHE", False)
+        if isinstance(parquet_metadata_cache, str):
+            parquet_metadata_cache = parquet_metadata_cache.lower() == "true"
+        if parquet_metadata_cache:
+            self.parquet_metadata_cache_dir = os.path.join(
+                cache_dir_path, "parquet_metadata"
+            )
+
         # waitForPingSuccess(self.client)
         print("BlazingContext ready")
 
     def __del__(self):
+        self.async_executor.shutdown(wait=False)
         self.finalizeCaller()
 
     def __repr__(self):
@@ -1240,6 +2495,29 @@ class BlazingContext(object):
     # BEGIN FileSystem interface
 
     def localfs(self, prefix, **kwargs):
+        """
+        Register a directory of the local file system.
+
+        Parameters
+        ----------
+
+        name : string that represents the name with which you will refer to
+            your directory.
+        root (optional) : string path of the directory, by default '/'.
+        mmap (optional) : boolean, if True the files are read through a
+            memory mapping, so the scans take their data straight from the
+            page cache instead of copying it and the kernel reads the files
+            ahead of the scans. By default False.
+
+        Examples
+        --------
+
+        Register and create table from a local directory:
+
+        >>> bc.localfs('data', root='/home/user/data', mmap=True)
+        >>> bc.create_table('table_name', 'file://data/file.parquet')
+        <pyblazing.apiv2.context.BlazingTable at 0x7f11897c0310>
+        """
         return self.fs.localfs(self.dask_client, prefix, **kwargs)
 
     # Use result, error_msg = hdfs(args) where result can be True|False
@@ -1365,6 +2643,41 @@ class BlazingContext(object):
     def show_filesystems(self):
         print(self.fs)
 
+    def invalidate_listing_cache(self, path=None):
+        """
+        Drops the cached results of listing the files and directories of the
+        registered file systems (see LISTING_CACHE_TTL), so that files added
+        or removed since they were listed are seen by the next create_table or
+        query.
+
+        Parameters
+        ----------
+
+        path (optional) : string, only the cached listings of the paths that
+            start with it are dropped. By default all of them are dropped.
+
+        Examples
+        --------
+
+        >>> bc.invalidate_listing_cache('s3://bucket_name/folder/')
+        """
+        path = "" if path is None else path
+        if self.dask_client is None:
+            cio.invalidateListingCacheCaller(path)
+        else:
+            dask_futures = []
+            for worker in list(self.dask_client.scheduler_info()["workers"]):
+                dask_futures.append(
+                    self.dask_client.submit(
+                        cio.invalidateListingCacheCaller,
+                        path,
+                        pure=False,
+                        workers=[worker],
+                    )
+                )
+            for future in dask_futures:
+                future.result()
+
     # END  FileSystem interface
     def _to_url(self, str_input):
         url = urlparse(str_input)
@@ -1376,7 +2689,7 @@ class BlazingContext(object):
 
     # BEGIN SQL interface
 
-    def explain(self, sql):
+    def explain(self, sql, use_plan_cache=True):
         """
         Returns break down of a given query's Logical Relational Algebra plan.
 
@@ -1384,6 +2697,9 @@ class BlazingContext(object):
         ----------
 
         sql : string SQL query.
+        use_plan_cache (optional) : defaulted to true. Set to false to
+                    always generate the plan with Calcite, instead of
+                    reusing a previously generated plan for the same query.
 
         Examples
         --------
@@ -1408,8 +2724,35 @@ class BlazingContext(object):
 
         Docs: https://docs.blazingdb.com/docs/explain
         """
+        algebra, plan, _, _, _ = self._get_query_plan(
+            sql, None, use_plan_cache, need_plan=False
+        )
+        return algebra
+
+    def _get_algebra_plan_and_version(self, sql, use_plan_cache, need_plan=True):
+        """
+        Returns the algebra and plan of the query, and the catalog version
+        they were generated with.
+        """
+        use_plan_cache = use_plan_cache and self.plan_cache.enabled()
+        entry = None
+        with self.lock:
+            catalog_version = self.catalog_version
+            if use_plan_cache:
+                key = (normalize_sql(sql), catalog_version)
+                entry = self.plan_cache.get(key)
+        if entry is not None:
+            if need_plan and entry["plan"] is None:
+                entry["plan"] = get_plan(entry["algebra"])
+            return entry["algebra"], entry["plan"], catalog_version
+
+        # the catalog only changes under the planner lock too, so the queries
+        # are planned without holding the catalog lock. When the catalog
+        # changed after its version was read the plan is cached under the old
+        # version, which is not looked up anymore
         try:
-            algebra = str(self.generator.getRelationalAlgebraString(sql))
+            with self.planner_lock:
+                algebra = str(self.generator.getRelationalAlgebraString(sql))
         except jpype.JException as exception:
             algebra = ""
             print("SQL Parsing Error")
@@ -1419,32 +2762,112 @@ class BlazingContext(object):
             print(algebra)
             algebra = ""
 
-        return algebra
+        plan = None
+        if need_plan and algebra != "":
+            plan = get_plan(algebra)
+
+        if use_plan_cache and algebra != "":
+            self.plan_cache.put(key, algebra, plan)
+
+        return algebra, plan, catalog_version
+
+    def _get_query_plan(
+        self, sql, algebra, use_plan_cache, single_gpu=False, need_plan=True
+    ):
+        """
+        Returns the algebra, plan, catalog version, table names and table
+        scans of the query, after loading the lazy tables it uses (see
+        _load_lazy_tables). When the algebra is given it is used instead of
+        planning the query, and the catalog version is None. The table names
+        and scans are None when the query could not be planned or returns an
+        empty result.
+        """
+        plan = None
+        catalog_version = None
+        if algebra is None:
+            algebra, plan, catalog_version = self._get_algebra_plan_and_version(
+                sql, use_plan_cache, need_plan
+            )
+        if algebra == "" or "LogicalValues(tuples=[[]])" in algebra:
+            return algebra, plan, catalog_version, None, None
+
+        table_names, table_scans = self._get_table_scan_info(algebra, single_gpu)
+        schema_changed = self._load_lazy_tables(table_names)
+        if catalog_version is None:
+            if schema_changed:
+                raise ValueError(
+                    "The files of a lazy table used by the algebra don't have "
+                    "the schema the table was created with"
+                )
+        elif self.catalog_version != catalog_version:
+            # the plan was generated with the schema and statistics of the
+            # tables before they were loaded, it is generated again
+            return self._get_query_plan(
+                sql, None, use_plan_cache, single_gpu, need_plan
+            )
+        return algebra, plan, catalog_version, table_names, table_scans
 
     def add_remove_table(self, tableName, addTable, table=None):
+        # the catalog is not changed while a query is planned
+        self.planner_lock.acquire()
         self.lock.acquire()
         try:
+            # self.db is updated in place, self.schema looks up its tables
+            # there, so self.generator does not need to be recreated
             if addTable:
-                self.db.removeTable(tableName)
-                self.tables[tableName] = table
-
-                arr = ArrayClass()
-                for order, column in enumerate(table.column_names):
-                    type_id = table.column_types[order]
-                    dataType = ColumnTypeClass.fromTypeId(type_id)
-                    column = ColumnClass(column, dataType, order)
-                    arr.add(column)
-                tableJava = TableClass(tableName, self.db, arr)
-                self.db.addTable(tableJava)
-                self.schema = BlazingSchemaClass(self.db)
-                self.generator = RelationalAlgebraGeneratorClass(self.schema)
+                self._add_table(tableName, table)
             else:
                 self.db.removeTable(tableName)
-                self.schema = BlazingSchemaClass(self.db)
-                self.generator = RelationalAlgebraGeneratorClass(self.schema)
                 del self.tables[tableName]
+            self.result_cache.invalidate(tableName)
+            self.arrow_column_cache.invalidate(tableName)
+        finally:
+            # increased once the catalog changed, even if it changed partially
+            self.catalog_version = self.catalog_version + 1
+            self.lock.release()
+            self.planner_lock.release()
+
+    def add_tables(self, tables):
+        """
+        Registers all the BlazingTables of a dictionary of table names to
+        BlazingTable, acquiring the catalog lock only once.
+        """
+        self.planner_lock.acquire()
+        self.lock.acquire()
+        try:
+            # all the tables are given to the catalog in one call
+            tablesJava = ArrayClass()
+            for tableName, table in tables.items():
+                tablesJava.add(self._to_java_table(tableName, table))
+            self.db.addTables(tablesJava)
+            for tableName, table in tables.items():
+                self.tables[tableName] = table
+                self.result_cache.invalidate(tableName)
+                self.arrow_column_cache.invalidate(tableName)
         finally:
+            # increased once the catalog changed, even if it changed partially
+            self.catalog_version = self.catalog_version + 1
             self.lock.release()
+            self.planner_lock.release()
+
+    def _add_table(self, tableName, table):
+        # must be called with self.planner_lock and self.lock acquired
+        self.tables[tableName] = table
+        self.db.addTable(self._to_java_table(tableName, table))
+
+    def _to_java_table(self, tableName, table):
+        arr = ArrayClass()
+        for order, column in enumerate(table.column_names):
+            type_id = table.column_types[order]
+            dataType = ColumnTypeClass.fromTypeId(type_id)
+            column = ColumnClass(column, dataType, order)
+            if order < len(table.column_statistics):
+                column.setStatistics(*table.column_statistics[order])
+            arr.add(column)
+        tableJava = TableClass(tableName, self.db, arr)
+        if table.row_count is not None:
+            tableJava.setRowCount(float(table.row_count))
+        return tableJava
 
     def create_table(self, table_name, input, **kwargs):
         """
@@ -1456,7 +2879,22 @@ class BlazingContext(object):
         table_name : string of table name.
         input : data source for table.
                 cudf.Dataframe, dask_cudf.DataFrame, pandas.DataFrame,
-                filepath for csv, orc, parquet, etc...
+                filepath for csv, orc, parquet, etc... A directory path
+                reads the files in it and in its first level folders,
+                except the folders whose names start with '_' or '.'.
+                Without a dask client, a pyarrow.Table or pandas.DataFrame
+                stays in host memory and each query copies to the GPU only
+                the columns it reads. Those columns are copied whole when the
+                query starts, so together they must fit in device memory.
+        lazy (optional) : for files, when True the table is registered only
+                with the schema of its first path (or the given schema) and
+                the files are listed, and their metadata collected, the first
+                time a query uses the table.
+                default: False
+        schema (optional) : with lazy=True, a list of tuples of the column
+                name and column type used as the schema of the table instead
+                of parsing its first path, of the form
+                schema=[('col_nameA', 'int32'), ('col_nameB', 'str')]
 
         Examples
         --------
@@ -1490,14 +2928,57 @@ class BlazingContext(object):
 
         Docs: https://docs.blazingdb.com/docs/create_table
         """
+        table = self._make_table(table_name, input, **kwargs)
+        if table is not None:
+            self.add_remove_table(table_name, True, table)
 
+    def create_tables(self, tables, **kwargs):
+        """
+        Create many BlazingSQL tables at once.
+
+        All the tables are built first and then registered in the catalog in
+        a single step, which is much faster than calling create_table for
+        each one of them when registering hundreds of tables.
+
+        Parameters
+        ----------
+
+        tables : dictionary of table names to data sources. A data source can
+                be any input accepted by create_table, or a tuple of the input
+                and a dictionary with the create_table parameters for that
+                table.
+        kwargs (optional) : create_table parameters used for all the tables.
+
+        Examples
+        --------
+
+        >>> bc.create_tables({
+        >>>     'nation': 'tpch/nation/*.parquet',
+        >>>     'region': ('tpch/region.psv', {'delimiter': '|'}),
+        >>> })
+        """
+        new_tables = OrderedDict()
+        for table_name, table_input in tables.items():
+            table_kwargs = dict(kwargs)
+            if isinstance(table_input, tuple):
+                table_input, input_kwargs = table_input
+                table_kwargs.update(input_kwargs)
+            table = self._make_table(table_name, table_input, **table_kwargs)
+            if table is not None:
+                new_tables[table_name] = table
+
+        self.add_tables(new_tables)
+
+    def _make_table(self, table_name, input, **kwargs):
         logging.info("create_table start for " + table_name)
 
         table = None
         extra_kwargs = {}
-        in_file = []
         is_hive_input = False
+        hive_schema = None
         extra_columns = []
+        lazy = kwargs.pop("lazy", False)
+        user_schema = kwargs.pop("schema", None)
 
         # See datasource.file_format
         file_format_hint = kwargs.get("file_format", "undefined")
@@ -1572,7 +3053,11 @@ class BlazingContext(object):
                 extra_columns,
                 hive_schema,
             ) = get_hive_table(
-                input, hive_table_name, hive_database_name, user_partitions
+                input,
+                hive_table_name,
+                hive_database_name,
+                user_partitions,
+                self.hive_metadata_cache,
             )
 
             if file_format_hint == "undefined":
@@ -1652,7 +3137,12 @@ class BlazingContext(object):
             ]
 
         if isinstance(input, pandas.DataFrame):
-            input = cudf.DataFrame.from_pandas(input)
+            if self.dask_client is not None:
+                input = cudf.DataFrame.from_pandas(input)
+            else:
+                # the data stays on the host, only the columns read by each
+                # query are copied to the GPU, like for arrow tables
+                input = pyarrow.Table.from_pandas(input, preserve_index=False)
 
         if isinstance(input, pyarrow.Table):
             if self.dask_client is not None:
@@ -1678,127 +3168,233 @@ class BlazingContext(object):
             # if we are using user defined partitions without hive,
             # we want to ignore paths we dont find.
             ignore_missing_paths = user_partitions_schema is not None
-            parsedSchema = self._parseSchema(
-                input, file_format_hint, kwargs, extra_columns, ignore_missing_paths
+            load_table = functools.partial(
+                self._make_file_table,
+                table_name,
+                file_format_hint=file_format_hint,
+                kwargs=kwargs,
+                extra_columns=extra_columns,
+                ignore_missing_paths=ignore_missing_paths,
+                is_hive_input=is_hive_input,
+                hive_schema=hive_schema,
+                user_partitions=user_partitions,
             )
-
-            if is_hive_input or user_partitions is not None:
-                uri_values = get_uri_values(
-                    parsedSchema["files"],
-                    hive_schema["partitions"],
-                    hive_schema["location"],
+            if lazy:
+                table = self._make_lazy_table(
+                    table_name, input, user_schema, load_table
                 )
-                num_cols = len(parsedSchema["names"])
-                num_partition_cols = len(extra_columns)
-                in_file = [True] * (num_cols - num_partition_cols) + [
-                    False
-                ] * num_partition_cols
             else:
-                uri_values = []
+                table = load_table(input)
 
-            file_type = parsedSchema["file_type"]
+        elif isinstance(input, dask_cudf.core.DataFrame):
             table = BlazingTable(
-                table_name,
+                table_name, input, DataType.DASK_CUDF, client=self.dask_client
+            )
+
+        if table is not None:
+            table.row_count, table.column_statistics = get_table_statistics(table)
+
+        return table
+
+    def _make_file_table(
+        self,
+        table_name,
+        input,
+        file_format_hint,
+        kwargs,
+        extra_columns,
+        ignore_missing_paths,
+        is_hive_input,
+        hive_schema,
+        user_partitions,
+        sample=False,
+    ):
+        # builds the table of a list of paths. When sample is True only the
+        # schema is parsed, without slicing the files nor reading metadata
+        in_file = []
+        parsedSchema = self._parseSchema(
+            input, file_format_hint, kwargs, extra_columns, ignore_missing_paths
+        )
+
+        if is_hive_input or user_partitions is not None:
+            uri_values = get_uri_values(
                 parsedSchema["files"],
-                file_type,
-                files=parsedSchema["files"],
-                datasource=parsedSchema["datasource"],
-                calcite_to_file_indices=parsedSchema["calcite_to_file_indices"],
-                args=parsedSchema["args"],
-                uri_values=uri_values,
-                in_file=in_file,
+                hive_schema["partitions"],
+                hive_schema["location"],
             )
+            num_cols = len(parsedSchema["names"])
+            num_partition_cols = len(extra_columns)
+            in_file = [True] * (num_cols - num_partition_cols) + [
+                False
+            ] * num_partition_cols
+        else:
+            uri_values = []
 
-            if is_hive_input:
-                # table.column_names are the official schema column_names
-                table.column_names = hive_schema["column_names"]
-                # table.file_column_names are the column_names used by
-                # the file (may be different)
-                table.file_column_names = parsedSchema["names"]
-                merged_types = []
-                len_hive_column_types = len(hive_schema["column_types"])
-                if len_hive_column_types == len(parsedSchema["types"]):
-                    for i in range(len(parsedSchema["types"])):
-                        # if the type parsed from the file is 0 we want
-                        # to use the one from Hive
-                        if parsedSchema["types"][i] == 0:
-                            merged_types.append(hive_schema["column_types"][i])
-                        else:
-                            merged_types.append(parsedSchema["types"][i])
-                else:
-                    print(
-                        """ERROR: number of hive_schema columns does not
-                        match number of parsedSchema columns"""
-                    )
-                    logging.error(
-                        """ERROR: number of hive_schema columns does not
-                        match number of parsedSchema columns"""
-                    )
+        file_type = parsedSchema["file_type"]
+        table = BlazingTable(
+            table_name,
+            parsedSchema["files"],
+            file_type,
+            files=parsedSchema["files"],
+            datasource=parsedSchema["datasource"],
+            calcite_to_file_indices=parsedSchema["calcite_to_file_indices"],
+            args=parsedSchema["args"],
+            uri_values=uri_values,
+            in_file=in_file,
+        )
 
-                table.column_types = merged_types
+        if is_hive_input:
+            # table.column_names are the official schema column_names
+            table.column_names = hive_schema["column_names"]
+            # table.file_column_names are the column_names used by
+            # the file (may be different)
+            table.file_column_names = parsedSchema["names"]
+            merged_types = []
+            len_hive_column_types = len(hive_schema["column_types"])
+            if len_hive_column_types == len(parsedSchema["types"]):
+                for i in range(len(parsedSchema["types"])):
+                    # if the type parsed from the file is 0 we want
+                    # to use the one from Hive
+                    if parsedSchema["types"][i] == 0:
+                        merged_types.append(hive_schema["column_types"][i])
+                    else:
+                        merged_types.append(parsedSchema["types"][i])
             else:
-                # table.column_names are the official schema column_names
-                table.column_names = parsedSchema["names"]
-                # table.file_column_names are the column_names used by
-                # the file (may be different
-                table.file_column_names = parsedSchema["names"]
-                table.column_types = parsedSchema["types"]
+                print(
+                    """ERROR: number of hive_schema columns does not
+                    match number of parsedSchema columns"""
+                )
+                logging.error(
+                    """ERROR: number of hive_schema columns does not
+                    match number of parsedSchema columns"""
+                )
 
-            table.slices = table.getSlices(len(self.nodes))
+            table.column_types = merged_types
+        else:
+            # table.column_names are the official schema column_names
+            table.column_names = parsedSchema["names"]
+            # table.file_column_names are the column_names used by
+            # the file (may be different
+            table.file_column_names = parsedSchema["names"]
+            table.column_types = parsedSchema["types"]
 
-            if len(uri_values) > 0:
-                parsedMetadata = parseHiveMetadata(table, uri_values)
-                table.metadata = parsedMetadata
+        if sample:
+            return table
 
-            if parsedSchema["file_type"] == DataType.PARQUET:
-                parsedMetadata = self._parseMetadata(
-                    file_format_hint, table.slices, parsedSchema, kwargs
-                )
+        table.slices = table.getSlices(len(self.nodes))
 
-                if isinstance(parsedMetadata, dask_cudf.core.DataFrame):
-                    parsedMetadata = parsedMetadata.compute()
-                    parsedMetadata = parsedMetadata.reset_index()
+        if len(uri_values) > 0:
+            parsedMetadata = parseHiveMetadata(table, uri_values)
+            table.metadata = parsedMetadata
 
-                if len(uri_values) > 0:
-                    table.metadata = mergeMetadata(
-                        table, parsedMetadata, table.metadata
-                    )
-                else:
-                    table.metadata = parsedMetadata
-
-                # lets make sure that the number of files from the metadata
-                # actually matches the number of files.
-                # this is to handle the cases where there is a file
-                # that does not actually have data
-                # files that do not have data wont show up in the metadata
-                # and we will want to remove them from the table schema
-                file_groups = table.metadata.groupby("file_handle_index")._grouped()
-                if len(file_groups) != len(table.files):
-                    table.metadata, table.files = adjust_due_missing_rowgroups(
-                        table.metadata, table.files
-                    )
+        if parsedSchema["file_type"] == DataType.PARQUET:
+            parsedMetadata = self._parseMetadata(
+                file_format_hint, table.slices, parsedSchema, kwargs
+            )
 
-                # now lets get the row_groups_ids from the metadata
-                metadata_ids = table.metadata[
-                    ["file_handle_index", "row_group_index"]
-                ].to_pandas()
-                grouped = metadata_ids.groupby("file_handle_index")
-                row_groups_ids = []
-                for group_id in grouped.groups:
-                    row_indices = grouped.groups[group_id].values.tolist()
-                    row_meta_ids = metadata_ids["row_group_index"]
-                    row_groups_col = row_meta_ids.values.tolist()
-                    row_group_ids = [row_groups_col[i] for i in row_indices]
-                    row_groups_ids.append(row_group_ids)
-                table.row_groups_ids = row_groups_ids
+            if isinstance(parsedMetadata, dask_cudf.core.DataFrame):
+                parsedMetadata = parsedMetadata.compute()
+                parsedMetadata = parsedMetadata.reset_index()
 
-        elif isinstance(input, dask_cudf.core.DataFrame):
-            table = BlazingTable(
-                table_name, input, DataType.DASK_CUDF, client=self.dask_client
+            if len(uri_values) > 0:
+                table.metadata = mergeMetadata(
+                    table, parsedMetadata, table.metadata
+                )
+            else:
+                table.metadata = parsedMetadata
+
+            # lets make sure that the number of files from the metadata
+            # actually matches the number of files.
+            # this is to handle the cases where there is a file
+            # that does not actually have data
+            # files that do not have data wont show up in the metadata
+            # and we will want to remove them from the table schema
+            num_file_groups = table.metadata["file_handle_index"].nunique()
+            if num_file_groups != len(table.files):
+                table.metadata, table.files = adjust_due_missing_rowgroups(
+                    table.metadata, table.files
+                )
+
+            # now lets get the row groups of each file from the metadata
+            (
+                _,
+                table.row_group_offsets,
+                table.row_group_ids,
+            ) = group_row_groups_by_file(
+                table.metadata["file_handle_index"].to_array(),
+                table.metadata["row_group_index"].to_array(),
             )
 
-        if table is not None:
-            self.add_remove_table(table_name, True, table)
+        return table
+
+    def _make_lazy_table(self, table_name, input, user_schema, load_table):
+        # the table is registered with the schema given by the user, or else
+        # with the one of its first path, and load_table lists all the files
+        # and collects their metadata the first time a query uses the table
+        # (see _load_lazy_tables)
+        if user_schema is not None:
+            table = BlazingTable(table_name, input, DataType.UNDEFINED)
+            table.column_names = [name for name, dtype in user_schema]
+            table.file_column_names = table.column_names
+            table.column_types = [
+                convertTypeNameStrToCudfType(dtype) for name, dtype in user_schema
+            ]
+        else:
+            table = load_table(input[:1], sample=True)
+        table.lazy_loader = functools.partial(load_table, input)
+        table.lazy_lock = Lock()
+        return table
+
+    def _load_lazy_tables(self, table_names):
+        # replaces the tables created with lazy=True by the fully loaded
+        # ones, only once per table even when many queries use it at the
+        # same time. Returns True when the files of one of the tables it
+        # loaded don't have the schema the table was created with, so the
+        # plans that used that schema are wrong
+        schema_changed = False
+        for table_name in table_names:
+            table = self.tables.get(table_name)
+            if table is None or table.lazy_loader is None:
+                continue
+            with table.lazy_lock:
+                if table.lazy_loader is None:
+                    continue
+                logging.info("loading lazy table " + table_name)
+                loaded_table = table.lazy_loader()
+                (
+                    loaded_table.row_count,
+                    loaded_table.column_statistics,
+                ) = get_table_statistics(loaded_table)
+
+                def to_str(names):
+                    return [
+                        name.decode() if isinstance(name, bytes) else name
+                        for name in names
+                    ]
+
+                if to_str(loaded_table.column_names) != to_str(
+                    table.column_names
+                ) or list(loaded_table.column_types) != list(table.column_types):
+                    logging.info(
+                        "the schema of the files of table "
+                        + table_name
+                        + " does not match the schema it was created with"
+                    )
+                    schema_changed = True
+
+                self.planner_lock.acquire()
+                self.lock.acquire()
+                try:
+                    # unless the table was dropped or created again meanwhile
+                    if self.tables.get(table_name) is table:
+                        self._add_table(table_name, loaded_table)
+                        self.result_cache.invalidate(table_name)
+                        self.catalog_version = self.catalog_version + 1
+                finally:
+                    self.lock.release()
+                    self.planner_lock.release()
+                table.lazy_loader = None
+        return schema_changed
 
     def drop_table(self, table_name):
         """
@@ -1822,6 +3418,233 @@ class BlazingContext(object):
         """
         self.add_remove_table(table_name, False)
 
+    def save_catalog(self, path):
+        """
+        Saves the file tables of the BlazingContext, with their schema, files,
+        row groups and metadata, so that load_catalog can register them again
+        without parsing the files. Raises a TypeError when the arguments a
+        table was created with can not be saved (only numbers, strings,
+        booleans, None and lists of them can).
+
+        Parameters
+        ----------
+
+        path : directory where the catalog is written.
+
+        Examples
+        --------
+
+        >>> bc.create_table('taxi', '/home/user/taxi/*.parquet')
+        >>> bc.save_catalog('/home/user/catalog')
+        """
+        self._load_lazy_tables(list(self.tables.keys()))
+        tables = list(self.tables.items())
+        # the args of all the tables are converted before anything is written
+        tables_args = {
+            table_name: args_to_json(table.args) for table_name, table in tables
+        }
+        os.makedirs(path, exist_ok=True)
+
+        entries = []
+        for table_name, table in tables:
+            if table.files is None or table.fileType not in (
+                DataType.PARQUET,
+                DataType.ORC,
+                DataType.CSV,
+                DataType.JSON,
+            ):
+                print("WARNING: table " + table_name + " is not saved to the catalog")
+                logging.warning(
+                    "WARNING: table " + table_name + " is not saved to the catalog"
+                )
+                continue
+
+            prefix = str(len(entries))
+            statuses = self._getFileStatuses([file.decode() for file in table.files])
+            columns = [
+                pyarrow.array(table.files, type=pyarrow.binary()),
+                pyarrow.array([size for size, mtime in statuses], pyarrow.uint64()),
+                pyarrow.array([mtime for size, mtime in statuses], pyarrow.uint64()),
+            ]
+            names = ["file", "size", "modification_time"]
+            # the tables without row groups (csv, json or no metadata) have
+            # no list per file, they are given to the engine as no row groups
+            # either way
+            if (
+                table.row_group_offsets is not None
+                and len(table.row_group_offsets) == len(table.files) + 1
+            ):
+                # the row groups of each file, in CSR form like in the table
+                columns.append(
+                    pyarrow.ListArray.from_arrays(
+                        pyarrow.array(np.asarray(table.row_group_offsets, np.int32)),
+                        pyarrow.array(np.asarray(table.row_group_ids, np.int32)),
+                    )
+                )
+                names.append("row_group_ids")
+            write_arrow_file(
+                os.path.join(path, prefix + "_files.arrow"),
+                pyarrow.Table.from_arrays(columns, names),
+            )
+
+            metadata = table.metadata
+            if isinstance(metadata, dask_cudf.core.DataFrame):
+                metadata = metadata.compute()
+            if metadata is not None:
+                write_arrow_file(
+                    os.path.join(path, prefix + "_metadata.arrow"),
+                    metadata.to_arrow(preserve_index=False),
+                )
+
+            entries.append(
+                {
+                    "name": table_name,
+                    "prefix": prefix,
+                    "file_type": int(table.fileType),
+                    "datasource": [file.decode() for file in table.datasource],
+                    "column_names": names_to_json(table.column_names),
+                    "file_column_names": names_to_json(table.file_column_names),
+                    "column_types": [int(dtype) for dtype in table.column_types],
+                    "calcite_to_file_indices": table.calcite_to_file_indices,
+                    "args": tables_args[table_name],
+                    "uri_values": table.uri_values,
+                    "in_file": table.in_file,
+                    "has_metadata": metadata is not None,
+                    "row_count": table.row_count,
+                    "column_statistics": table.column_statistics,
+                }
+            )
+
+        catalog = {"version": CATALOG_FORMAT_VERSION, "tables": entries}
+        temp_path = os.path.join(path, "catalog.json." + str(os.getpid()) + ".tmp")
+        with open(temp_path, "w") as catalog_file:
+            json.dump(catalog, catalog_file)
+        os.replace(temp_path, os.path.join(path, "catalog.json"))
+
+    def load_catalog(self, path, validate=False):
+        """
+        Registers the tables of a catalog written by save_catalog, without
+        reading the data files.
+
+        Parameters
+        ----------
+
+        path : directory of the catalog.
+        validate (optional) : when True, the size and modification time of
+                the files of each table are checked and the tables whose files
+                changed since the catalog was saved are not loaded.
+                default: False
+
+        Returns
+        -------
+
+        The names of the tables that were loaded.
+
+        Examples
+        --------
+
+        >>> bc.load_catalog('/home/user/catalog', validate=True)
+        ['taxi']
+        """
+        with open(os.path.join(path, "catalog.json")) as catalog_file:
+            catalog = json.load(catalog_file)
+        if catalog["version"] != CATALOG_FORMAT_VERSION:
+            message = "ERROR: unsupported catalog version " + str(catalog["version"])
+            print(message)
+            logging.error(message)
+            return []
+
+        tables = {}
+        for entry in catalog["tables"]:
+            table_name = entry["name"]
+            prefix = entry["prefix"]
+            files_table = read_arrow_file(os.path.join(path, prefix + "_files.arrow"))
+            files = files_table.column("file").to_pylist()
+
+            if validate:
+                saved_statuses = zip(
+                    files_table.column("size").to_pylist(),
+                    files_table.column("modification_time").to_pylist(),
+                )
+                statuses = self._getFileStatuses([file.decode() for file in files])
+                # the modification time is 0 when it is unknown, then only the
+                # size of the file is compared
+                changed = any(
+                    size != saved_size or mtime != saved_mtime
+                    for (size, mtime), (saved_size, saved_mtime) in zip(
+                        statuses, saved_statuses
+                    )
+                )
+                if changed:
+                    print(
+                        "WARNING: the files of table "
+                        + table_name
+                        + " changed since the catalog was saved, it is not loaded"
+                    )
+                    logging.warning(
+                        "WARNING: the files of table "
+                        + table_name
+                        + " changed since the catalog was saved, it is not loaded"
+                    )
+                    continue
+
+            row_group_offsets, row_group_ids = None, None
+            if "row_group_ids" in files_table.column_names:
+                if files_table.num_rows == 0:
+                    row_group_offsets, row_group_ids = row_groups_to_csr([])
+                else:
+                    row_groups = files_table.column("row_group_ids").chunk(0)
+                    row_group_offsets = np.asarray(row_groups.offsets, np.int64)
+                    row_group_ids = np.asarray(row_groups.flatten(), np.int32)
+
+            metadata = None
+            if entry["has_metadata"]:
+                metadata = cudf.DataFrame.from_arrow(
+                    read_arrow_file(os.path.join(path, prefix + "_metadata.arrow"))
+                )
+
+            table = BlazingTable(
+                table_name,
+                files,
+                DataType(entry["file_type"]),
+                files=files,
+                datasource=[file.encode() for file in entry["datasource"]],
+                calcite_to_file_indices=entry["calcite_to_file_indices"],
+                args=entry["args"],
+                uri_values=[
+                    [tuple(value) for value in values] for values in entry["uri_values"]
+                ],
+                in_file=entry["in_file"],
+                metadata=metadata,
+                row_group_offsets=row_group_offsets,
+                row_group_ids=row_group_ids,
+            )
+            table.column_names = names_from_json(entry["column_names"])
+            table.file_column_names = names_from_json(entry["file_column_names"])
+            table.column_types = entry["column_types"]
+            table.row_count = entry["row_count"]
+            table.column_statistics = [
+                tuple(statistics) for statistics in entry["column_statistics"]
+            ]
+            table.slices = table.getSlices(len(self.nodes))
+            tables[table_name] = table
+
+        self.add_tables(tables)
+        return list(tables.keys())
+
+    def _getFileStatuses(self, files):
+        # the size and modification time of the files, as seen by the workers
+        if self.dask_client:
+            worker = tuple(self.dask_client.scheduler_info()["workers"])[0]
+            connection = self.dask_client.submit(
+                cio.getFileStatusesCaller,
+                files,
+                self.footer_reader_threads,
+                workers=[worker],
+            )
+            return connection.result()
+        return cio.getFileStatusesCaller(files, self.footer_reader_threads)
+
     def _parseSchema(
         self, input, file_format_hint, kwargs, extra_columns, ignore_missing_paths
     ):
@@ -1851,12 +3674,15 @@ class BlazingContext(object):
                 file_subset = [file.decode() for file in all_files]
                 if len(file_subset) > 0:
                     connection = self.dask_client.submit(
-                        cio.parseMetadataCaller,
+                        parseMetadataWithCache,
                         file_subset,
                         currentTableNodes[worker_id].offset,
                         schema,
                         file_format_hint,
                         kwargs,
+                        self.footer_reader_threads,
+                        self.footer_reader_retries,
+                        self.parquet_metadata_cache_dir,
                         workers=[worker],
                     )
                     dask_futures.append(connection)
@@ -1864,63 +3690,184 @@ class BlazingContext(object):
 
         else:
             files = [file.decode() for file in currentTableNodes[0].files]
-            return cio.parseMetadataCaller(
-                files, currentTableNodes[0].offset, schema, file_format_hint, kwargs
+            return parseMetadataWithCache(
+                files,
+                currentTableNodes[0].offset,
+                schema,
+                file_format_hint,
+                kwargs,
+                self.footer_reader_threads,
+                self.footer_reader_retries,
+                self.parquet_metadata_cache_dir,
             )
 
-    def _sliceRowGroups(self, numSlices, files, uri_values, row_groups_ids):
-        total_num_rowgroups = sum([len(x) for x in row_groups_ids])
-        file_index_per_rowgroups = [
-            file_index
-            for file_index, row_groups_for_file in enumerate(row_groups_ids)
-            for row_group in row_groups_for_file
-        ]
-        flattened_rowgroup_ids = [
-            row_group
-            for row_groups_for_file in row_groups_ids
-            for row_group in row_groups_for_file
-        ]
+    def _sliceRowGroups(
+        self,
+        numSlices,
+        files,
+        uri_values,
+        row_group_offsets,
+        row_group_ids,
+        weights=None,
+    ):
+        # splits the row groups in numSlices slices of about the same size,
+        # using the weight of each row group (its size in bytes or number of
+        # rows, see get_row_group_weights) or the number of row groups when
+        # there are no weights. Returns the files, uri_values and
+        # (row_group_offsets, row_group_ids) of each slice
+        if weights is None:
+            weights = np.ones(len(row_group_ids), dtype=np.int64)
+        counts = np.diff(row_group_offsets)
+        file_index_per_rowgroups = np.repeat(np.arange(len(files)), counts)
+        file_weights = np.bincount(
+            file_index_per_rowgroups, weights=weights, minlength=len(files)
+        )
+
+        # the files bigger than an even share are split in row group chunks
+        # so they can be read by several nodes
+        target = max(file_weights.sum() / numSlices, 1)
+        pieces = np.maximum(np.ceil(file_weights / target), 1)
+        max_row_groups = np.maximum(np.ceil(counts / pieces), 1).astype(np.int64)
+        batch_files, batch_offsets, batch_ids, batch_weights = make_scan_batches(
+            row_group_offsets, row_group_ids, weights, max_row_groups
+        )
+        batch_lengths = np.diff(batch_offsets)
+        slice_of_batch = assign_slices_lpt(batch_weights, numSlices)
 
         all_sliced_files = []
         all_sliced_uri_values = []
-        all_sliced_row_groups_ids = []
-        remaining = total_num_rowgroups
-        startIndex = 0
+        all_sliced_row_groups = []
         for i in range(0, numSlices):
-            batchSize = int(remaining / (numSlices - i))
-            file_indexes_for_slice = file_index_per_rowgroups[
-                startIndex : startIndex + batchSize
+            # the batches of each slice are read in the order of the files
+            selected = np.flatnonzero(slice_of_batch == i)
+            selected = selected[
+                np.lexsort(
+                    (
+                        batch_ids[batch_offsets[selected]],
+                        batch_files[selected],
+                    )
+                )
             ]
-            unique_file_indexes_for_slice = list(
-                dict.fromkeys(file_indexes_for_slice)
-            )  # lets get the unique indexes, but preserving order
-            sliced_files = [files[i] for i in unique_file_indexes_for_slice]
+            lengths = batch_lengths[selected]
+            sliced_offsets = np.zeros(len(selected) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=sliced_offsets[1:])
+            gather = np.arange(sliced_offsets[-1]) + np.repeat(
+                batch_offsets[selected] - sliced_offsets[:-1], lengths
+            )
+            sliced_ids = batch_ids[gather]
+
+            sliced_files = [files[f] for f in batch_files[selected].tolist()]
             if uri_values is not None and len(uri_values) > 0:
                 sliced_uri_values = [
-                    uri_values[i] for i in unique_file_indexes_for_slice
+                    uri_values[f] for f in batch_files[selected].tolist()
                 ]
             else:
                 sliced_uri_values = []
 
-            sliced_rowgroup_ids = []
-            last_file_index = None
-            for ind, file_index in enumerate(file_indexes_for_slice):
-                if last_file_index is None or file_index != last_file_index:
-                    sliced_rowgroup_ids.append([])
-                sliced_rowgroup_ids[-1].append(flattened_rowgroup_ids[ind + startIndex])
-                last_file_index = file_index
-
-            startIndex = startIndex + batchSize
-            remaining = remaining - batchSize
-
             all_sliced_files.append(sliced_files)
             all_sliced_uri_values.append(sliced_uri_values)
-            all_sliced_row_groups_ids.append(sliced_rowgroup_ids)
+            all_sliced_row_groups.append((sliced_offsets, sliced_ids))
+
+        return (all_sliced_files, all_sliced_uri_values, all_sliced_row_groups)
+
+    def _getBalancedSlices(
+        self, current_table, file_indices, row_group_offsets, row_group_ids
+    ):
+        # one slice per node, balanced by the size of the row groups
+        weights = get_row_group_weights(
+            current_table.metadata, file_indices, row_group_offsets, row_group_ids
+        )
+        num_uri_values = len(current_table.uri_values)
+        files = []
+        uri_values = []
+        for file_index in np.asarray(file_indices).tolist():
+            files.append(current_table.files[file_index])
+            if file_index < num_uri_values:
+                uri_values.append(current_table.uri_values[file_index])
+
+        (
+            all_sliced_files,
+            all_sliced_uri_values,
+            all_sliced_row_groups,
+        ) = self._sliceRowGroups(
+            len(self.nodes),
+            files,
+            uri_values,
+            row_group_offsets,
+            row_group_ids,
+            weights=weights,
+        )
 
-        return (all_sliced_files, all_sliced_uri_values, all_sliced_row_groups_ids)
+        nodeFilesList = []
+        for i, node in enumerate(self.nodes):
+            bt = BlazingTable(
+                current_table.name,
+                current_table.input,
+                current_table.fileType,
+                files=all_sliced_files[i],
+                calcite_to_file_indices=current_table.calcite_to_file_indices,
+                uri_values=all_sliced_uri_values[i],
+                args=current_table.args,
+                row_group_offsets=all_sliced_row_groups[i][0],
+                row_group_ids=all_sliced_row_groups[i][1],
+                in_file=current_table.in_file,
+            )
+            bt.column_names = current_table.column_names
+            bt.file_column_names = current_table.file_column_names
+            bt.column_types = current_table.column_types
+            nodeFilesList.append(bt)
+        return nodeFilesList
+
+    def _getDynamicScanSlices(
+        self, current_table, file_indices, row_group_offsets, row_group_ids
+    ):
+        # every node gets all the batches of the table, and the engine hands
+        # them out to the nodes as they ask for more work
+        # (see SCAN_ASSIGNMENT_MODE)
+        file_indices = np.asarray(file_indices, dtype=np.int64)
+        if row_group_offsets is not None and len(row_group_ids) > 0:
+            weights = get_row_group_weights(
+                current_table.metadata, file_indices, row_group_offsets, row_group_ids
+            )
+            num_batches = len(self.nodes) * SCAN_BATCHES_PER_NODE
+            max_row_groups = max(1, -(-len(row_group_ids) // num_batches))
+            (
+                batch_files,
+                row_group_offsets,
+                row_group_ids,
+                _,
+            ) = make_scan_batches(
+                row_group_offsets, row_group_ids, weights, max_row_groups
+            )
+            file_indices = file_indices[batch_files]
+
+        num_uri_values = len(current_table.uri_values)
+        files = []
+        uri_values = []
+        for file_index in file_indices.tolist():
+            files.append(current_table.files[file_index])
+            if file_index < num_uri_values:
+                uri_values.append(current_table.uri_values[file_index])
+
+        bt = BlazingTable(
+            current_table.name,
+            current_table.input,
+            current_table.fileType,
+            files=files,
+            calcite_to_file_indices=current_table.calcite_to_file_indices,
+            uri_values=uri_values,
+            args=current_table.args,
+            row_group_offsets=row_group_offsets,
+            row_group_ids=row_group_ids,
+            in_file=current_table.in_file,
+        )
+        bt.column_names = current_table.column_names
+        bt.file_column_names = current_table.file_column_names
+        bt.column_types = current_table.column_types
+        return [bt for node in self.nodes]
 
     def _optimize_skip_data_getSlices(
-        self, current_table, scan_table_query, single_gpu
+        self, current_table, scan_table_query, single_gpu, dynamic_scans=False
     ):
         nodeFilesList = []
 
@@ -1946,25 +3893,31 @@ class BlazingContext(object):
         if not skipdata_analysis_fail:
             actual_files = []
             uri_values = []
-            row_groups_ids = []
+            file_indices = np.zeros(0, dtype=np.int64)
+            row_group_offsets = np.zeros(1, dtype=np.int64)
+            row_group_ids = np.zeros(0, dtype=np.int32)
 
             if (
                 not file_indices_and_rowgroup_indices.empty
             ):  # skipdata did not filter everything
-                file_and_rowgroup_indices = (
-                    file_indices_and_rowgroup_indices.to_pandas()
+                (
+                    file_indices,
+                    row_group_offsets,
+                    row_group_ids,
+                ) = group_row_groups_by_file(
+                    file_indices_and_rowgroup_indices["file_handle_index"].to_array(),
+                    file_indices_and_rowgroup_indices["row_group_index"].to_array(),
+                )
+                num_uri_values = len(current_table.uri_values)
+                for file_index in file_indices.tolist():
+                    actual_files.append(current_table.files[file_index])
+                    if file_index < num_uri_values:
+                        uri_values.append(current_table.uri_values[file_index])
+
+            if dynamic_scans:
+                return self._getDynamicScanSlices(
+                    current_table, file_indices, row_group_offsets, row_group_ids
                 )
-                grouped = file_and_rowgroup_indices.groupby("file_handle_index")
-                for group_id in grouped.groups:
-                    row_indices = grouped.groups[group_id].values.tolist()
-                    actual_files.append(current_table.files[group_id])
-                    if group_id < len(current_table.uri_values):
-                        uri_values.append(current_table.uri_values[group_id])
-                    row_groups_col = file_and_rowgroup_indices[
-                        "row_group_index"
-                    ].values.tolist()
-                    row_group_ids = [row_groups_col[i] for i in row_indices]
-                    row_groups_ids.append(row_group_ids)
 
             if self.dask_client is None:
                 curr_calcite = current_table.calcite_to_file_indices
@@ -1976,7 +3929,8 @@ class BlazingContext(object):
                     calcite_to_file_indices=curr_calcite,
                     uri_values=uri_values,
                     args=current_table.args,
-                    row_groups_ids=row_groups_ids,
+                    row_group_offsets=row_group_offsets,
+                    row_group_ids=row_group_ids,
                     in_file=current_table.in_file,
                 )
                 bt.column_names = current_table.column_names
@@ -1989,9 +3943,9 @@ class BlazingContext(object):
                     (
                         all_sliced_files,
                         all_sliced_uri_values,
-                        all_sliced_row_groups_ids,
+                        all_sliced_row_groups,
                     ) = self._sliceRowGroups(
-                        1, actual_files, uri_values, row_groups_ids
+                        1, actual_files, uri_values, row_group_offsets, row_group_ids
                     )
                     i = 0
                     curr_calcite = current_table.calcite_to_file_indices
@@ -2003,7 +3957,8 @@ class BlazingContext(object):
                         calcite_to_file_indices=curr_calcite,
                         uri_values=all_sliced_uri_values[i],
                         args=current_table.args,
-                        row_groups_ids=all_sliced_row_groups_ids[i],
+                        row_group_offsets=all_sliced_row_groups[i][0],
+                        row_group_ids=all_sliced_row_groups[i][1],
                         in_file=current_table.in_file,
                     )
                     bt.column_names = current_table.column_names
@@ -2011,36 +3966,28 @@ class BlazingContext(object):
                     bt.column_types = current_table.column_types
                     nodeFilesList.append(bt)
                 else:
-                    (
-                        all_sliced_files,
-                        all_sliced_uri_values,
-                        all_sliced_row_groups_ids,
-                    ) = self._sliceRowGroups(
-                        len(self.nodes), actual_files, uri_values, row_groups_ids
+                    nodeFilesList = self._getBalancedSlices(
+                        current_table, file_indices, row_group_offsets, row_group_ids
                     )
 
-                    for i, node in enumerate(self.nodes):
-                        curr_calcite = current_table.calcite_to_file_indices
-                        bt = BlazingTable(
-                            current_table.name,
-                            current_table.input,
-                            current_table.fileType,
-                            files=all_sliced_files[i],
-                            calcite_to_file_indices=curr_calcite,
-                            uri_values=all_sliced_uri_values[i],
-                            args=current_table.args,
-                            row_groups_ids=all_sliced_row_groups_ids[i],
-                            in_file=current_table.in_file,
-                        )
-                        bt.column_names = current_table.column_names
-                        bt.file_column_names = current_table.file_column_names
-                        bt.column_types = current_table.column_types
-                        nodeFilesList.append(bt)
-
             return nodeFilesList
         else:
+            if dynamic_scans:
+                return self._getDynamicScanSlices(
+                    current_table,
+                    np.arange(len(current_table.files)),
+                    current_table.row_group_offsets,
+                    current_table.row_group_ids,
+                )
             if single_gpu:
                 return current_table.getSlices(1)
+            elif current_table.row_group_offsets is not None:
+                return self._getBalancedSlices(
+                    current_table,
+                    np.arange(len(current_table.files)),
+                    current_table.row_group_offsets,
+                    current_table.row_group_ids,
+                )
             else:
                 return current_table.getSlices(len(self.nodes))
 
@@ -2103,6 +4050,35 @@ class BlazingContext(object):
                 result = dask.dataframe.from_delayed(dask_futures)
             return result
 
+    def prepare(self, query):
+        """
+        Parse, validate and optimize a query with ? placeholders once, so
+        that it can be run many times with different values without going
+        through Calcite again.
+
+        Parameters
+        ----------
+
+        query : string of SQL query, using ? for the parameters.
+
+        Examples
+        --------
+
+        >>> handle = bc.prepare('SELECT c_name FROM customer WHERE c_custkey = ?')
+        >>> result = handle.execute([123])
+        >>> result = handle.execute([456])
+        """
+        prepared_query = PreparedQuery(self, query)
+        if not prepared_query.prepare():
+            print("Parsing Error")
+            return
+        if "LogicalValues(tuples=[[]])" in prepared_query.algebra:
+            print(
+                """This SQL statement returns empty result.
+                Please double check your query."""
+            )
+        return prepared_query
+
     def sql(
         self,
         query,
@@ -2110,6 +4086,10 @@ class BlazingContext(object):
         return_futures=False,
         single_gpu=False,
         config_options={},
+        use_plan_cache=True,
+        priority=0,
+        owner=None,
+        use_result_cache=True,
     ):
         """
         Query a BlazingSQL table.
@@ -2133,6 +4113,21 @@ class BlazingContext(object):
                     set a specific set of config_options for this query
                     instead of the ones set in BlazingContext.
                     See BlazingContext for more info on this parameter
+        use_plan_cache (optional) : defaulted to true. Set to false to
+                    always generate the plan with Calcite, instead of
+                    reusing a previously generated plan for the same query.
+        priority (optional) :       defaulted to 0. When the number of
+                    concurrent queries is limited (see
+                    MAX_CONCURRENT_QUERIES_PER_WORKER), waiting queries with
+                    a higher priority are admitted first.
+        owner (optional) :          defaulted to None. Any hashable that
+                    identifies who runs the query (e.g. a user name). Waiting
+                    queries with the same priority are admitted so that the
+                    workers are shared fairly among owners.
+        use_result_cache (optional) : defaulted to true. Set to false to
+                    always run the query instead of returning a cached
+                    result, when the result cache is enabled (see
+                    RESULT_CACHE_HOST_MEMORY).
 
         Examples
         --------
@@ -2177,17 +4172,9 @@ class BlazingContext(object):
 
         Docs: https://docs.blazingdb.com/docs/single-gpu
         """
-        # TODO: remove hardcoding
-        masterIndex = 0
-        nodeTableList = [[] for _ in range(len(self.nodes))]
-        if single_gpu:
-            nodeTableList = [
-                [],
-            ]
-        fileTypes = []
-
-        if algebra is None:
-            algebra = self.explain(query)
+        algebra, plan, _, table_names, table_scans = self._get_query_plan(
+            query, algebra, use_plan_cache, single_gpu
+        )
 
         # when an empty `LogicalValues` appears on the optimized plan
         # there aren't neither BindableTableScan nor TableScan nor Project
@@ -2203,6 +4190,86 @@ class BlazingContext(object):
             print("Parsing Error")
             return
 
+        if plan is None:
+            plan = get_plan(algebra)
+
+        use_result_cache = (
+            use_result_cache
+            and self.result_cache.enabled()
+            and self.dask_client is None
+            and not return_futures
+        )
+        if use_result_cache:
+            table_versions = tuple(
+                (name, get_table_version(self.tables[name], self._getFileStatuses))
+                for name in table_names
+            )
+            # the results of tables with an unknown version are not cached
+            use_result_cache = all(
+                version is not None for name, version in table_versions
+            )
+        if use_result_cache:
+            result_key = (plan, table_versions)
+            result = self.result_cache.get(result_key)
+            if result is not None:
+                return result
+
+        try:
+            result = self._run_plan(
+                plan,
+                table_names,
+                table_scans,
+                return_futures=return_futures,
+                single_gpu=single_gpu,
+                config_options=config_options,
+                priority=priority,
+                owner=owner,
+                raise_errors=use_result_cache,
+            )
+        except cio.RunQueryError as e:
+            # the empty result of a failed query is not cached
+            print(">>>>>>>> ", e)
+            return cudf.DataFrame()
+
+        if use_result_cache:
+            self.result_cache.put(result_key, table_names, result)
+        return result
+
+    def _get_table_scan_info(self, algebra, single_gpu=False):
+        if self.dask_client is None or single_gpu is True:
+            return cio.getTableScanInfoCaller(algebra)
+        else:
+            worker = tuple(self.dask_client.scheduler_info()["workers"])[0]
+            connection = self.dask_client.submit(
+                cio.getTableScanInfoCaller, algebra, workers=[worker]
+            )
+            return connection.result()
+
+    def _run_plan(
+        self,
+        plan,
+        table_names,
+        table_scans,
+        return_futures=False,
+        single_gpu=False,
+        config_options={},
+        priority=0,
+        owner=None,
+        ticket=None,
+        raise_errors=False,
+    ):
+        # a ticket is given when the query was already admitted by sql_async,
+        # with raise_errors the errors of the engine are not turned into an
+        # empty result
+        # TODO: remove hardcoding
+        masterIndex = 0
+        nodeTableList = [[] for _ in range(len(self.nodes))]
+        if single_gpu:
+            nodeTableList = [
+                [],
+            ]
+        fileTypes = []
+
         if len(config_options) == 0:
             query_config_options = self.config_options
         else:
@@ -2212,20 +4279,28 @@ class BlazingContext(object):
                     config_options[option]
                 ).encode()  # make sure all options are encoded strings
 
-        if self.dask_client is None or single_gpu is True:
-            table_names, table_scans = cio.getTableScanInfoCaller(algebra)
-        else:
-            worker = tuple(self.dask_client.scheduler_info()["workers"])[0]
-            connection = self.dask_client.submit(
-                cio.getTableScanInfoCaller, algebra, workers=[worker]
+        # the lazy tables were loaded before the query was planned, unless
+        # they were created again since then
+        if self._load_lazy_tables(table_names):
+            raise ValueError(
+                "The files of a lazy table used by the query don't have the "
+                "schema the query was planned with"
             )
-            table_names, table_scans = connection.result()
-
         query_tables = [self.tables[table_name] for table_name in table_names]
 
-        # this was for ARROW tables which are currently deprecated
-        # algebra = modifyAlgebraForDataframesWithOnlyWantedColumns(
-        #   algebra, relational_algebra_steps,self.tables)
+        scan_assignment_mode = query_config_options.get(
+            "SCAN_ASSIGNMENT_MODE".encode(), "static".encode()
+        )
+        dynamic_scans = (
+            scan_assignment_mode.decode().lower() == "dynamic"
+            and self.dask_client is not None
+            and not single_gpu
+            and len(self.nodes) > 1
+        )
+
+        # the scans of in memory tables are rewritten to read only the
+        # columns given to the engine
+        table_scans = list(table_scans)
 
         for table_idx, query_table in enumerate(query_tables):
             fileTypes.append(query_table.fileType)
@@ -2238,44 +4313,66 @@ class BlazingContext(object):
             ):
                 if query_table.has_metadata():
                     currentTableNodes = self._optimize_skip_data_getSlices(
-                        query_table, table_scans[table_idx], single_gpu
+                        query_table, table_scans[table_idx], single_gpu, dynamic_scans
+                    )
+                elif dynamic_scans:
+                    currentTableNodes = self._getDynamicScanSlices(
+                        query_table, np.arange(len(query_table.files)), None, None
                     )
                 else:
                     if single_gpu:
                         currentTableNodes = query_table.getSlices(1)
                     else:
                         currentTableNodes = query_table.getSlices(len(self.nodes))
-            elif query_table.fileType == DataType.DASK_CUDF:
-                if single_gpu:
+            elif (
+                ftype == DataType.CUDF
+                or ftype == DataType.DASK_CUDF
+                or ftype == DataType.ARROW
+            ):
+                column_indices, new_scan = getScanProjection(
+                    table_scans[table_idx], len(query_table.column_names)
+                )
+                plan = plan.replace(table_scans[table_idx], new_scan)
+                table_scans[table_idx] = new_scan
+                if ftype == DataType.ARROW:
+                    node_table = query_table.getArrowNodeTable(
+                        column_indices, self.arrow_column_cache
+                    )
+                    # the engine reads the converted columns like a cudf table
+                    fileTypes[table_idx] = DataType.CUDF
+                    currentTableNodes = [node_table for node in self.nodes]
+                elif ftype == DataType.CUDF:
+                    # the engine expects a list of dataframes
+                    node_table = query_table.getProjectedTable(column_indices)
+                    inputs = query_table.input
+                    if not isinstance(inputs, list):
+                        inputs = [inputs]
+                    node_table.input = [df[node_table.column_names] for df in inputs]
+                    currentTableNodes = [node_table for node in self.nodes]
+                elif single_gpu:
                     # TODO: repartition onto the node that does the work
-
-                    currentTableNodes = []
-                    for node in self.nodes:
-                        currentTableNodes.append(query_table)
+                    node_table = query_table.getProjectedTable(column_indices)
+                    node_table.input = query_table.input[node_table.column_names]
+                    currentTableNodes = [node_table for node in self.nodes]
                 else:
-                    currentTableNodes = query_table.getDaskDataFrameKeySlices(
+                    # the partitions are projected by the workers, the keys
+                    # of a projected dask_cudf.DataFrame are not in worker.data
+                    node_table = query_table.getProjectedTable(column_indices)
+                    currentTableNodes = node_table.getDaskDataFrameKeySlices(
                         self.nodes, self.dask_client
                     )
 
-            elif (
-                query_table.fileType == DataType.CUDF
-                or query_table.fileType == DataType.ARROW
-            ):
-                currentTableNodes = []
-                for node in self.nodes:
-                    if not isinstance(query_table.input, list):
-                        query_table.input = [query_table.input]
-                    currentTableNodes.append(query_table)
-
             for j, nodeList in enumerate(nodeTableList):
                 nodeList.append(currentTableNodes[j])
 
         ctxToken = random.randint(0, np.iinfo(np.int32).max)
         accessToken = 0
 
-        algebra = get_plan(algebra)
+        algebra = plan
 
         if self.dask_client is None:
+            if ticket is None:
+                ticket = self.query_scheduler.admit(["local"], priority, owner)
             try:
                 result = cio.runQueryCaller(
                     masterIndex,
@@ -2290,73 +4387,263 @@ class BlazingContext(object):
                     is_single_node=True,
                 )
             except cio.RunQueryError as e:
+                if raise_errors:
+                    raise e
                 print(">>>>>>>> ", e)
                 result = cudf.DataFrame()
             except Exception as e:
                 raise e
+            finally:
+                self.query_scheduler.release(ticket)
 
         else:
             if single_gpu:
                 # the following is wrapped in an array because
                 # .sql expects to return
                 # an array of dask_futures or a df, this makes it consistent
-                worker = self.nodes[self.single_gpu_idx]["worker"]
-                self.single_gpu_idx = self.single_gpu_idx + 1
-                if self.single_gpu_idx >= len(self.nodes):
-                    self.single_gpu_idx = 0
-                dask_futures = [
-                    self.dask_client.submit(
-                        collectPartitionsRunQuery,
-                        masterIndex,
-                        [self.nodes[0],],
-                        nodeTableList[0],
-                        table_scans,
-                        fileTypes,
-                        ctxToken,
-                        algebra,
-                        accessToken,
-                        query_config_options,
-                        single_gpu=True,
+                if ticket is None:
+                    node = self._next_single_gpu_node()
+                    ticket = self.query_scheduler.admit(
+                        [node["worker"]], priority, owner
                     )
-                ]
-            else:
-                dask_futures = []
-                i = 0
-                for node in self.nodes:
+                else:
+                    node = self._get_node(ticket["workers"][0])
+            elif ticket is None:
+                workers = [node["worker"] for node in self.nodes]
+                ticket = self.query_scheduler.admit(workers, priority, owner)
+            dask_futures = []
+            try:
+                if single_gpu:
                     worker = node["worker"]
                     dask_futures.append(
                         self.dask_client.submit(
                             collectPartitionsRunQuery,
                             masterIndex,
-                            self.nodes,
-                            nodeTableList[i],
+                            [node,],
+                            nodeTableList[0],
                             table_scans,
                             fileTypes,
                             ctxToken,
                             algebra,
                             accessToken,
                             query_config_options,
+                            single_gpu=True,
                             workers=[worker],
                         )
                     )
-                    i = i + 1
+                else:
+                    i = 0
+                    for node in self.nodes:
+                        worker = node["worker"]
+                        dask_futures.append(
+                            self.dask_client.submit(
+                                collectPartitionsRunQuery,
+                                masterIndex,
+                                self.nodes,
+                                nodeTableList[i],
+                                table_scans,
+                                fileTypes,
+                                ctxToken,
+                                algebra,
+                                accessToken,
+                                query_config_options,
+                                workers=[worker],
+                            )
+                        )
+                        i = i + 1
+            finally:
+                # when a submit fails the ticket is released once the
+                # queries that were already submitted are done
+                self.query_scheduler.release_when_done(ticket, dask_futures)
 
             if return_futures:
                 result = dask_futures
             else:
                 meta_results = self.dask_client.gather(dask_futures)
+                result = self._get_distributed_result(meta_results)
+        return result
 
-                futures = []
-                for query_partids, meta, worker_id in meta_results:
-                    for query_partid in query_partids:
-                        futures.append(
-                            self.dask_client.submit(
-                                get_element, query_partid, workers=[worker_id]
-                            )
-                        )
+    def _next_single_gpu_node(self):
+        # round robin of the nodes used by single gpu queries
+        with self.single_gpu_lock:
+            node = self.nodes[self.single_gpu_idx]
+            self.single_gpu_idx = (self.single_gpu_idx + 1) % len(self.nodes)
+        return node
+
+    def _get_node(self, worker):
+        for node in self.nodes:
+            if node["worker"] == worker:
+                return node
+        raise ValueError("Worker " + str(worker) + " is not a node of the context")
+
+    def _query_workers(self, single_gpu):
+        # the workers a query runs on, as passed to the query scheduler
+        if self.dask_client is None:
+            return ["local"]
+        if single_gpu:
+            return [self._next_single_gpu_node()["worker"]]
+        return [node["worker"] for node in self.nodes]
+
+    def _get_distributed_result(self, meta_results):
+        futures = []
+        for query_partids, meta, worker_id in meta_results:
+            for query_partid in query_partids:
+                futures.append(
+                    self.dask_client.submit(
+                        get_element, query_partid, workers=[worker_id]
+                    )
+                )
 
-                result = dask.dataframe.from_delayed(futures, meta=meta)
-        return result
+        return dask.dataframe.from_delayed(futures, meta=meta)
+
+    def sql_async(
+        self,
+        query,
+        algebra=None,
+        single_gpu=False,
+        config_options={},
+        use_plan_cache=True,
+        priority=0,
+        owner=None,
+    ):
+        """
+        Query a BlazingSQL table without blocking the calling thread.
+
+        Must be called from a running asyncio event loop. Planning and the
+        table scan lookup run on a bounded thread pool (see
+        ASYNC_EXECUTOR_THREADS) and the dask futures of distributed queries
+        are awaited without holding a thread, so many queries can be in
+        flight from a single event loop.
+
+        Returns a QueryHandle that can be awaited to get the same result that
+        BlazingContext.sql would return. The handle also has status() and
+        cancel().
+
+        Parameters
+        ----------
+        query, algebra, single_gpu, config_options, use_plan_cache,
+            priority, owner (optional) : same as in BlazingContext.sql
+
+        Examples
+        --------
+
+        >>> async def run(bc):
+        >>>     handles = [bc.sql_async('SELECT * FROM taxi WHERE
+                    passenger_count = ' + str(i)) for i in range(4)]
+        >>>     return await asyncio.gather(*handles)
+        """
+        handle = QueryHandle(self, query)
+        loop = asyncio.get_event_loop()
+        handle.task = loop.create_task(
+            self._sql_async(
+                handle,
+                query,
+                algebra,
+                single_gpu,
+                config_options,
+                use_plan_cache,
+                priority,
+                owner,
+            )
+        )
+        return handle
+
+    async def _sql_async(
+        self,
+        handle,
+        query,
+        algebra,
+        single_gpu,
+        config_options,
+        use_plan_cache,
+        priority,
+        owner,
+    ):
+        loop = asyncio.get_event_loop()
+
+        handle.state = "planning"
+        algebra, plan, _, table_names, table_scans = await loop.run_in_executor(
+            self.async_executor,
+            self._get_query_plan,
+            query,
+            algebra,
+            use_plan_cache,
+            single_gpu,
+        )
+
+        if "LogicalValues(tuples=[[]])" in algebra:
+            print(
+                """This SQL statement returns empty result.
+                Please double check your query."""
+            )
+            return cudf.DataFrame()
+
+        if algebra == "":
+            print("Parsing Error")
+            return
+
+        if plan is None:
+            plan = get_plan(algebra)
+
+        # the query waits for its admission on the event loop instead of
+        # holding one of the threads of the async executor
+        handle.state = "waiting"
+        ticket = await self.query_scheduler.admit_async(
+            self._query_workers(single_gpu), priority, owner
+        )
+
+        handle.state = "running"
+        run_plan = functools.partial(
+            self._run_plan,
+            plan,
+            table_names,
+            table_scans,
+            return_futures=self.dask_client is not None,
+            single_gpu=single_gpu,
+            config_options=config_options,
+            priority=priority,
+            owner=owner,
+            ticket=ticket,
+        )
+
+        # the handle can be cancelled while run_admitted_plan still waits for
+        # a thread of the async executor, then it never runs and the ticket
+        # has to be released here
+        start_lock = Lock()
+        start_state = {"started": False, "cancelled": False}
+
+        def run_admitted_plan():
+            with start_lock:
+                if start_state["cancelled"]:
+                    return None
+                start_state["started"] = True
+            try:
+                return run_plan()
+            except BaseException:
+                # _run_plan failed before it started the query, release does
+                # nothing when _run_plan already released the ticket
+                self.query_scheduler.release(ticket)
+                raise
+
+        try:
+            result = await loop.run_in_executor(self.async_executor, run_admitted_plan)
+        except asyncio.CancelledError:
+            with start_lock:
+                if not start_state["started"]:
+                    start_state["cancelled"] = True
+                    self.query_scheduler.release(ticket)
+            raise
+        if self.dask_client is None:
+            return result
+
+        handle.dask_futures = result
+        if self.dask_client.asynchronous:
+            meta_results = await self.dask_client.gather(result, asynchronous=True)
+        else:
+            meta_results = await asyncio.gather(
+                *[wrap_dask_future(future, loop) for future in result]
+            )
+        return self._get_distributed_result(meta_results)
 
     # END SQL interface
 
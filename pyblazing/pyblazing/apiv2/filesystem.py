@@ -57,9 +57,11 @@ class FileSystem(object):
     def localfs(self, client, prefix, **kwargs):
         self._verify_prefix(prefix)
         root = kwargs.get("root", "/")
+        use_memory_map = kwargs.get("mmap", False)
 
         fs = OrderedDict()
         fs["type"] = "local"
+        fs["use_memory_map"] = use_memory_map
         return registerFileSystem(client, fs, root, prefix)
 
     def hdfs(self, client, prefix, **kwargs):
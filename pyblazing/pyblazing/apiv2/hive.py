@@ -1,4 +1,9 @@
 from itertools import repeat
+import hashlib
+import json
+import logging
+import os
+import time
 
 import cudf
 
@@ -80,36 +85,43 @@ cudfTypeToCsvType = {
 def getPartitions(tableName, schema, cursor):
     query = "show partitions " + tableName
     result = runHiveQuery(cursor, query)
+    return parsePartitions(result[0], schema)
+
+
+def parsePartitions(rows, schema, known_partitions=None):
+    # the column names are indexed so that parsing is linear on the number
+    # of partitions. Partitions in known_partitions were already parsed
+    if known_partitions is None:
+        known_partitions = {}
+    column_names = set(column[0] for column in schema["columns"])
     partitions = {}
-    for partition in result[0]:
+    for partition in rows:
+        if partition[0] in known_partitions:
+            partitions[partition[0]] = known_partitions[partition[0]]
+            continue
         columnPartitions = []
         for columnPartition in partition:
             for columnData in columnPartition.split("/"):
-                columnName = columnData.split("=")[0]
-                for column in schema["columns"]:
-                    if column[0] == columnName:
-                        columnValue = columnData.split("=")[1]
-                        columnPartitions.append((columnName, columnValue))
+                columnName, _, columnValue = columnData.partition("=")
+                if columnName in column_names:
+                    columnPartitions.append((columnName, columnValue))
         partitions[partition[0]] = columnPartitions
     return partitions
 
 
 def filterHivePartitionsWithUserPartitions(hive_partitions, user_partitions):
-    new_hive_partitions = {}
     for user_partition in user_partitions:
-        user_partition_values_str = [
+        user_partition_values_str = set(
             str(val) for val in user_partitions[user_partition]
-        ]
-        for hive_partition in hive_partitions:
-            for col_tuple in hive_partitions[hive_partition]:
-                if col_tuple[0] == user_partition:
-                    if col_tuple[1] in user_partition_values_str:
-                        new_hive_partitions[hive_partition] = hive_partitions[
-                            hive_partition
-                        ]
-                        break
-        hive_partitions = new_hive_partitions
+        )
         new_hive_partitions = {}
+        for hive_partition, col_tuples in hive_partitions.items():
+            for col_name, col_value in col_tuples:
+                if col_name == user_partition:
+                    if col_value in user_partition_values_str:
+                        new_hive_partitions[hive_partition] = col_tuples
+                    break
+        hive_partitions = new_hive_partitions
     return hive_partitions
 
 
@@ -158,15 +170,19 @@ def getFolderListFromPartitions(partitions, base_location):
     return folder_list
 
 
-def get_hive_table(cursor, tableName, hive_database_name, user_partitions):
-    query = "use " + hive_database_name
-    runHiveDDL(cursor, query)
-    query = "describe formatted " + tableName
-    result, description = runHiveQuery(cursor, query)
+def get_hive_table(
+    cursor, tableName, hive_database_name, user_partitions, metadata_cache=None
+):
+    if metadata_cache is not None and metadata_cache.enabled():
+        schema = metadata_cache.get_schema(cursor, tableName, hive_database_name)
+    else:
+        schema = fetchHiveSchema(cursor, tableName, hive_database_name)
+    return buildHiveTable(schema, user_partitions)
 
+
+def parseHiveDescription(result):
     schema = {}
     schema["columns"] = []
-    schema["column_types"] = []
     i = 0
     parsingColumns = False
     parsingPartitionColumns = False
@@ -214,6 +230,153 @@ def get_hive_table(cursor, tableName, hive_database_name, user_partitions):
                         (triple[0], convertTypeNameStrToCudfType(triple[1]), True)
                     )
         i = i + 1
+    return schema
+
+
+def fetchHiveSchema(cursor, tableName, hive_database_name, cached_schema=None):
+    """
+    Gets the columns, location, file format, delimiter and partitions of a
+    table from HiveServer2. If cached_schema (a previous result of this
+    function) is given, the partitions are still listed, since partitions can
+    be added without changing the table parameters, but only the new
+    partitions are parsed.
+    """
+    qualifiedTableName = hive_database_name + "." + tableName
+
+    # the table description and its partitions are independent, so both
+    # statements are submitted before waiting for any of them. The partitions
+    # are only read if the table turns out to be partitioned
+    partitions_cursor = newHiveCursor(cursor)
+    startHiveQuery(cursor, "describe formatted " + qualifiedTableName)
+    if partitions_cursor is not None:
+        startHiveQuery(partitions_cursor, "show partitions " + qualifiedTableName)
+        waitForHiveQueries([cursor, partitions_cursor])
+    else:
+        waitForHiveQueries([cursor])
+    schema = parseHiveDescription(cursor.fetchall())
+
+    hasPartitions = False
+    for column in schema["columns"]:
+        if column[2]:
+            hasPartitions = True
+    if not hasPartitions:
+        schema["partitions"] = {}
+    else:
+        if partitions_cursor is not None:
+            rows = partitions_cursor.fetchall()
+        else:
+            rows = runHiveQuery(cursor, "show partitions " + qualifiedTableName)[0]
+        known_partitions = {}
+        if cached_schema is not None and schema["columns"] == cached_schema["columns"]:
+            known_partitions = cached_schema["partitions"]
+        schema["partitions"] = parsePartitions(rows, schema, known_partitions)
+
+    if partitions_cursor is not None:
+        partitions_cursor.close()
+    return schema
+
+
+def getHiveHost(cursor):
+    # the host and port of HiveServer2 are kept by the socket at the bottom of
+    # the thrift transports of the connection, None if they can't be found
+    transport = getattr(getattr(cursor, "_connection", None), "_transport", None)
+    while transport is not None:
+        host = getattr(transport, "host", None)
+        if host is not None:
+            return str(host) + ":" + str(getattr(transport, "port", ""))
+        transport = getattr(
+            transport, "_trans", getattr(transport, "_TBufferedTransport__trans", None)
+        )
+    return None
+
+
+class HiveMetadataCache(object):
+    """
+    Cache of the schemas returned by fetchHiveSchema (columns, file format,
+    delimiter, location and partitions), kept as json files in a local
+    directory so that it is shared by all the BlazingContexts of the machine.
+    Entries are keyed by (host, database, table), the tables of a cursor
+    whose host can not be found are not cached.
+
+    An entry younger than ttl seconds is used as is. An older entry is
+    refreshed: the table is described and its partitions are listed again,
+    parsing just the partitions that were not cached. A ttl of 0 disables the
+    cache.
+    """
+
+    def __init__(self, cache_dir, ttl=0):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+
+    def enabled(self):
+        return self.ttl > 0
+
+    def _path(self, key):
+        digest = hashlib.sha1(json.dumps(key).encode()).hexdigest()
+        return os.path.join(self.cache_dir, digest + ".json")
+
+    def load(self, key):
+        try:
+            with open(self._path(key)) as cache_file:
+                entry = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key:
+            return None
+        schema = entry["schema"]
+        # json turns the tuples into lists
+        schema["columns"] = [tuple(column) for column in schema["columns"]]
+        schema["partitions"] = {
+            name: [tuple(value) for value in values]
+            for name, values in schema["partitions"].items()
+        }
+        return entry["fetched_at"], schema
+
+    def store(self, key, schema):
+        entry = {"key": key, "fetched_at": time.time(), "schema": schema}
+        path = self._path(key)
+        tmp_path = path + "." + str(os.getpid()) + ".tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "w") as cache_file:
+                json.dump(entry, cache_file)
+            # the rename is atomic, other processes never see a partial file
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.warning("Could not write the hive metadata cache: " + str(e))
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def invalidate(self, cursor, tableName, hive_database_name):
+        host = getHiveHost(cursor)
+        if host is None:
+            return
+        key = [host, hive_database_name, tableName]
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def get_schema(self, cursor, tableName, hive_database_name):
+        host = getHiveHost(cursor)
+        if host is None:
+            # different metastores would share the same entries
+            return fetchHiveSchema(cursor, tableName, hive_database_name)
+        key = [host, hive_database_name, tableName]
+        cached = self.load(key)
+        if cached is not None and time.time() - cached[0] < self.ttl:
+            return cached[1]
+        cached_schema = cached[1] if cached is not None else None
+        schema = fetchHiveSchema(cursor, tableName, hive_database_name, cached_schema)
+        self.store(key, schema)
+        return schema
+
+
+def buildHiveTable(schema, user_partitions):
+    # the schema may come from the metadata cache, it must not be modified
+    schema = dict(schema)
 
     hasPartitions = False
     for column in schema["columns"]:
@@ -221,8 +384,6 @@ def get_hive_table(cursor, tableName, hive_database_name, user_partitions):
             hasPartitions = True
     file_list = []
     if hasPartitions:
-        schema["partitions"] = getPartitions(tableName, schema, cursor)
-
         if user_partitions is not None:
             schema["partitions"] = filterHivePartitionsWithUserPartitions(
                 schema["partitions"], user_partitions
@@ -277,18 +438,54 @@ def get_hive_table(cursor, tableName, hive_database_name, user_partitions):
     return file_list, schema["fileType"], extra_kwargs, extra_columns, schema
 
 
-def runHiveDDL(cursor, query):
+# bounds of the delay between two polls of a running hive operation, the
+# delay grows from the min to the max while the operation keeps running
+HIVE_POLL_MIN_DELAY = 0.001
+HIVE_POLL_MAX_DELAY = 0.5
+
+_running_states = (
+    TOperationState.INITIALIZED_STATE,
+    TOperationState.PENDING_STATE,
+    TOperationState.RUNNING_STATE,
+)
+
+
+def newHiveCursor(cursor):
+    # returns another cursor of the same connection, or None if the cursor
+    # does not expose its connection
+    connection = getattr(cursor, "_connection", None)
+    if connection is None:
+        return None
+    return connection.cursor()
+
+
+def startHiveQuery(cursor, query):
     cursor.execute(query, async_=True)
-    status = cursor.poll().operationState
-    while status in (TOperationState.INITIALIZED_STATE, TOperationState.RUNNING_STATE):
-        status = cursor.poll().operationState
+
+
+def waitForHiveQueries(cursors):
+    delay = HIVE_POLL_MIN_DELAY
+    pending = list(cursors)
+    while True:
+        pending = [
+            cursor
+            for cursor in pending
+            if cursor.poll().operationState in _running_states
+        ]
+        if len(pending) == 0:
+            return
+        time.sleep(delay)
+        delay = min(delay * 2, HIVE_POLL_MAX_DELAY)
+
+
+def runHiveDDL(cursor, query):
+    startHiveQuery(cursor, query)
+    waitForHiveQueries([cursor])
 
 
 def runHiveQuery(cursor, query):
-    cursor.execute(query, async_=True)
-    status = cursor.poll().operationState
-    while status in (TOperationState.INITIALIZED_STATE, TOperationState.RUNNING_STATE):
-        status = cursor.poll().operationState
+    startHiveQuery(cursor, query)
+    waitForHiveQueries([cursor])
     return cursor.fetchall(), cursor.description
 
 